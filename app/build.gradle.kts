@@ -53,6 +53,12 @@ android {
             excludes += "/META-INF/{AL2.0,LGPL2.1}"
         }
     }
+
+    androidResources {
+        // assets.ctb must stay stored so AssetManager.openFd() can mmap it
+        // (tools/asset_bundle.py builds it outside assets/ until the app reads it)
+        noCompress += "ctb"
+    }
 }
 
 dependencies {
@@ -0,0 +1,10 @@
+package com.colortrap.game.data.models.compact
+
+// GENERATED by tools/model_codegen.py from tools/model_schema.py
+// Do not edit by hand; change the schema and rerun the generator.
+
+/**
+ * Index of a color group in the active skin's group list
+ */
+@JvmInline
+value class ColorId(val raw: Int)
@@ -0,0 +1,40 @@
+package com.colortrap.game.data.models.compact
+
+// GENERATED by tools/model_codegen.py from tools/model_schema.py
+// Do not edit by hand; change the schema and rerun the generator.
+
+/**
+ * Set of color groups (e.g. the forbidden colors of a level)
+ */
+@JvmInline
+value class ColorSet(val bits: Long) {
+
+    operator fun contains(id: ColorId): Boolean = bits and bit(id) != 0L
+
+    operator fun plus(id: ColorId): ColorSet = ColorSet(bits or bit(id))
+
+    operator fun minus(id: ColorId): ColorSet = ColorSet(bits and bit(id).inv())
+
+    val size: Int get() = bits.countOneBits()
+
+    fun isEmpty(): Boolean = bits == 0L
+
+    inline fun forEach(action: (ColorId) -> Unit) {
+        var rest = bits
+        while (rest != 0L) {
+            action(ColorId(rest.countTrailingZeroBits()))
+            rest = rest and (rest - 1)
+        }
+    }
+
+    companion object {
+        const val CAPACITY = 64
+        val EMPTY = ColorSet(0L)
+
+        // shl masks its count to 6 bits, so larger ids would alias to 0..63
+        private fun bit(id: ColorId): Long {
+            require(id.raw in 0 until CAPACITY) { "ColorId ${id.raw} outside 0 until $CAPACITY" }
+            return 1L shl id.raw
+        }
+    }
+}
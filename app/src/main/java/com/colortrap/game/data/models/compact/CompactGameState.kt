@@ -0,0 +1,72 @@
+package com.colortrap.game.data.models.compact
+
+import com.colortrap.game.data.models.GameMode
+import com.colortrap.game.data.models.ItemType
+
+// GENERATED by tools/model_codegen.py from tools/model_schema.py
+// Do not edit by hand; change the schema and rerun the generator.
+
+/**
+ * Mutable game state with bit flags and per-item counters (compact DynamicGameState)
+ */
+class CompactGameState(
+    var mode: GameMode = GameMode.NORMAL,
+    var currentLevel: Int = 1,
+    var score: Int = 0,
+    var coins: Int = 0,
+    var lives: Int = 3,
+    var timeRemaining: Float = 5f,
+    var flags: Int = 0,
+    var level: CompactLevel? = null,
+    var items: IntArray = IntArray(ItemType.values().size),
+    var consecutiveCorrect: Int = 0
+) {
+
+    var isPlaying: Boolean
+        get() = flags and FLAG_IS_PLAYING != 0
+        set(value) {
+            flags = if (value) flags or FLAG_IS_PLAYING else flags and FLAG_IS_PLAYING.inv()
+        }
+
+    var isPaused: Boolean
+        get() = flags and FLAG_IS_PAUSED != 0
+        set(value) {
+            flags = if (value) flags or FLAG_IS_PAUSED else flags and FLAG_IS_PAUSED.inv()
+        }
+
+    var isGameOver: Boolean
+        get() = flags and FLAG_IS_GAME_OVER != 0
+        set(value) {
+            flags = if (value) flags or FLAG_IS_GAME_OVER else flags and FLAG_IS_GAME_OVER.inv()
+        }
+
+    var activeShield: Boolean
+        get() = flags and FLAG_ACTIVE_SHIELD != 0
+        set(value) {
+            flags = if (value) flags or FLAG_ACTIVE_SHIELD else flags and FLAG_ACTIVE_SHIELD.inv()
+        }
+
+    var slowTimeActive: Boolean
+        get() = flags and FLAG_SLOW_TIME_ACTIVE != 0
+        set(value) {
+            flags = if (value) flags or FLAG_SLOW_TIME_ACTIVE else flags and FLAG_SLOW_TIME_ACTIVE.inv()
+        }
+
+    fun itemCount(type: ItemType): Int = items[type.ordinal]
+
+    fun setItemCount(type: ItemType, count: Int) {
+        items[type.ordinal] = count
+    }
+
+    fun addItem(type: ItemType, delta: Int = 1) {
+        items[type.ordinal] += delta
+    }
+
+    companion object {
+        const val FLAG_IS_PLAYING = 1 shl 0
+        const val FLAG_IS_PAUSED = 1 shl 1
+        const val FLAG_IS_GAME_OVER = 1 shl 2
+        const val FLAG_ACTIVE_SHIELD = 1 shl 3
+        const val FLAG_SLOW_TIME_ACTIVE = 1 shl 4
+    }
+}
@@ -0,0 +1,19 @@
+package com.colortrap.game.data.models.compact
+
+import com.colortrap.game.data.models.DifficultyLevel
+
+// GENERATED by tools/model_codegen.py from tools/model_schema.py
+// Do not edit by hand; change the schema and rerun the generator.
+
+/**
+ * Level data without per-tile objects (compact DynamicLevel)
+ */
+class CompactLevel(
+    val levelNumber: Int,
+    val gridSize: Int,
+    val tiles: TileGrid,
+    val forbiddenTiles: TileGrid,
+    val forbiddenColors: ColorSet,
+    val timeLimit: Float,
+    val difficulty: DifficultyLevel
+)
@@ -0,0 +1,39 @@
+package com.colortrap.game.data.models.compact
+
+// GENERATED by tools/model_codegen.py from tools/model_schema.py
+// Do not edit by hand; change the schema and rerun the generator.
+
+/**
+ * One tile packed into an Int (replaces DynamicTile's object per cell); id is -128..127: grid position, or -1, -2, ... for forbidden tiles
+ */
+@JvmInline
+value class CompactTile(val bits: Int) {
+
+    val colorId: ColorId get() = ColorId((bits ushr 0) and 0xFFFF)
+    val variant: Int get() = (bits ushr 16) and 0xFF
+    val id: Int get() = bits shr 24
+
+    fun withColorId(value: ColorId): CompactTile =
+        CompactTile((bits and COLOR_ID_MASK.inv()) or ((value.raw and 0xFFFF) shl 0))
+
+    fun withVariant(value: Int): CompactTile =
+        CompactTile((bits and VARIANT_MASK.inv()) or ((value and 0xFF) shl 16))
+
+    fun withId(value: Int): CompactTile =
+        CompactTile((bits and ID_MASK.inv()) or ((value and 0xFF) shl 24))
+
+    companion object {
+        const val COLOR_ID_SHIFT = 0
+        const val COLOR_ID_MASK = 65535
+        const val VARIANT_SHIFT = 16
+        const val VARIANT_MASK = 16711680
+        const val ID_SHIFT = 24
+        const val ID_MASK = -16777216
+
+        fun of(colorId: ColorId, variant: Int, id: Int): CompactTile = CompactTile(
+            ((colorId.raw and 0xFFFF) shl 0) or
+                ((variant and 0xFF) shl 16) or
+                ((id and 0xFF) shl 24)
+        )
+    }
+}
@@ -0,0 +1,37 @@
+package com.colortrap.game.data.models.compact
+
+// GENERATED by tools/model_codegen.py from tools/model_schema.py
+// Do not edit by hand; change the schema and rerun the generator.
+
+/**
+ * Level tiles stored in one IntArray
+ */
+class TileGrid(val cells: IntArray) {
+
+    constructor(size: Int) : this(IntArray(size))
+
+    val size: Int get() = cells.size
+
+    operator fun get(index: Int): CompactTile = CompactTile(cells[index])
+
+    operator fun set(index: Int, value: CompactTile) {
+        cells[index] = value.bits
+    }
+
+    fun shuffleInPlace(random: kotlin.random.Random) {
+        for (i in cells.size - 1 downTo 1) {
+            val j = random.nextInt(i + 1)
+            val tmp = cells[i]
+            cells[i] = cells[j]
+            cells[j] = tmp
+        }
+    }
+
+    fun colorIds(): ColorSet {
+        var set = ColorSet.EMPTY
+        for (cell in cells) set += CompactTile(cell).colorId
+        return set
+    }
+
+    fun copyOf(): TileGrid = TileGrid(cells.copyOf())
+}
@@ -9,6 +9,7 @@ import com.colortrap.game.data.models.SkinType
 import com.colortrap.game.data.models.TileVariant
 import com.colortrap.game.utils.AssetLoader
 import com.colortrap.game.utils.DynamicAssetScanner
+import java.util.Collections
 
 /**
  * DynamicSkinManager - Quản lý skins động
@@ -30,6 +31,27 @@ class DynamicSkinManager(private val context: Context) {
     companion object {
         private const val TAG = "DynamicSkinManager"
         private const val MAX_CACHE_SIZE = 50 // Limit cache to prevent memory issues
+
+        // LRU Cache with automatic size management
+        // Shared by every instance so tiles warmed on the splash screen are
+        // hits for the game screen's manager
+        private val bitmapCache: MutableMap<String, Bitmap> = Collections.synchronizedMap(
+            object : LinkedHashMap<String, Bitmap>(
+                MAX_CACHE_SIZE,
+                0.75f,
+                true // Access order (LRU)
+            ) {
+                override fun removeEldestEntry(eldest: MutableMap.MutableEntry<String, Bitmap>?): Boolean {
+                    val shouldRemove = size > MAX_CACHE_SIZE
+                    if (shouldRemove && eldest != null) {
+                        // ✅ CRITICAL: DON'T RECYCLE! Compose may still be using it
+                        // Let garbage collector handle cleanup
+                        Log.d(TAG, "⚠️ Cache full, removing oldest: ${eldest.key} (size: $size)")
+                    }
+                    return shouldRemove
+                }
+            }
+        )
     }
 
     private val assetScanner = DynamicAssetScanner(context)
@@ -43,23 +65,6 @@ class DynamicSkinManager(private val context: Context) {
         return skinType.folderName
     }
 
-    // LRU Cache with automatic size management
-    private val bitmapCache = object : LinkedHashMap<String, Bitmap>(
-        MAX_CACHE_SIZE,
-        0.75f,
-        true // Access order (LRU)
-    ) {
-        override fun removeEldestEntry(eldest: MutableMap.MutableEntry<String, Bitmap>?): Boolean {
-            val shouldRemove = size > MAX_CACHE_SIZE
-            if (shouldRemove && eldest != null) {
-                // ✅ CRITICAL: DON'T RECYCLE! Compose may still be using it
-                // Let garbage collector handle cleanup
-                Log.d(TAG, "⚠️ Cache full, removing oldest: ${eldest.key} (size: $size)")
-            }
-            return shouldRemove
-        }
-    }
-
     // Cached color groups
     private var cachedColorGroups: List<DynamicColorGroup>? = null
 
@@ -203,20 +208,24 @@ class DynamicSkinManager(private val context: Context) {
      */
     fun getCacheStats(): String {
         return buildString {
-            appendLine("=== Bitmap Cache Stats ===")
-            appendLine("Size: ${bitmapCache.size}/$MAX_CACHE_SIZE")
-
             var totalBytes = 0L
             var recycledCount = 0
-            bitmapCache.values.forEach { bitmap ->
-                if (bitmap.isRecycled) {
-                    recycledCount++
-                } else {
-                    totalBytes += bitmap.byteCount
+            // The splash preload writes from another coroutine; iterating a
+            // synchronizedMap view needs the map's own lock
+            val size = synchronized(bitmapCache) {
+                bitmapCache.values.forEach { bitmap ->
+                    if (bitmap.isRecycled) {
+                        recycledCount++
+                    } else {
+                        totalBytes += bitmap.byteCount
+                    }
                 }
+                bitmapCache.size
             }
 
-            appendLine("Valid: ${bitmapCache.size - recycledCount}")
+            appendLine("=== Bitmap Cache Stats ===")
+            appendLine("Size: $size/$MAX_CACHE_SIZE")
+            appendLine("Valid: ${size - recycledCount}")
             appendLine("Recycled: $recycledCount")
             appendLine("Memory: ${totalBytes / 1024}KB")
             appendLine("=========================")
@@ -236,4 +245,25 @@ class DynamicSkinManager(private val context: Context) {
         }
         Log.d(TAG, "✅ Preloaded ${colorGroups.size} tiles (cache: ${bitmapCache.size})")
     }
+
+    /**
+     * Preload tile bitmaps by asset path (from config/preload_manifest.json)
+     * Capped at the cache size so warmed tiles are not evicted by each other
+     */
+    suspend fun preloadAssets(assetPaths: List<String>): Int {
+        if (assetPaths.size > MAX_CACHE_SIZE) {
+            Log.w(TAG, "⚠️ Preload list has ${assetPaths.size} assets, cache holds $MAX_CACHE_SIZE: " +
+                "skipping the last ${assetPaths.size - MAX_CACHE_SIZE}")
+        }
+        var loaded = 0
+        assetPaths.take(MAX_CACHE_SIZE).forEach { assetPath ->
+            if (bitmapCache[assetPath]?.isRecycled == false) return@forEach
+            assetLoader.loadBitmap(assetPath)?.let { bitmap ->
+                bitmapCache[assetPath] = bitmap
+                loaded++
+            }
+        }
+        Log.d(TAG, "✅ Preloaded $loaded/${assetPaths.size} assets (cache: ${bitmapCache.size})")
+        return loaded
+    }
 }
\ No newline at end of file
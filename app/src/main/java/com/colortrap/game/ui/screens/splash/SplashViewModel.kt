@@ -7,11 +7,14 @@ import androidx.lifecycle.viewModelScope
 import com.colortrap.game.domain.ConfigManager
 import com.colortrap.game.domain.DynamicSkinManager
 import com.colortrap.game.utils.DynamicAssetScanner
+import kotlinx.coroutines.Dispatchers
 import kotlinx.coroutines.delay
 import kotlinx.coroutines.flow.MutableStateFlow
 import kotlinx.coroutines.flow.StateFlow
 import kotlinx.coroutines.flow.asStateFlow
 import kotlinx.coroutines.launch
+import kotlinx.coroutines.withContext
+import org.json.JSONObject
 
 /**
  * SplashViewModel
@@ -28,6 +31,8 @@ class SplashViewModel(application: Application) : AndroidViewModel(application)
     companion object {
         private const val TAG = "SplashViewModel"
         private const val MIN_SPLASH_DURATION = 2000L // 2 seconds
+        private const val PRELOAD_MANIFEST_PATH = "config/preload_manifest.json"
+        private val IMAGE_EXTENSIONS = listOf(".png", ".webp", ".jpg", ".jpeg")
     }
 
     // State
@@ -151,16 +156,16 @@ class SplashViewModel(application: Application) : AndroidViewModel(application)
     }
 
     /**
-     * Preload essential assets (menu backgrounds, sounds...)
-     * Optional: Để tăng tốc menu screen
+     * Preload essential assets
+     * Warm danh sách "preload" trong config/preload_manifest.json
+     * (tạo bởi tools/preload_plan.py, đã giới hạn theo bitmap cache)
      */
     private suspend fun preloadEssentialAssets() {
         try {
-            // TODO: Preload menu background, button images, etc.
-            // val assetLoader = AssetLoader(context)
-            // assetLoader.preloadBitmaps(listOf(...))
+            val paths = withContext(Dispatchers.IO) { readPreloadPlan() }
+            val loaded = skinManager.preloadAssets(paths)
 
-            Log.d(TAG, "✅ Essential assets preloaded (stub)")
+            Log.d(TAG, "✅ Essential assets preloaded ($loaded/${paths.size})")
 
         } catch (e: Exception) {
             Log.e(TAG, "⚠️ Preload failed (non-critical): ${e.message}")
@@ -168,6 +173,26 @@ class SplashViewModel(application: Application) : AndroidViewModel(application)
         }
     }
 
+    /**
+     * The manifest's "preload" list: images of every screen up to and
+     * including the one that generates the first level, already
+     * prioritised and capped at the bitmap cache budget by the generator
+     */
+    private fun readPreloadPlan(): List<String> {
+        val text = context.assets.open(PRELOAD_MANIFEST_PATH).bufferedReader().use { it.readText() }
+        val preload = JSONObject(text).getJSONObject("preload")
+        val assets = preload.getJSONArray("assets")
+        val paths = (0 until assets.length())
+            .map { assets.getString(it) }
+            .filter { path -> IMAGE_EXTENSIONS.any { path.endsWith(it, ignoreCase = true) } }
+
+        val onDemand = preload.optInt("onDemand")
+        if (onDemand > 0) {
+            Log.w(TAG, "⚠️ Preload budget ${preload.optInt("budget")}: $onDemand more images load on demand")
+        }
+        return paths
+    }
+
     /**
      * Loading State sealed class
      */
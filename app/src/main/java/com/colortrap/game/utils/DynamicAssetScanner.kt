@@ -2,6 +2,7 @@ package com.colortrap.game.utils
 
 import android.content.Context
 import android.util.Log
+import org.json.JSONObject
 
 /**
  * Tự động scan tất cả color groups trong assets/skins/color/
@@ -12,6 +13,51 @@ class DynamicAssetScanner(private val context: Context) {
     companion object {
         private const val TAG = "DynamicAssetScanner"
         private const val SKINS_PATH = "skins/color"
+        private const val SKIN_INDEX_PATH = "config/skin_index.json"
+
+        // skin -> group -> variant files, đọc một lần cho cả process
+        @Volatile
+        private var skinIndex: Map<String, Map<String, List<String>>>? = null
+
+        @Volatile
+        private var skinIndexLoaded = false
+    }
+
+    /**
+     * Đọc config/skin_index.json (tạo bởi tools/skin_index.py) một lần
+     * @return null nếu không có index -> fallback về AssetManager.list()
+     */
+    private fun loadSkinIndex(): Map<String, Map<String, List<String>>>? {
+        if (skinIndexLoaded) return skinIndex
+
+        skinIndex = try {
+            val text = context.assets.open(SKIN_INDEX_PATH).bufferedReader().use { it.readText() }
+            val skins = JSONObject(text).getJSONObject("skins")
+            val result = HashMap<String, Map<String, List<String>>>()
+
+            for (skin in skins.keys()) {
+                val groups = skins.getJSONObject(skin)
+                val groupMap = LinkedHashMap<String, List<String>>()
+                for (group in groups.keys()) {
+                    val variants = groups.getJSONArray(group)
+                    groupMap[group] = List(variants.length()) { i -> variants.getJSONArray(i).getString(0) }
+                }
+                result[skin] = groupMap
+            }
+
+            Log.d(TAG, "✅ Loaded skin index: ${result.size} skins")
+            result
+
+        } catch (e: Exception) {
+            Log.w(TAG, "⚠️ No skin index, using AssetManager.list(): ${e.message}")
+            null
+        }
+        skinIndexLoaded = true
+        return skinIndex
+    }
+
+    private fun indexedGroups(): Map<String, List<String>>? {
+        return loadSkinIndex()?.get(SKINS_PATH.substringAfter("/"))
     }
 
     /**
@@ -19,6 +65,10 @@ class DynamicAssetScanner(private val context: Context) {
      * @return List<String> - Danh sách tên folders (blue, red, green...)
      */
     fun scanColorGroups(): List<String> {
+        indexedGroups()?.let { groups ->
+            return groups.filterValues { it.isNotEmpty() }.keys.sorted()
+        }
+
         return try {
             val colorGroups = context.assets.list(SKINS_PATH)?.toList() ?: emptyList()
 
@@ -47,6 +97,8 @@ class DynamicAssetScanner(private val context: Context) {
      * @return List<String> - Danh sách tên files (01.png, 02.webp...)
      */
     fun scanColorVariants(groupName: String): List<String> {
+        indexedGroups()?.get(groupName)?.let { return it }
+
         return try {
             val path = "$SKINS_PATH/$groupName"
             val files = context.assets.list(path)?.toList() ?: emptyList()
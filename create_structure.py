@@ -4,220 +4,75 @@ ColorTrap - Complete Project Structure Generator
 Creates all folders and empty files for the entire project
 """
 
-import os
-from pathlib import Path
-
-# ANSI colors
-class Colors:
-    GREEN = '\033[92m'
-    BLUE = '\033[94m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    CYAN = '\033[96m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
+import argparse
+
+from tools.scaffold_engine import build_plan, apply_plan
+from tools.atomic_writer import BatchWriter
+from tools.spec_compiler import load_compiled, kotlin_structure
+from tools.project_root import resolve_project_root, ProjectRootError
+from tools.reporter import Colors, HumanReporter, make_reporter, SINKS
+
+# Active progress sink (see tools/reporter.py); main() may replace it
+reporter = HumanReporter(width=60)
 
 def print_header(text):
-    print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*60}{Colors.END}")
-    print(f"{Colors.CYAN}{Colors.BOLD}{text:^60}{Colors.END}")
-    print(f"{Colors.CYAN}{Colors.BOLD}{'='*60}{Colors.END}\n")
+    reporter.header(text)
 
 def print_success(text):
-    print(f"{Colors.GREEN}✓ {text}{Colors.END}")
+    reporter.success(text)
 
 def print_info(text):
-    print(f"{Colors.BLUE}→ {text}{Colors.END}")
+    reporter.info(text)
 
 def print_warning(text):
-    print(f"{Colors.YELLOW}⚠ {text}{Colors.END}")
-
-def find_project_root():
-    """Find ColorTrap project root"""
-    current = Path.cwd()
-    
-    # Check if we're already in project root
-    if (current / "app" / "src" / "main").exists():
-        return current
-    
-    # Check if ColorTrap folder exists
-    if current.name == "ColorTrap":
-        return current
-    
-    # Look for ColorTrap in common locations
-    possible_paths = [
-        current / "ColorTrap",
-        Path.home() / "Downloads" / "ColorTrap",
-        Path.home() / "Desktop" / "ColorTrap",
-        Path.home() / "Projects" / "ColorTrap"
-    ]
-    
-    for path in possible_paths:
-        if path.exists() and (path / "app").exists():
-            return path
-    
-    # Ask user for path
-    print_warning("Could not auto-detect project root")
-    print_info("Current directory: " + str(current))
-    user_path = input(f"{Colors.YELLOW}Enter ColorTrap project path: {Colors.END}")
-    
-    return Path(user_path)
-
-def create_file_structure():
-    """Complete file structure for ColorTrap"""
-    
-    return {
-        # ==================== DATA LAYER ====================
-        "data/models": [
-            "GameMode.kt",
-            "ItemType.kt",
-            "LevelModifier.kt",
-            "DifficultyLevel.kt",
-            "DynamicColorGroup.kt",
-            "TileVariant.kt",
-            "DynamicLevel.kt",
-            "DynamicTile.kt",
-            "DynamicGameState.kt",
-        ],
-        
-        "data/config": [
-            "GameConfig.kt",
-            "ShopConfig.kt",
-            "TextConfig.kt",
-            "BalanceConfig.kt",
-        ],
-        
-        "data/repository": [
-            "GameRepository.kt",
-            "PreferencesRepository.kt",
-        ],
-        
-        "data/local": [
-            "PreferencesManager.kt",
-        ],
-        
-        # ==================== DOMAIN LAYER ====================
-        "domain": [
-            "DynamicSkinManager.kt",
-            "DifficultyBasedSelector.kt",
-            "DynamicLevelGenerator.kt",
-            "ConfigManager.kt",
-        ],
-        
-        # ==================== UTILS ====================
-        "utils": [
-            "DynamicAssetScanner.kt",
-            "AssetLoader.kt",
-            "SoundManager.kt",
-            "VibrationManager.kt",
-            "AdManager.kt",
-            "Constants.kt",
-            "Extensions.kt",
-        ],
-        
-        # ==================== UI - COMPONENTS ====================
-        "ui/components": [
-            "DynamicTileGrid.kt",
-            "DynamicColorDisplayBar.kt",
-            "TopBar.kt",
-            "ItemBar.kt",
-        ],
-        
-        # ==================== UI - SCREENS ====================
-        "ui/screens/splash": [
-            "SplashScreen.kt",
-            "SplashViewModel.kt",
-        ],
-        
-        "ui/screens/menu": [
-            "MainMenuScreen.kt",
-            "MainMenuViewModel.kt",
-        ],
-        
-        "ui/screens/game": [
-            "DynamicGameScreen.kt",
-            "DynamicGameViewModel.kt",
-        ],
-        
-        "ui/screens/gameover": [
-            "GameOverScreen.kt",
-            "GameOverViewModel.kt",
-        ],
-        
-        "ui/screens/shop": [
-            "ShopScreen.kt",
-            "ShopViewModel.kt",
-        ],
-        
-        "ui/screens/settings": [
-            "SettingsScreen.kt",
-            "SettingsViewModel.kt",
-        ],
-        
-        # ==================== UI - NAVIGATION ====================
-        "ui/navigation": [
-            "Screen.kt",
-            "AppNavGraph.kt",
-        ],
-        
-        # Note: ui/theme already exists from project creation
-    }
+    reporter.warning(text)
 
-def create_kotlin_package_header(package_path):
-    """Generate package declaration"""
-    package_name = "com.colortrap.game." + package_path.replace("/", ".")
-    return f"package {package_name}\n\n"
+def print_error(text):
+    reporter.error(text)
 
-def create_folders_and_files(project_root):
+def find_project_root(root=None):
+    """Find ColorTrap project root (--root, $COLORTRAP_ROOT, cache, marker search)"""
+    return resolve_project_root(
+        cli_root=root,
+        prompt=lambda text: input(f"{Colors.YELLOW}{text}{Colors.END}"),
+    )
+
+def create_folders_and_files(project_root, writer):
     """Create all folders and empty Kotlin files"""
     
-    kotlin_base = project_root / "app" / "src" / "main" / "java" / "com" / "colortrap" / "game"
+    spec = load_compiled(project_root)
+    kotlin_base = project_root / spec["kotlin_base"]
     
     if not kotlin_base.exists():
         print_warning(f"Kotlin base path does not exist: {kotlin_base}")
         return False
     
-    file_structure = create_file_structure()
-    total_files = 0
-    total_folders = 0
+    structure = kotlin_structure(spec)
     
-    for folder_path, files in file_structure.items():
-        # Create folder
-        full_folder_path = kotlin_base / folder_path
-        full_folder_path.mkdir(parents=True, exist_ok=True)
-        
-        if not (full_folder_path / ".exists").exists():
-            total_folders += 1
-            print_success(f"Created folder: {folder_path}/")
-        
-        # Create files
-        for filename in files:
-            file_path = full_folder_path / filename
-            
-            if not file_path.exists():
-                # Create file with package declaration
-                package_header = create_kotlin_package_header(folder_path)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(package_header)
-                    f.write("// TODO: Copy code from artifacts\n")
-                
-                total_files += 1
-                print_info(f"  ✓ {folder_path}/{filename}")
+    # Phase 1: snapshot + plan, Phase 2: parallel apply
+    plan = build_plan(kotlin_base, structure)
+    created = apply_plan(plan, writer=writer)
+    
+    total_folders = len(plan.folders)
+    total_files = len(created)
+    
+    for folder_path in plan.folders:
+        print_success(f"Created folder: {folder_path}/")
+    
+    for entry in created:
+        reporter.item("created", entry.rel_path)
+    
+    for entry in plan.conflicts:
+        print_warning(f"Conflict: {entry.rel_path} ({entry.reason})")
     
     return total_files, total_folders
 
-def create_asset_folders(project_root):
+def create_asset_folders(project_root, writer):
     """Create asset folder structure"""
     
-    assets_base = project_root / "app" / "src" / "main" / "assets"
-    
-    asset_folders = [
-        "config",
-        "skins/color",
-        "audio",
-        "effects",
-        "ui",
-    ]
+    spec = load_compiled(project_root)
+    assets_base = project_root / spec["assets_root"]
+    asset_folders = spec["asset_folders"]
     
     created = 0
     for folder in asset_folders:
@@ -231,11 +86,11 @@ def create_asset_folders(project_root):
     for folder in asset_folders:
         gitkeep_path = assets_base / folder / ".gitkeep"
         if not gitkeep_path.exists():
-            gitkeep_path.touch()
+            writer.write(f"{spec['assets_root']}/{folder}/.gitkeep", b"", overwrite=False)
     
     return created
 
-def create_documentation(project_root):
+def create_documentation(project_root, writer):
     """Create project documentation files"""
     
     docs = {
@@ -361,18 +216,16 @@ Completed: 0/45
     for filename, content in docs.items():
         doc_path = project_root / filename
         if not doc_path.exists():
-            with open(doc_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            writer.write(filename, content, overwrite=False)
             print_success(f"Created: {filename}")
             created += 1
     
     return created
 
-def create_json_configs(project_root):
+def create_json_configs(project_root, writer):
     """Create JSON config templates"""
     
     config_path = project_root / "app" / "src" / "main" / "assets" / "config"
-    config_path.mkdir(parents=True, exist_ok=True)
     
     configs = {
         "game_config.json": """{
@@ -405,80 +258,106 @@ def create_json_configs(project_root):
     for filename, content in configs.items():
         config_file = config_path / filename
         if not config_file.exists():
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            writer.write(f"app/src/main/assets/config/{filename}", content, overwrite=False)
             print_success(f"Created: assets/config/{filename}")
             created += 1
     
     return created
 
 def main():
+    parser = argparse.ArgumentParser(description="ColorTrap - Project Structure Generator")
+    parser.add_argument("--root", help="Project root (default: $COLORTRAP_ROOT or search upward from cwd)")
+    parser.add_argument("--output", choices=SINKS, default="human", help="Progress output: human (default), quiet or json lines")
+    parser.add_argument("--verbose", action="store_true", help="List every file instead of a coalesced progress line")
+    args = parser.parse_args()
+    
+    global reporter
+    reporter = make_reporter(args.output, verbose=args.verbose, width=60)
+    
     print_header("ColorTrap - Project Structure Generator")
     
     # Find project root
     print_info("Locating project root...")
-    project_root = find_project_root()
+    try:
+        project_root = find_project_root(args.root)
+    except ProjectRootError as e:
+        print_error(str(e))
+        return
     
     if not project_root.exists():
-        print(f"{Colors.RED}✗ Project root not found: {project_root}{Colors.END}")
+        print_error(f"Project root not found: {project_root}")
         return
     
     print_success(f"Found project: {project_root}")
     
     # Verify it's an Android project
     if not (project_root / "app" / "src" / "main").exists():
-        print(f"{Colors.RED}✗ Not a valid Android project structure{Colors.END}")
+        print_error("Not a valid Android project structure")
         return
     
-    print("\n" + "="*60)
+    reporter.text("\n" + "="*60)
     
-    # Create Kotlin files
-    print_header("Creating Kotlin Files")
-    files_created, folders_created = create_folders_and_files(project_root)
-    print_success(f"Created {folders_created} folders and {files_created} files")
+    # Outputs are staged and published together when the block exits
+    with BatchWriter(project_root) as writer:
+        for staging, restored in writer.recovered:
+            print_warning(f"Rolled back an interrupted publish ({staging}, {restored} files restored)")
+        # Create Kotlin files
+        print_header("Creating Kotlin Files")
+        files_created, folders_created = create_folders_and_files(project_root, writer)
+        print_success(f"Created {folders_created} folders and {files_created} files")
     
-    # Create asset folders
-    print_header("Creating Asset Folders")
-    assets_created = create_asset_folders(project_root)
-    print_success(f"Created {assets_created} asset folders")
+        # Create asset folders
+        print_header("Creating Asset Folders")
+        assets_created = create_asset_folders(project_root, writer)
+        print_success(f"Created {assets_created} asset folders")
     
-    # Create JSON configs
-    print_header("Creating JSON Configs")
-    configs_created = create_json_configs(project_root)
-    print_success(f"Created {configs_created} config files")
+        # Create JSON configs
+        print_header("Creating JSON Configs")
+        configs_created = create_json_configs(project_root, writer)
+        print_success(f"Created {configs_created} config files")
     
-    # Create documentation
-    print_header("Creating Documentation")
-    docs_created = create_documentation(project_root)
-    print_success(f"Created {docs_created} documentation files")
+        # Create documentation
+        print_header("Creating Documentation")
+        docs_created = create_documentation(project_root, writer)
+        print_success(f"Created {docs_created} documentation files")
     
     # Summary
-    print("\n" + "="*60)
+    reporter.summary({
+        "kotlin_files": files_created,
+        "folders": folders_created,
+        "asset_folders": assets_created,
+        "config_files": configs_created,
+        "doc_files": docs_created,
+    })
+    reporter.text("\n" + "="*60)
     print_header("✅ STRUCTURE CREATION COMPLETE!")
     
-    print(f"\n{Colors.CYAN}📊 Summary:{Colors.END}")
-    print(f"  • Kotlin files: {Colors.GREEN}{files_created}{Colors.END}")
-    print(f"  • Folders: {Colors.GREEN}{folders_created}{Colors.END}")
-    print(f"  • Asset folders: {Colors.GREEN}{assets_created}{Colors.END}")
-    print(f"  • Config files: {Colors.GREEN}{configs_created}{Colors.END}")
-    print(f"  • Documentation: {Colors.GREEN}{docs_created}{Colors.END}")
+    reporter.text(f"\n{Colors.CYAN}📊 Summary:{Colors.END}")
+    reporter.text(f"  • Kotlin files: {Colors.GREEN}{files_created}{Colors.END}")
+    reporter.text(f"  • Folders: {Colors.GREEN}{folders_created}{Colors.END}")
+    reporter.text(f"  • Asset folders: {Colors.GREEN}{assets_created}{Colors.END}")
+    reporter.text(f"  • Config files: {Colors.GREEN}{configs_created}{Colors.END}")
+    reporter.text(f"  • Documentation: {Colors.GREEN}{docs_created}{Colors.END}")
     
-    print(f"\n{Colors.YELLOW}📝 Next Steps:{Colors.END}")
-    print(f"  1. Read {Colors.CYAN}COPY_CHECKLIST.md{Colors.END}")
-    print(f"  2. Copy code from artifacts into each .kt file")
-    print(f"  3. Replace {Colors.CYAN}app/build.gradle.kts{Colors.END}")
-    print(f"  4. Replace {Colors.CYAN}app/src/main/res/values/strings.xml{Colors.END}")
-    print(f"  5. Sync Gradle in IntelliJ")
-    print(f"  6. Build project")
+    reporter.text(f"\n{Colors.YELLOW}📝 Next Steps:{Colors.END}")
+    reporter.text(f"  1. Read {Colors.CYAN}COPY_CHECKLIST.md{Colors.END}")
+    reporter.text(f"  2. Copy code from artifacts into each .kt file")
+    reporter.text(f"  3. Replace {Colors.CYAN}app/build.gradle.kts{Colors.END}")
+    reporter.text(f"  4. Replace {Colors.CYAN}app/src/main/res/values/strings.xml{Colors.END}")
+    reporter.text(f"  5. Sync Gradle in IntelliJ")
+    reporter.text(f"  6. Build project")
     
-    print(f"\n{Colors.GREEN}🚀 Ready to copy code!{Colors.END}\n")
+    reporter.text(f"\n{Colors.GREEN}🚀 Ready to copy code!{Colors.END}\n")
+    reporter.flush()
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print(f"\n\n{Colors.YELLOW}⚠ Cancelled by user{Colors.END}")
+        print_warning("Cancelled by user")
     except Exception as e:
-        print(f"\n{Colors.RED}✗ Error: {e}{Colors.END}")
+        print_error(f"Error: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+    finally:
+        reporter.flush()
\ No newline at end of file
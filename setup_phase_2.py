@@ -7,78 +7,76 @@ Creates complete project structure with all necessary files and configs
 import os
 import sys
 import json
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tools.scaffold_engine import build_plan, apply_plan
+from tools import manifest as mf
+from tools.atomic_writer import BatchWriter
+from tools.spec_compiler import load_compiled, kotlin_structure
+from tools.project_root import resolve_project_root, ProjectRootError
+from tools.profiling import PhaseProfiler, count, STAT
+from tools.balance_config import load_balance_config, validate as validate_balance_config, BALANCE_CONFIG_PATH, ERROR
+from tools.level_tables import render_kotlin as render_level_tables, OUTPUT_PATH as LEVEL_TABLES_PATH
+from tools.model_codegen import render_all as render_compact_models
+from tools.reporter import Colors, HumanReporter, QuietReporter, make_reporter, SINKS
+from tools.asset_bundle import pack as pack_bundle, collect_trees, BUNDLE_PATH
+
+JSON_CONFIGS = ("game_config.json", "balance_config.json")
+DOC_FILES = ("SETUP_STATUS.md", "COPY_GUIDE.md", "FILE_MAP.md")
 
-# ANSI colors
-class Colors:
-    GREEN = '\033[92m'
-    BLUE = '\033[94m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    CYAN = '\033[96m'
-    MAGENTA = '\033[95m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
 
 class ColorTrapSetup:
-    def __init__(self):
+    def __init__(self, root=None, force=False, spec=None, quiet=False, cprofile_dir=None, reporter=None, bundle=False):
+        self.root_arg = root
         self.project_root = None
+        self.plan = None
+        self.manifest = None
+        self.spec = spec
+        if reporter is None:
+            reporter = QuietReporter(stream=False) if quiet else HumanReporter()
+        self.reporter = reporter
+        self.error = None
+        self.profiler = PhaseProfiler(cprofile_dir=cprofile_dir)
+        self.writer = None
+        self.tracked = set()
+        self.drifted = set()
+        self.balance_config = None
+        self.force = force
+        self.bundle = bundle
         self.stats = {
             'folders': 0,
             'kotlin_files': 0,
             'json_files': 0,
             'resource_files': 0,
-            'doc_files': 0
+            'doc_files': 0,
+            'generated_files': 0,
+            'unchanged': 0,
+            'drift': 0
         }
     
     def print_header(self, text):
-        print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.END}")
-        print(f"{Colors.CYAN}{Colors.BOLD}{text:^70}{Colors.END}")
-        print(f"{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.END}\n")
+        self.reporter.header(text)
     
     def print_success(self, text):
-        print(f"{Colors.GREEN}✓ {text}{Colors.END}")
+        self.reporter.success(text)
     
     def print_info(self, text):
-        print(f"{Colors.BLUE}→ {text}{Colors.END}")
+        self.reporter.info(text)
     
     def print_warning(self, text):
-        print(f"{Colors.YELLOW}⚠ {text}{Colors.END}")
+        self.reporter.warning(text)
     
     def print_error(self, text):
-        print(f"{Colors.RED}✗ {text}{Colors.END}")
+        self.reporter.error(text)
     
     def find_project_root(self):
-        """Find ColorTrap project root"""
-        current = Path.cwd()
-        
-        # Check current directory
-        if (current / "app" / "src" / "main").exists():
-            return current
-        
-        # Check if we're inside project
-        for parent in current.parents:
-            if parent.name == "ColorTrap" and (parent / "app" / "src" / "main").exists():
-                return parent
-        
-        # Common locations
-        possible_paths = [
-            current / "ColorTrap",
-            Path.home() / "Downloads" / "ColorTrap",
-            Path.home() / "Desktop" / "ColorTrap",
-            Path("C:/Users/PC/Downloads/ColorTrap"),
-        ]
-        
-        for path in possible_paths:
-            if path.exists() and (path / "app" / "src" / "main").exists():
-                return path
-        
-        # Ask user
-        self.print_warning("Could not auto-detect project root")
-        self.print_info(f"Current directory: {current}")
-        user_path = input(f"\n{Colors.YELLOW}Enter ColorTrap project path: {Colors.END}")
-        
-        return Path(user_path.strip())
+        """Find ColorTrap project root (--root, $COLORTRAP_ROOT, cache, marker search)"""
+        return resolve_project_root(
+            cli_root=self.root_arg,
+            prompt=lambda text: input(f"\n{Colors.YELLOW}{text}{Colors.END}"),
+        )
     
     def verify_project(self):
         """Verify it's a valid Android project"""
@@ -99,115 +97,25 @@ class ColorTrapSetup:
         """Create complete Kotlin folder structure with files"""
         self.print_header("STEP 1: Creating Kotlin Files")
         
-        base = self.project_root / "app" / "src" / "main" / "java" / "com" / "colortrap" / "game"
-        
-        structure = {
-            # Data Layer
-            "data/models": [
-                ("GameMode.kt", self.get_gamemode_template()),
-                ("ItemType.kt", self.get_itemtype_template()),
-                ("LevelModifier.kt", self.get_levelmodifier_template()),
-                ("DifficultyLevel.kt", self.get_difficultylevel_template()),
-                ("DynamicColorGroup.kt", self.get_package_only("data.models")),
-                ("TileVariant.kt", self.get_package_only("data.models")),
-                ("DynamicLevel.kt", self.get_package_only("data.models")),
-                ("DynamicTile.kt", self.get_package_only("data.models")),
-                ("DynamicGameState.kt", self.get_package_only("data.models")),
-            ],
-            
-            "data/config": [
-                ("GameConfig.kt", self.get_package_only("data.config")),
-                ("ShopConfig.kt", self.get_package_only("data.config")),
-                ("TextConfig.kt", self.get_package_only("data.config")),
-                ("BalanceConfig.kt", self.get_package_only("data.config")),
-            ],
-            
-            "data/repository": [
-                ("GameRepository.kt", self.get_package_only("data.repository")),
-                ("PreferencesRepository.kt", self.get_package_only("data.repository")),
-            ],
-            
-            "data/local": [
-                ("PreferencesManager.kt", self.get_package_only("data.local")),
-            ],
-            
-            # Domain Layer
-            "domain": [
-                ("DynamicSkinManager.kt", self.get_package_only("domain")),
-                ("DifficultyBasedSelector.kt", self.get_package_only("domain")),
-                ("DynamicLevelGenerator.kt", self.get_package_only("domain")),
-                ("ConfigManager.kt", self.get_package_only("domain")),
-            ],
-            
-            # Utils
-            "utils": [
-                ("DynamicAssetScanner.kt", self.get_package_only("utils")),
-                ("AssetLoader.kt", self.get_package_only("utils")),
-                ("SoundManager.kt", self.get_package_only("utils")),
-                ("VibrationManager.kt", self.get_package_only("utils")),
-                ("AdManager.kt", self.get_package_only("utils")),
-                ("Constants.kt", self.get_package_only("utils")),
-                ("Extensions.kt", self.get_package_only("utils")),
-            ],
-            
-            # UI Components
-            "ui/components": [
-                ("DynamicTileGrid.kt", self.get_package_only("ui.components")),
-                ("DynamicColorDisplayBar.kt", self.get_package_only("ui.components")),
-                ("TopBar.kt", self.get_package_only("ui.components")),
-                ("ItemBar.kt", self.get_package_only("ui.components")),
-            ],
-            
-            # UI Screens
-            "ui/screens/splash": [
-                ("SplashScreen.kt", self.get_package_only("ui.screens.splash")),
-                ("SplashViewModel.kt", self.get_package_only("ui.screens.splash")),
-            ],
-            
-            "ui/screens/menu": [
-                ("MainMenuScreen.kt", self.get_package_only("ui.screens.menu")),
-                ("MainMenuViewModel.kt", self.get_package_only("ui.screens.menu")),
-            ],
-            
-            "ui/screens/game": [
-                ("DynamicGameScreen.kt", self.get_package_only("ui.screens.game")),
-                ("DynamicGameViewModel.kt", self.get_package_only("ui.screens.game")),
-            ],
-            
-            "ui/screens/gameover": [
-                ("GameOverScreen.kt", self.get_package_only("ui.screens.gameover")),
-                ("GameOverViewModel.kt", self.get_package_only("ui.screens.gameover")),
-            ],
-            
-            "ui/screens/shop": [
-                ("ShopScreen.kt", self.get_package_only("ui.screens.shop")),
-                ("ShopViewModel.kt", self.get_package_only("ui.screens.shop")),
-            ],
-            
-            # Navigation
-            "ui/navigation": [
-                ("Screen.kt", self.get_package_only("ui.navigation")),
-                ("AppNavGraph.kt", self.get_package_only("ui.navigation")),
-            ],
-        }
+        base = self.project_root / self.spec["kotlin_base"]
         
-        for folder_path, files in structure.items():
-            full_folder = base / folder_path
-            full_folder.mkdir(parents=True, exist_ok=True)
-            
-            if not (full_folder / ".created").exists():
-                self.stats['folders'] += 1
-                self.print_success(f"Created: {folder_path}/")
-            
-            for filename, content in files:
-                file_path = full_folder / filename
-                
-                if not file_path.exists():
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    
-                    self.stats['kotlin_files'] += 1
-                    self.print_info(f"  ✓ {folder_path}/{filename}")
+        structure = kotlin_structure(self.spec)
+        
+        # Phase 1: snapshot + plan, Phase 2: parallel apply
+        self.plan = build_plan(base, structure)
+        created = apply_plan(self.plan, writer=self.writer)
+        
+        self.stats['folders'] += len(self.plan.folders)
+        self.stats['kotlin_files'] += len(created)
+        
+        for folder_path in self.plan.folders:
+            self.print_success(f"Created: {folder_path}/")
+        
+        for entry in created:
+            self.reporter.item("created", entry.rel_path)
+        
+        for entry in self.plan.conflicts:
+            self.print_warning(f"Conflict: {entry.rel_path} ({entry.reason})")
         
         self.print_success(f"\nCreated {self.stats['kotlin_files']} Kotlin files in {self.stats['folders']} folders")
     
@@ -215,31 +123,21 @@ class ColorTrapSetup:
         """Create assets folder structure"""
         self.print_header("STEP 2: Creating Asset Folders")
         
-        assets_base = self.project_root / "app" / "src" / "main" / "assets"
-        
-        folders = [
-            "config",
-            "skins/color",
-            "audio",
-            "effects",
-            "ui",
-        ]
+        assets_root = self.spec["assets_root"]
+        assets_base = self.project_root / assets_root
         
-        for folder in folders:
+        for folder in self.spec["asset_folders"]:
             full_path = assets_base / folder
+            count(STAT)
             if not full_path.exists():
-                full_path.mkdir(parents=True, exist_ok=True)
-                # Create .gitkeep
-                (full_path / ".gitkeep").touch()
+                # Staging .gitkeep creates the folder on publish
+                self.writer.write(f"{assets_root}/{folder}/.gitkeep", b"", overwrite=False)
                 self.print_success(f"Created: assets/{folder}/")
     
     def create_json_configs(self):
         """Create JSON configuration files"""
         self.print_header("STEP 3: Creating JSON Configs")
         
-        config_path = self.project_root / "app" / "src" / "main" / "assets" / "config"
-        config_path.mkdir(parents=True, exist_ok=True)
-        
         # game_config.json
         game_config = {
             "version": "1.0",
@@ -350,96 +248,100 @@ class ColorTrapSetup:
             }
         }
         
-        configs = {
-            "game_config.json": game_config,
-            "balance_config.json": balance_config,
-        }
+        self.balance_config = balance_config
+        
+        configs = dict(zip(JSON_CONFIGS, (game_config, balance_config)))
         
         for filename, data in configs.items():
-            file_path = config_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            
-            self.stats['json_files'] += 1
-            self.print_success(f"Created: {filename}")
+            rel_path = f"app/src/main/assets/config/{filename}"
+            if self.write_generated(rel_path, json.dumps(data, indent=2)):
+                self.stats['json_files'] += 1
+    
+    def create_generated_sources(self):
+        """Generate LevelTables.kt and the compact data models"""
+        self.print_header("STEP 4: Generating Kotlin Sources")
+        
+        balance_config = self.balance_config
+        if BALANCE_CONFIG_PATH in self.drifted:
+            # Hand-edited JSON wins over the template
+            balance_config = load_balance_config(self.project_root)
+        
+        for severity, mode, message in validate_balance_config(balance_config):
+            label = "balance_config" if severity == ERROR else "balance_config (warning)"
+            self.print_warning(f"{label}: {mode}: {message}")
+        
+        sources = {LEVEL_TABLES_PATH: render_level_tables(balance_config)}
+        sources.update(render_compact_models())
+        
+        for rel_path, content in sources.items():
+            if self.write_generated(rel_path, content):
+                self.stats['generated_files'] += 1
     
     def create_documentation(self):
         """Create project documentation"""
-        self.print_header("STEP 4: Creating Documentation")
+        self.print_header("STEP 5: Creating Documentation")
         
-        docs = {
-            "SETUP_STATUS.md": self.get_setup_status_doc(),
-            "COPY_GUIDE.md": self.get_copy_guide_doc(),
-            "FILE_MAP.md": self.get_file_map_doc(),
-        }
+        docs = dict(zip(DOC_FILES, (self.get_setup_status_doc(), self.get_copy_guide_doc(), self.get_file_map_doc())))
         
         for filename, content in docs.items():
-            file_path = self.project_root / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            self.stats['doc_files'] += 1
-            self.print_success(f"Created: {filename}")
+            if self.write_generated(filename, content):
+                self.stats['doc_files'] += 1
     
-    def get_package_only(self, package_path):
-        """Generate file with only package declaration"""
-        package_name = f"com.colortrap.game.{package_path}"
-        return f"""package {package_name}
-
-// TODO: Copy code from artifacts
-// See COPY_GUIDE.md for artifact sources
-"""
-    
-    def get_gamemode_template(self):
-        return """package com.colortrap.game.data.models
-
-enum class GameMode {
-    NORMAL,
-    HARD,
-    SUPER_HARD,
-    RELAX,
-    ENDLESS,
-    DAILY_CHALLENGE
-}
-"""
+    def create_asset_bundle(self):
+        """Pack config/effects/skins into the aligned asset bundle"""
+        self.print_header("STEP 6: Packing Asset Bundle")
+        
+        files = collect_trees(self.project_root)
+        # Streamed into the staging dir; skins can be too large to build in memory
+        sha256 = self.writer.write_stream(BUNDLE_PATH, lambda f: pack_bundle(f, files))
+        if self.publish_decision(BUNDLE_PATH, self.manifest.check_hash(BUNDLE_PATH, sha256)):
+            self.tracked.add(BUNDLE_PATH)
+            self.stats['generated_files'] += 1
+        else:
+            self.writer.unstage(BUNDLE_PATH)
+        self.print_info(f"{len(files)} assets in {BUNDLE_PATH}")
     
-    def get_itemtype_template(self):
-        return """package com.colortrap.game.data.models
-
-enum class ItemType {
-    ADD_TIME,
-    HINT,
-    SHIELD,
-    REMOVE_TRAP,
-    SLOW_TIME,
-    SHUFFLE
-}
-"""
+    def write_generated(self, rel_path, content):
+        """Write a generated artifact unless the manifest says it is up to date"""
+        data = content if isinstance(content, bytes) else content.encode('utf-8')
+        if not self.publish_decision(rel_path, self.manifest.check(rel_path, data)):
+            return False
+        
+        self.writer.write(rel_path, data)
+        self.tracked.add(rel_path)
+        return True
     
-    def get_levelmodifier_template(self):
-        return """package com.colortrap.game.data.models
-
-enum class LevelModifier {
-    COLORS_DISAPPEAR,
-    SHUFFLE_TILES,
-    SIMILAR_COLORS,
-    TEXT_ONLY,
-    COMBO_MODIFIER
-}
-"""
+    def publish_decision(self, rel_path, status):
+        """Report a manifest check result; True when the new output should be published"""
+        if status == mf.UNCHANGED:
+            self.stats['unchanged'] += 1
+            self.reporter.item("unchanged", rel_path)
+            return False
+        
+        if status == mf.DRIFT and not self.force:
+            self.stats['drift'] += 1
+            self.drifted.add(rel_path)
+            self.print_warning(f"Drift: {rel_path} was edited by hand, keeping it (use force to overwrite)")
+            return False
+        
+        self.print_success(f"{'Created' if status == mf.NEW else 'Updated'}: {rel_path}")
+        return True
     
-    def get_difficultylevel_template(self):
-        return """package com.colortrap.game.data.models
-
-enum class DifficultyLevel {
-    EASY,
-    MEDIUM,
-    HARD,
-    SUPER_HARD
-}
-"""
+    def publish(self):
+        """Publish all staged outputs, then record them in the manifest"""
+        published = self.writer.commit()
+        
+        for entry in published:
+            if entry.rel_path in self.tracked:
+                if entry.data is None:
+                    self.manifest.record_hash(entry.rel_path, entry.sha256)
+                else:
+                    self.manifest.record(entry.rel_path, entry.data)
+        self.manifest.save()
     
     def get_setup_status_doc(self):
+        # Counts come from the spec, not this run, so reruns render the same bytes
+        kotlin_files = sum(len(entries) for entries in self.spec["folders"].values())
         return """# Setup Status
 
 ## ✅ Completed by Script
@@ -468,9 +370,9 @@ See `COPY_GUIDE.md` for detailed instructions
 
 ## 📊 Statistics
 
-""" + f"""- Kotlin files: {self.stats['kotlin_files']}
-- JSON configs: {self.stats['json_files']}
-- Documentation: {self.stats['doc_files']}
+""" + f"""- Kotlin files: {kotlin_files}
+- JSON configs: {len(JSON_CONFIGS)}
+- Documentation: {len(DOC_FILES)}
 """
     
     def get_copy_guide_doc(self):
@@ -536,6 +438,8 @@ Start with these 4 files to get basic structure working:
 """
     
     def get_file_map_doc(self):
+        entries = [e for folder in self.spec["folders"].values() for e in folder]
+        complete = sum(1 for e in entries if e["complete"])
         return """# File Map - Complete Structure
 
 ## 📁 Project Structure
@@ -605,42 +509,47 @@ Legend:
 ✅ = Complete (has code)
 ⏳ = Empty (needs code from artifacts)
 
-Total: 4 complete, 41 to copy
+""" + f"""Total: {complete} complete, {len(entries) - complete} to copy
 """
     
     def print_summary(self):
         """Print completion summary"""
+        self.reporter.summary(self.stats)
         self.print_header("✅ SETUP COMPLETE!")
         
-        print(f"\n{Colors.CYAN}📊 Summary:{Colors.END}")
-        print(f"  • Folders: {Colors.GREEN}{self.stats['folders']}{Colors.END}")
-        print(f"  • Kotlin files: {Colors.GREEN}{self.stats['kotlin_files']}{Colors.END}")
-        print(f"  • JSON configs: {Colors.GREEN}{self.stats['json_files']}{Colors.END}")
-        print(f"  • Documentation: {Colors.GREEN}{self.stats['doc_files']}{Colors.END}")
-        
-        print(f"\n{Colors.YELLOW}📝 What's Created:{Colors.END}")
-        print(f"  ✓ All folder structure")
-        print(f"  ✓ Empty Kotlin files (with package declarations)")
-        print(f"  ✓ 4 enum files with complete code")
-        print(f"  ✓ JSON configs (game_config.json, balance_config.json)")
-        print(f"  ✓ Asset folders")
-        print(f"  ✓ Documentation (3 files)")
-        
-        print(f"\n{Colors.CYAN}📂 Files Created:{Colors.END}")
-        print(f"  • {Colors.MAGENTA}SETUP_STATUS.md{Colors.END} - Current status & checklist")
-        print(f"  • {Colors.MAGENTA}COPY_GUIDE.md{Colors.END} - Which code goes where")
-        print(f"  • {Colors.MAGENTA}FILE_MAP.md{Colors.END} - Complete file structure")
-        
-        print(f"\n{Colors.YELLOW}⏭️ Next Steps:{Colors.END}")
-        print(f"  1. Read {Colors.CYAN}COPY_GUIDE.md{Colors.END}")
-        print(f"  2. Start copying code from artifacts")
-        print(f"  3. Priority: data/config/* files first")
-        print(f"  4. Replace build.gradle.kts")
-        print(f"  5. Replace strings.xml")
-        print(f"  6. Sync Gradle & Build")
-        
-        print(f"\n{Colors.GREEN}🚀 Ready to copy code!{Colors.END}")
-        print(f"{Colors.BLUE}Open COPY_GUIDE.md for detailed instructions{Colors.END}\n")
+        self.reporter.text(f"\n{Colors.CYAN}📊 Summary:{Colors.END}")
+        self.reporter.text(f"  • Folders: {Colors.GREEN}{self.stats['folders']}{Colors.END}")
+        self.reporter.text(f"  • Kotlin files: {Colors.GREEN}{self.stats['kotlin_files']}{Colors.END}")
+        self.reporter.text(f"  • JSON configs: {Colors.GREEN}{self.stats['json_files']}{Colors.END}")
+        self.reporter.text(f"  • Documentation: {Colors.GREEN}{self.stats['doc_files']}{Colors.END}")
+        self.reporter.text(f"  • Generated sources: {Colors.GREEN}{self.stats['generated_files']}{Colors.END}")
+        self.reporter.text(f"  • Unchanged: {Colors.GREEN}{self.stats['unchanged']}{Colors.END}")
+        if self.stats['drift']:
+            self.reporter.text(f"  • Drifted (kept): {Colors.YELLOW}{self.stats['drift']}{Colors.END}")
+        
+        self.reporter.text(f"\n{Colors.YELLOW}📝 What's Created:{Colors.END}")
+        self.reporter.text(f"  ✓ All folder structure")
+        self.reporter.text(f"  ✓ Empty Kotlin files (with package declarations)")
+        self.reporter.text(f"  ✓ 4 enum files with complete code")
+        self.reporter.text(f"  ✓ JSON configs (game_config.json, balance_config.json)")
+        self.reporter.text(f"  ✓ Asset folders")
+        self.reporter.text(f"  ✓ Documentation (3 files)")
+        
+        self.reporter.text(f"\n{Colors.CYAN}📂 Files Created:{Colors.END}")
+        self.reporter.text(f"  • {Colors.MAGENTA}SETUP_STATUS.md{Colors.END} - Current status & checklist")
+        self.reporter.text(f"  • {Colors.MAGENTA}COPY_GUIDE.md{Colors.END} - Which code goes where")
+        self.reporter.text(f"  • {Colors.MAGENTA}FILE_MAP.md{Colors.END} - Complete file structure")
+        
+        self.reporter.text(f"\n{Colors.YELLOW}⏭️ Next Steps:{Colors.END}")
+        self.reporter.text(f"  1. Read {Colors.CYAN}COPY_GUIDE.md{Colors.END}")
+        self.reporter.text(f"  2. Start copying code from artifacts")
+        self.reporter.text(f"  3. Priority: data/config/* files first")
+        self.reporter.text(f"  4. Replace build.gradle.kts")
+        self.reporter.text(f"  5. Replace strings.xml")
+        self.reporter.text(f"  6. Sync Gradle & Build")
+        
+        self.reporter.text(f"\n{Colors.GREEN}🚀 Ready to copy code!{Colors.END}")
+        self.reporter.text(f"{Colors.BLUE}Open COPY_GUIDE.md for detailed instructions{Colors.END}\n")
     
     def run(self):
         """Main execution flow"""
@@ -649,24 +558,58 @@ Total: 4 complete, 41 to copy
         try:
             # Find project
             self.print_info("Locating project...")
-            self.project_root = self.find_project_root()
+            try:
+                self.project_root = self.find_project_root()
+            except ProjectRootError as e:
+                self.error = str(e)
+                self.print_error(self.error)
+                return False
             
             if not self.project_root.exists():
-                self.print_error(f"Project not found: {self.project_root}")
+                self.error = f"Project not found: {self.project_root}"
+                self.print_error(self.error)
                 return False
             
             self.print_success(f"Found: {self.project_root}")
             
             # Verify
             if not self.verify_project():
-                self.print_error("Not a valid Android project")
+                self.error = "Not a valid Android project"
+                self.print_error(self.error)
                 return False
             
-            # Execute steps
-            self.create_kotlin_structure()
-            self.create_asset_structure()
-            self.create_json_configs()
-            self.create_documentation()
+            with self.profiler.phase("load_spec"):
+                if self.spec is None:
+                    self.spec = load_compiled(self.project_root)
+                self.manifest = mf.Manifest(self.project_root)
+            self.writer = BatchWriter(self.project_root)
+            for staging, restored in self.writer.recovered:
+                self.print_warning(f"Rolled back an interrupted publish ({staging}, {restored} files restored)")
+            
+            # Execute steps (outputs are staged, then published together)
+            try:
+                with self.profiler.phase("create_kotlin_structure"):
+                    self.create_kotlin_structure()
+                with self.profiler.phase("create_asset_structure"):
+                    self.create_asset_structure()
+                with self.profiler.phase("create_json_configs"):
+                    self.create_json_configs()
+                with self.profiler.phase("create_generated_sources"):
+                    self.create_generated_sources()
+                with self.profiler.phase("create_documentation"):
+                    self.create_documentation()
+                with self.profiler.phase("publish"):
+                    self.publish()
+                if self.bundle:
+                    # Second batch: the bundle packs the configs published above
+                    self.writer = BatchWriter(self.project_root)
+                    with self.profiler.phase("create_asset_bundle"):
+                        self.create_asset_bundle()
+                    with self.profiler.phase("publish_bundle"):
+                        self.publish()
+            except BaseException:
+                self.writer.discard()
+                raise
             
             # Summary
             self.print_summary()
@@ -674,17 +617,161 @@ Total: 4 complete, 41 to copy
             return True
             
         except KeyboardInterrupt:
-            print(f"\n\n{Colors.YELLOW}⚠ Cancelled by user{Colors.END}")
+            self.print_warning("Cancelled by user")
             return False
         except Exception as e:
+            self.error = str(e)
             self.print_error(f"Error: {e}")
-            import traceback
-            traceback.print_exc()
+            if isinstance(self.reporter, HumanReporter):
+                self.reporter.flush()
+                import traceback
+                traceback.print_exc()
             return False
+        finally:
+            self.reporter.flush()
+    
+    @classmethod
+    def run_batch(cls, roots, force=False, jobs=None, bundle=False, cprofile_dir=None):
+        """
+        Set up many project roots on a process pool
+        The spec is compiled once here and shared with every worker
+        Returns one result dict per distinct root, in input order
+        """
+        roots = unique_roots(roots)
+        # Any root's .colortrap/spec-cache will do; the entry is keyed by spec hash
+        spec = load_compiled(roots[0] if roots else None)
+        
+        results = {}
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                                 initargs=(spec,)) as pool:
+            futures = {}
+            for i, root in enumerate(roots):
+                # One .prof folder per project so workers never overwrite each other
+                project_prof = os.path.join(cprofile_dir, f"{i:03d}-{Path(root).name}") if cprofile_dir else None
+                futures[pool.submit(_run_batch_project, root, force, bundle, project_prof)] = root
+            for future in as_completed(futures):
+                root = futures[future]
+                try:
+                    results[root] = future.result()
+                except Exception as e:
+                    results[root] = {"root": root, "success": False, "error": str(e), "stats": {}}
+        
+        return [results[root] for root in roots]
+    
+    @staticmethod
+    def print_batch_summary(results, reporter):
+        """Print one aggregated report for a batch run"""
+        ok = [r for r in results if r["success"]]
+        totals = {}
+        for r in ok:
+            for key, value in r["stats"].items():
+                totals[key] = totals.get(key, 0) + value
+        
+        reporter.summary({"projects": len(results), "succeeded": len(ok), "totals": totals})
+        reporter.header("✅ BATCH SETUP COMPLETE!")
+        
+        reporter.text(f"{Colors.CYAN}📂 Projects:{Colors.END}")
+        for r in results:
+            if r["success"]:
+                s = r["stats"]
+                reporter.text(f"  {Colors.GREEN}✓{Colors.END} {r['root']} "
+                              f"(kotlin {s['kotlin_files']}, json {s['json_files']}, docs {s['doc_files']}, "
+                              f"unchanged {s['unchanged']}, drift {s['drift']})")
+            else:
+                reporter.text(f"  {Colors.RED}✗ {r['root']}: {r['error']}{Colors.END}")
+        
+        reporter.text(f"\n{Colors.CYAN}📊 Totals ({len(ok)}/{len(results)} succeeded):{Colors.END}")
+        for key, value in totals.items():
+            reporter.text(f"  • {key}: {Colors.GREEN}{value}{Colors.END}")
+        reporter.text()
+        reporter.flush()
+
+# Shared by all projects handled in one batch worker process
+_batch_spec = None
+
+def _init_batch_worker(spec):
+    global _batch_spec
+    _batch_spec = spec
+
+def _run_batch_project(root, force, bundle, cprofile_dir):
+    setup = ColorTrapSetup(root=root, force=force, spec=_batch_spec, quiet=True, cprofile_dir=cprofile_dir,
+                           bundle=bundle)
+    success = setup.run()
+    return {
+        "root": root,
+        "success": success,
+        "error": setup.error,
+        "stats": dict(setup.stats),
+        "profile": setup.profiler.to_dict(),
+    }
+
+def unique_roots(roots):
+    """Resolved roots with duplicates (same path, any spelling) removed, first occurrence kept"""
+    seen = []
+    for root in roots:
+        resolved = str(Path(root).expanduser().resolve())
+        if resolved not in seen:
+            seen.append(resolved)
+    return seen
+
+def read_batch_file(path):
+    """Project roots from a JSON list or a text file with one root per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return [str(root) for root in json.loads(text)]
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Phase 2 Auto Setup")
+    parser.add_argument("--root", help="Project root (default: $COLORTRAP_ROOT or search upward from cwd)")
+    parser.add_argument("--force", action="store_true", help="Overwrite generated files that were edited by hand")
+    parser.add_argument("--batch", nargs="+", metavar="ROOT", help="Set up several project roots in parallel")
+    parser.add_argument("--batch-file", help="JSON list or text file (one root per line) of project roots")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--report", help="Write the aggregated batch report as JSON to this path")
+    parser.add_argument("--profile", metavar="PATH", help="Write per-phase timing and I/O counters as JSON ('-' for stdout)")
+    parser.add_argument("--cprofile", metavar="DIR", help="Also capture a cProfile .prof file per phase into DIR")
+    parser.add_argument("--bundle", action="store_true", help=f"Also pack config/effects/skins into {BUNDLE_PATH}")
+    parser.add_argument("--output", choices=SINKS, default="human", help="Progress output: human (default), quiet or json lines")
+    parser.add_argument("--verbose", action="store_true", help="List every file instead of a coalesced progress line")
+    args = parser.parse_args(argv)
+    if args.profile == "-" and args.output == "json":
+        # Both would share stdout and break the JSON-lines stream
+        parser.error("--profile - cannot be combined with --output json; write the profile to a file")
+    return args
 
 def main():
-    setup = ColorTrapSetup()
+    args = parse_args()
+    reporter = make_reporter(args.output, verbose=args.verbose, width=70)
+    
+    if args.batch or args.batch_file:
+        roots = list(args.batch or [])
+        if args.batch_file:
+            roots += read_batch_file(args.batch_file)
+        duplicates = len(roots) - len(unique_roots(roots))
+        if duplicates:
+            reporter.warning(f"Skipping {duplicates} duplicate project root(s)")
+        results = ColorTrapSetup.run_batch(roots, force=args.force, jobs=args.jobs, bundle=args.bundle,
+                                           cprofile_dir=args.cprofile)
+        ColorTrapSetup.print_batch_summary(results, reporter)
+        if args.profile:
+            text = json.dumps({r["root"]: r.get("profile") for r in results}, indent=2)
+            if args.profile == "-":
+                print(text)
+            else:
+                with open(args.profile, 'w', encoding='utf-8') as f:
+                    f.write(text + "\n")
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+        sys.exit(0 if all(r["success"] for r in results) else 1)
+    
+    setup = ColorTrapSetup(root=args.root, force=args.force, cprofile_dir=args.cprofile, reporter=reporter,
+                           bundle=args.bundle)
     success = setup.run()
+    if args.profile:
+        setup.profiler.dump(args.profile)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
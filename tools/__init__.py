@@ -0,0 +1,4 @@
+"""
+ColorTrap - Setup Tooling
+Shared helpers used by create_structure.py and setup_phase_2.py
+"""
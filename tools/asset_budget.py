@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Asset Size Budgets
+Streams over app/src/main/assets and app/src/main/res, totals bytes per
+directory, skin, color group and density bucket, and checks the totals
+against tools/asset_budgets.json. Exits 1 when any budget is exceeded.
+Incremental: file hashes come from the asset hash cache, and the previous
+run's snapshot is diffed to list what was added, changed or removed.
+
+Usage:
+    python -m tools.asset_budget [--root PATH] [--budgets PATH] [--depth 3] [--json PATH]
+"""
+
+import os
+import sys
+import json
+import fnmatch
+import argparse
+from pathlib import Path
+
+from tools.assets import ASSETS_ROOT, RES_ROOT, SKINS_DIR, iter_files
+from tools.asset_cache import HashCache
+
+BUDGETS_PATH = "tools/asset_budgets.json"
+SNAPSHOT_PATH = ".colortrap/budget_snapshot.json"
+DENSITIES = ("ldpi", "mdpi", "tvdpi", "hdpi", "xhdpi", "xxhdpi", "xxxhdpi", "nodpi", "anydpi")
+
+
+def density_bucket(rel_path):
+    """res/mipmap-xxhdpi/x.png -> 'xxhdpi'; qualifier-free res dirs -> 'default'"""
+    folder = rel_path[len(RES_ROOT) + 1:].split("/")[0]
+    for qualifier in folder.split("-")[1:]:
+        if qualifier in DENSITIES:
+            return qualifier
+    return "default"
+
+
+def buckets_for(rel_path):
+    """Every bucket a file counts towards: 'dir:<path>', 'skin:', 'group:', 'density:'"""
+    parts = rel_path.split("/")
+    keys = ["total"] + [f"dir:{'/'.join(parts[:i])}" for i in range(len(ASSETS_ROOT.split("/")), len(parts))]
+
+    skins_prefix = f"{ASSETS_ROOT}/{SKINS_DIR}/"
+    if rel_path.startswith(skins_prefix):
+        rest = rel_path[len(skins_prefix):].split("/")
+        if len(rest) >= 2:
+            keys.append(f"skin:{rest[0]}")
+        if len(rest) >= 3:
+            keys.append(f"group:{rest[0]}/{rest[1]}")
+    elif rel_path.startswith(RES_ROOT + "/"):
+        keys.append(f"density:{density_bucket(rel_path)}")
+    return keys
+
+
+def collect(root, tops=(ASSETS_ROOT, RES_ROOT)):
+    """Returns ({bucket: bytes}, {rel: [bytes, sha256]}, hash cache hits, misses)"""
+    hashes = HashCache(root)
+    totals = {}
+    files = {}
+    for top in tops:
+        for rel, entry in iter_files(root, top):
+            st = entry.stat()
+            files[rel] = [st.st_size, hashes.digest(rel, st)]
+            for key in buckets_for(rel):
+                totals[key] = totals.get(key, 0) + st.st_size
+    hashes.prune(files, tops)
+    hashes.save()
+    return totals, files, hashes.hits, hashes.misses
+
+
+def check_budgets(totals, budgets):
+    """
+    [(bucket, bytes, budget)] for every bucket over budget
+    Budget keys may use shell wildcards ('skin:*', 'group:*/*'); an exact
+    key wins over a pattern
+    """
+    over = []
+    for key, size in totals.items():
+        limit = budgets.get(key)
+        if limit is None:
+            limits = [v for pattern, v in budgets.items() if fnmatch.fnmatchcase(key, pattern)]
+            limit = min(limits) if limits else None
+        if limit is not None and size > limit:
+            over.append((key, size, limit))
+    return sorted(over)
+
+
+def diff_snapshot(old, new):
+    """(added, changed, removed) paths between two {rel: [bytes, sha256]} snapshots"""
+    added = sorted(rel for rel in new if rel not in old)
+    removed = sorted(rel for rel in old if rel not in new)
+    changed = sorted(rel for rel in new if rel in old and old[rel][1] != new[rel][1])
+    return added, changed, removed
+
+
+def _load_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _save_snapshot(root, files):
+    path = root / SNAPSHOT_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(files, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _kb(n):
+    return f"{n / 1024:,.1f} KB"
+
+
+def print_report(totals, depth, groups=False):
+    base = len(ASSETS_ROOT.split("/"))
+    print(f"{'Bucket':<48} {'size':>12}")
+    for key in sorted(k for k in totals if k.startswith("dir:")):
+        path = key[4:]
+        level = len(path.split("/")) - base
+        if level < depth:
+            print(f"{'  ' * level + path.split('/')[-1] + '/':<48} {_kb(totals[key]):>12}")
+    for prefix in ("skin:", "group:", "density:"):
+        if prefix == "group:" and not groups:
+            continue
+        for key in sorted(k for k in totals if k.startswith(prefix)):
+            print(f"{key:<48} {_kb(totals[key]):>12}")
+    print(f"{'total':<48} {_kb(totals.get('total', 0)):>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Asset Size Budgets")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--budgets", default=None, help=f"Budget file (default: {BUDGETS_PATH})")
+    parser.add_argument("--depth", type=int, default=3, help="Directory levels to print (default: 3)")
+    parser.add_argument("--groups", action="store_true", help="Also print every skin color group")
+    parser.add_argument("--json", metavar="PATH", help="Also write totals, overruns and changes as JSON")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    budgets_file = Path(args.budgets) if args.budgets else root / BUDGETS_PATH
+    budgets = _load_json(budgets_file, {}).get("budgets", {})
+
+    old_snapshot = _load_json(root / SNAPSHOT_PATH, {})
+    totals, files, hits, misses = collect(root)
+    added, changed, removed = diff_snapshot(old_snapshot, files)
+    over = check_budgets(totals, budgets)
+    _save_snapshot(root, files)
+
+    print_report(totals, args.depth, args.groups)
+    if not old_snapshot:
+        print(f"\n→ {len(files)} files ({hits} hashes cached, {misses} hashed); first run, snapshot saved")
+    else:
+        print(f"\n→ {len(files)} files ({hits} hashes cached, {misses} hashed); "
+              f"since last run: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+        for label, paths in (("+", added), ("~", changed), ("-", removed)):
+            for rel in paths[:20]:
+                print(f"  {label} {rel}")
+            if len(paths) > 20:
+                print(f"  {label} ... {len(paths) - 20} more")
+
+    for key, size, limit in over:
+        print(f"✗ {key}: {_kb(size)} exceeds budget {_kb(limit)} (+{_kb(size - limit)})")
+    if not over:
+        print(f"✓ All {len(budgets)} budgets met")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                "totals": totals,
+                "over": [{"bucket": k, "bytes": s, "budget": b} for k, s, b in over],
+                "added": added, "changed": changed, "removed": removed,
+            }, f, indent=2, sort_keys=True)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Aligned Asset Bundle
+Packs asset trees into one stored (uncompressed) archive whose entries
+start on 4-byte boundaries, with a name-sorted index up front, so the app
+can memory-map it and slice images and configs out without copies.
+
+Layout (little-endian):
+    header   24 B   magic "CTB1", version u16, flags u16, count u32,
+                    index offset u32, names offset u32, data offset u32
+    index    20 B × count, sorted by UTF-8 name bytes:
+                    name offset u32 (from names offset), name length u32,
+                    data offset u32 (absolute, aligned), data length u32, crc32 u32
+    names    UTF-8 names back to back, padded to the alignment
+    data     entry payloads, each padded to the alignment
+
+Usage:
+    python -m tools.asset_bundle [--root PATH] [--tree config --tree skins ...] [--out PATH]
+    python -m tools.asset_bundle --list PATH | --verify PATH
+"""
+
+import io
+import os
+import sys
+import mmap
+import zlib
+import bisect
+import struct
+import argparse
+from pathlib import Path
+
+from tools.assets import ASSETS_ROOT, iter_files
+
+MAGIC = b"CTB1"
+VERSION = 1
+ALIGN = 4
+HEADER = struct.Struct("<4sHHIIII")
+ENTRY = struct.Struct("<IIIII")
+DEFAULT_TREES = ("config", "effects", "skins")
+# Outside assets/ while the app still reads the loose files: packaging both
+# would ship every bundled asset twice
+BUNDLE_PATH = ".colortrap/assets.ctb"
+# Not bundled: placeholders and the bundle itself
+SKIP_NAMES = (".gitkeep",)
+
+
+class BundleError(Exception):
+    """Malformed bundle file"""
+
+
+def _pad(n):
+    return (-n) % ALIGN
+
+
+def collect_trees(root, trees=DEFAULT_TREES):
+    """[(asset-relative name, absolute path)] for every file under assets/<tree>"""
+    files = []
+    for tree in trees:
+        for rel, entry in iter_files(root, f"{ASSETS_ROOT}/{tree}"):
+            if entry.name in SKIP_NAMES or entry.name.endswith(".ctb"):
+                continue
+            files.append((rel[len(ASSETS_ROOT) + 1:], entry.path))
+    return files
+
+
+def pack(stream, files):
+    """
+    Write a bundle to a seekable binary stream
+    files: [(name, bytes or path)]; returns the number of entries
+    Data is streamed one entry at a time; the index is filled in last
+    """
+    items = sorted(((name.encode('utf-8'), source) for name, source in files), key=lambda i: i[0])
+    names = [name for name, _ in items]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate names in bundle")
+
+    count = len(items)
+    index_offset = HEADER.size
+    names_offset = index_offset + ENTRY.size * count
+    names_size = sum(len(n) for n in names)
+    data_offset = names_offset + names_size + _pad(names_size)
+
+    base = stream.tell()
+    stream.write(HEADER.pack(MAGIC, VERSION, 0, count, index_offset, names_offset, data_offset))
+    stream.write(b"\0" * (ENTRY.size * count))
+    stream.write(b"".join(names))
+    stream.write(b"\0" * _pad(names_size))
+
+    entries = []
+    name_pos = 0
+    offset = data_offset
+    for name, source in items:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            with open(source, 'rb') as f:
+                data = f.read()
+        stream.write(data)
+        stream.write(b"\0" * _pad(len(data)))
+        entries.append(ENTRY.pack(name_pos, len(name), offset, len(data), zlib.crc32(data)))
+        name_pos += len(name)
+        offset += len(data) + _pad(len(data))
+
+    end = stream.tell()
+    stream.seek(base + index_offset)
+    stream.write(b"".join(entries))
+    stream.seek(end)
+    return count
+
+
+def build_bundle(files):
+    """Bundle bytes for [(name, bytes or path)], built in memory; large bundles go through pack()/write_bundle()"""
+    buffer = io.BytesIO()
+    pack(buffer, files)
+    return buffer.getvalue()
+
+
+def write_bundle(path, files):
+    """Write a bundle file atomically; returns the number of entries"""
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        count = pack(f, files)
+    os.replace(tmp_path, path)
+    return count
+
+
+class AssetBundle:
+    """
+    Memory-mapped, read-only view of a bundle
+    get() returns memoryview slices of the map; release them before close()
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            self._file.close()
+            raise BundleError(f"{path}: too small for a bundle header")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, _, count, index_offset, names_offset, data_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise BundleError(f"{path}: bad magic {magic!r}")
+        if version != VERSION:
+            self.close()
+            raise BundleError(f"{path}: unsupported version {version}")
+        if (names_offset != index_offset + ENTRY.size * count
+                or not names_offset <= data_offset <= size):
+            self.close()
+            raise BundleError(f"{path}: inconsistent header")
+
+        self.count = count
+        self._index_offset = index_offset
+        self._names_offset = names_offset
+        self._names = None
+
+        # Bounds are checked once here so get() can slice without checks
+        names_size = data_offset - names_offset
+        for i, (name_pos, name_len, offset, length, _) in enumerate(
+                ENTRY.iter_unpack(self._map[index_offset:names_offset])):
+            if name_pos + name_len > names_size or offset < data_offset or offset + length > size:
+                self.close()
+                raise BundleError(f"{path}: index entry {i} points outside the file")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self._map, self._index_offset + i * ENTRY.size)
+
+    def _name_bytes(self):
+        # Decoded once; lookups bisect this sorted list
+        if self._names is None:
+            names = []
+            for i in range(self.count):
+                name_pos, name_len, _, _, _ = self._entry(i)
+                start = self._names_offset + name_pos
+                names.append(bytes(self._map[start:start + name_len]))
+            self._names = names
+        return self._names
+
+    def names(self):
+        return [n.decode('utf-8') for n in self._name_bytes()]
+
+    def find(self, name):
+        """Index position of name, or -1"""
+        key = name.encode('utf-8')
+        names = self._name_bytes()
+        i = bisect.bisect_left(names, key)
+        return i if i < len(names) and names[i] == key else -1
+
+    def __contains__(self, name):
+        return self.find(name) >= 0
+
+    def info(self, name):
+        """(data offset, length, crc32) for name; KeyError if absent"""
+        i = self.find(name)
+        if i < 0:
+            raise KeyError(name)
+        _, _, offset, length, crc = self._entry(i)
+        return offset, length, crc
+
+    def get(self, name):
+        """Zero-copy memoryview of name's bytes"""
+        offset, length, _ = self.info(name)
+        return self._view[offset:offset + length]
+
+    def read(self, name):
+        return bytes(self.get(name))
+
+    def verify(self):
+        """Names whose payload does not match the stored crc32 or lies outside the file"""
+        bad = []
+        size = len(self._map)
+        for i, name in enumerate(self.names()):
+            _, _, offset, length, crc = self._entry(i)
+            if offset % ALIGN or offset + length > size:
+                bad.append(name)
+                continue
+            with self._view[offset:offset + length] as data:
+                if zlib.crc32(data) != crc:
+                    bad.append(name)
+        return bad
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Aligned Asset Bundle")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--tree", action="append", help=f"Asset tree to pack (repeatable; default: {' '.join(DEFAULT_TREES)})")
+    parser.add_argument("--out", default=None, help=f"Bundle path (default: {BUNDLE_PATH})")
+    parser.add_argument("--list", metavar="PATH", help="List the entries of a bundle")
+    parser.add_argument("--verify", metavar="PATH", help="Check every entry's crc32; exit 1 on mismatch")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        with AssetBundle(args.list) as bundle:
+            for name in bundle.names():
+                offset, length, crc = bundle.info(name)
+                print(f"{offset:>10} {length:>10} {crc:08x} {name}")
+        return 0
+
+    if args.verify:
+        with AssetBundle(args.verify) as bundle:
+            bad = bundle.verify()
+            for name in bad:
+                print(f"✗ {name}: crc mismatch")
+            print(f"{'✗' if bad else '✓'} {len(bundle)} entries, {len(bad)} bad")
+        return 1 if bad else 0
+
+    root = Path(args.root)
+    out = Path(args.out) if args.out else root / BUNDLE_PATH
+    files = collect_trees(root, args.tree or DEFAULT_TREES)
+    count = write_bundle(out, files)
+    print(f"✓ Wrote {out} ({count} entries, {out.stat().st_size:,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+ColorTrap - Asset Content-Hash Cache
+sha256 of asset files keyed by project-relative path, with a size + mtime
+fast path so unchanged files are never re-read, plus a content-addressed
+blob store for derived outputs (encoded WebP, resized icons, ...)
+"""
+
+import os
+import json
+
+from tools.manifest import hash_file
+from tools.profiling import count, STAT
+
+CACHE_DIR = ".colortrap"
+HASHES_FILE = "asset_hashes.json"
+BLOBS_DIR = "blobs"
+CACHE_VERSION = 1
+
+
+class HashCache:
+    """Maps relative path -> [size, mtime_ns, sha256]"""
+
+    def __init__(self, project_root):
+        self.project_root = os.fspath(project_root)
+        self.path = os.path.join(self.project_root, CACHE_DIR, HASHES_FILE)
+        self.files = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.files = data.get("files", {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CACHE_VERSION, "files": self.files}, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def digest(self, rel_path, st=None):
+        """sha256 of rel_path; st may be passed in from a DirEntry to save a stat"""
+        full_path = os.path.join(self.project_root, rel_path)
+        if st is None:
+            count(STAT)
+            st = os.stat(full_path)
+        cached = self.files.get(rel_path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            self.hits += 1
+            return cached[2]
+
+        sha256 = hash_file(full_path)
+        self.files[rel_path] = [st.st_size, st.st_mtime_ns, sha256]
+        self.misses += 1
+        self.dirty = True
+        return sha256
+
+    def prune(self, keep, prefixes=None):
+        """
+        Drop records for paths not in keep (deleted or renamed assets)
+        prefixes: only consider records under these directories
+        """
+        scope = tuple(p.rstrip("/") + "/" for p in prefixes) if prefixes else ("",)
+        stale = [rel for rel in self.files if rel.startswith(scope) and rel not in keep]
+        for rel in stale:
+            del self.files[rel]
+        if stale:
+            self.dirty = True
+        return len(stale)
+
+
+def blob_path(project_root, kind, key, ext=""):
+    """Where a derived output for key lives: .colortrap/blobs/<kind>/<key><ext>"""
+    return os.path.join(os.fspath(project_root), CACHE_DIR, BLOBS_DIR, kind, f"{key}{ext}")
+
+
+def publish_blob(tmp_path, final_path):
+    """Move a finished temp file into the blob store (atomic, safe across workers)"""
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
@@ -0,0 +1,110 @@
+"""
+ColorTrap - Asset Helpers
+Paths, skin tree walking and header-only image size parsing shared by the
+asset tooling (index, atlas, recompression, analysis).
+"""
+
+import os
+import struct
+
+ASSETS_ROOT = "app/src/main/assets"
+RES_ROOT = "app/src/main/res"
+SKINS_DIR = "skins"
+IMAGE_EXTS = (".png", ".webp", ".jpg", ".jpeg")
+
+
+def is_image(name):
+    return name.lower().endswith(IMAGE_EXTS)
+
+
+def _sorted_dirs(path):
+    try:
+        with os.scandir(path) as it:
+            return sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    except FileNotFoundError:
+        return []
+
+
+def iter_skin_variants(project_root, skins=None):
+    """
+    Yield (skin, group, DirEntry) for every image under assets/skins,
+    ordered by skin, group and file name (the order the app sees)
+    skins: optional iterable of skin names to restrict the walk
+    """
+    base = os.path.join(os.fspath(project_root), ASSETS_ROOT, SKINS_DIR)
+    wanted = set(skins) if skins else None
+    for skin in _sorted_dirs(base):
+        if wanted is not None and skin.name not in wanted:
+            continue
+        for group in _sorted_dirs(skin.path):
+            with os.scandir(group.path) as it:
+                files = sorted((e for e in it if e.is_file() and is_image(e.name)), key=lambda e: e.name)
+            for entry in files:
+                yield skin.name, group.name, entry
+
+
+def iter_files(project_root, top):
+    """
+    Yield (project-relative path, DirEntry) for every file under top,
+    depth first in name order, without building the full list
+    """
+    root = os.fspath(project_root)
+    stack = [os.path.join(root, top)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except FileNotFoundError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                yield os.path.relpath(entry.path, root).replace(os.sep, "/"), entry
+        stack.extend(reversed(subdirs))
+
+
+def read_image_size(path):
+    """(width, height) from the PNG / WebP / JPEG header, or None"""
+    with open(path, 'rb') as f:
+        head = f.read(64)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                w, h = struct.unpack('<HH', head[26:30])
+                return w & 0x3FFF, h & 0x3FFF
+            if chunk == b'VP8L':
+                b = head[21:25]
+                w = 1 + (((b[1] & 0x3F) << 8) | b[0])
+                h = 1 + (((b[3] & 0x0F) << 10) | (b[2] << 2) | ((b[1] & 0xC0) >> 6))
+                return w, h
+            if chunk == b'VP8X':
+                w = 1 + int.from_bytes(head[24:27], 'little')
+                h = 1 + int.from_bytes(head[27:30], 'little')
+                return w, h
+            return None
+
+        if head[:2] == b'\xff\xd8':
+            return _jpeg_size(f)
+    return None
+
+
+def _jpeg_size(f):
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        # SOF0..SOF15 except DHT (C4), JPG (C8), DAC (CC)
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack('>xHH', f.read(5))
+            return w, h
+        f.seek(length - 2, 1)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Skin Atlas Packer
+Packs every variant of a skin into one or a few power-of-two sheets and
+writes a UV/rect manifest keyed by color group and variant, so the tile
+grid decodes one bitmap per skin instead of dozens.
+
+Usage:
+    python -m tools.atlas_packer [--root PATH] [--skin color ...] [--max-size 2048]
+    python -m tools.atlas_packer --verify     # diff atlas crops against sources
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from tools.assets import iter_skin_variants
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed by the asset tooling
+    Image = None
+
+# Outside assets/ while the app still decodes the loose tiles: packaging
+# both would ship every skin texture twice
+ATLAS_DIR = ".colortrap/atlas"
+DEFAULT_MAX_SIZE = 2048
+DEFAULT_PADDING = 2
+MANIFEST_VERSION = 1
+
+
+def _require_pillow():
+    if Image is None:
+        raise SystemExit("✗ Pillow is required: pip install -r tools/requirements.txt")
+
+
+def _next_pow2(n):
+    size = 1
+    while size < n:
+        size <<= 1
+    return size
+
+
+def pack_shelves(sizes, max_size, padding):
+    """
+    Shelf bin packing, tallest first
+    sizes: [(w, h)] -> ([(sheet, x, y)] in input order, [(sheet_w, sheet_h)])
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    sheets = []            # used (w, h) per sheet
+    sheet = -1
+    x = y = shelf_h = 0
+
+    for i in order:
+        w, h = sizes[i]
+        pw, ph = w + 2 * padding, h + 2 * padding
+        if pw > max_size or ph > max_size:
+            raise ValueError(f"Image {w}x{h} does not fit in a {max_size}px sheet")
+
+        if sheet < 0:
+            sheet, x, y, shelf_h = 0, 0, 0, 0
+            sheets.append([0, 0])
+        if x + pw > max_size:
+            # Next shelf
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + ph > max_size:
+            # Next sheet
+            sheet += 1
+            x = y = shelf_h = 0
+            sheets.append([0, 0])
+
+        placements[i] = (sheet, x + padding, y + padding)
+        x += pw
+        shelf_h = max(shelf_h, ph)
+        sheets[sheet][0] = max(sheets[sheet][0], x)
+        sheets[sheet][1] = max(sheets[sheet][1], y + shelf_h)
+
+    return placements, [(_next_pow2(w), _next_pow2(h)) for w, h in sheets]
+
+
+def _extrude(sheet_img, img, x, y, padding):
+    """Copy edge pixels into the padding so bilinear sampling does not bleed"""
+    w, h = img.size
+    sheet_img.paste(img, (x, y))
+    for p in range(1, padding + 1):
+        sheet_img.paste(img.crop((0, 0, w, 1)), (x, y - p))
+        sheet_img.paste(img.crop((0, h - 1, w, h)), (x, y + h - 1 + p))
+        sheet_img.paste(img.crop((0, 0, 1, h)), (x - p, y))
+        sheet_img.paste(img.crop((w - 1, 0, w, h)), (x + w - 1 + p, y))
+    for dx, dy, cx, cy in ((-1, -1, 0, 0), (1, -1, w - 1, 0), (-1, 1, 0, h - 1), (1, 1, w - 1, h - 1)):
+        corner = img.getpixel((cx, cy))
+        for py in range(1, padding + 1):
+            for px in range(1, padding + 1):
+                sheet_img.putpixel((x + cx + dx * px, y + cy + dy * py), corner)
+
+
+def pack_skin(root, skin, variants, out_dir, max_size, padding):
+    """Write <skin>_<n>.png sheets and <skin>.json; returns the manifest"""
+    images = [Image.open(entry.path).convert("RGBA") for _, _, entry in variants]
+    placements, sheet_sizes = pack_shelves([im.size for im in images], max_size, padding)
+
+    sheets = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in sheet_sizes]
+    regions = {}
+    for (skin_name, group, entry), img, (sheet, x, y) in zip(variants, images, placements):
+        _extrude(sheets[sheet], img, x, y, padding)
+        sw, sh = sheet_sizes[sheet]
+        w, h = img.size
+        regions.setdefault(group, []).append({
+            "variant": entry.name,
+            "sheet": sheet,
+            "x": x, "y": y, "w": w, "h": h,
+            "u0": round(x / sw, 6), "v0": round(y / sh, 6),
+            "u1": round((x + w) / sw, 6), "v1": round((y + h) / sh, 6),
+        })
+
+    os.makedirs(out_dir, exist_ok=True)
+    sheet_entries = []
+    for n, (sheet_img, (sw, sh)) in enumerate(zip(sheets, sheet_sizes)):
+        name = f"{skin}_{n}.png"
+        sheet_img.save(os.path.join(out_dir, name), optimize=True)
+        sheet_entries.append({"file": name, "width": sw, "height": sh})
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "skin": skin,
+        "padding": padding,
+        "sheets": sheet_entries,
+        "regions": regions,
+    }
+    with open(os.path.join(out_dir, f"{skin}.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(",", ":"), sort_keys=True)
+    return manifest
+
+
+def verify_skin(root, skin, variants, out_dir):
+    """Compare every atlas crop with its source image; returns mismatch messages"""
+    with open(os.path.join(out_dir, f"{skin}.json"), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    sheets = [Image.open(os.path.join(out_dir, s["file"])).convert("RGBA") for s in manifest["sheets"]]
+    by_key = {(g, r["variant"]): r for g, rs in manifest["regions"].items() for r in rs}
+
+    problems = []
+    for _, group, entry in variants:
+        region = by_key.pop((group, entry.name), None)
+        if region is None:
+            problems.append(f"{skin}/{group}/{entry.name}: missing from atlas")
+            continue
+        crop = sheets[region["sheet"]].crop((region["x"], region["y"],
+                                             region["x"] + region["w"], region["y"] + region["h"]))
+        source = Image.open(entry.path).convert("RGBA")
+        if crop.size != source.size or crop.tobytes() != source.tobytes():
+            problems.append(f"{skin}/{group}/{entry.name}: pixels differ")
+    for group, variant in by_key:
+        problems.append(f"{skin}/{group}/{variant}: in atlas but not in assets")
+    return problems
+
+
+def _group_by_skin(root, skins):
+    by_skin = {}
+    for skin, group, entry in iter_skin_variants(root, skins):
+        by_skin.setdefault(skin, []).append((skin, group, entry))
+    return by_skin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Skin Atlas Packer")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--skin", action="append", help="Only this skin (repeatable; default: all)")
+    parser.add_argument("--out", default=None, help=f"Output directory (default: {ATLAS_DIR})")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE, help="Max sheet edge, power of two")
+    parser.add_argument("--padding", type=int, default=DEFAULT_PADDING, help="Extruded border around each variant")
+    parser.add_argument("--verify", action="store_true", help="Diff atlas crops against the source images")
+    args = parser.parse_args(argv)
+    _require_pillow()
+
+    root = Path(args.root)
+    out_dir = Path(args.out) if args.out else root / ATLAS_DIR
+    by_skin = _group_by_skin(root, args.skin)
+
+    if args.verify:
+        problems = []
+        for skin, variants in by_skin.items():
+            try:
+                skin_problems = verify_skin(root, skin, variants, out_dir)
+            except FileNotFoundError:
+                skin_problems = [f"{skin}: atlas not built; run python -m tools.atlas_packer"]
+            problems += skin_problems
+            mark = "✓" if not skin_problems else "✗"
+            print(f"{mark} {skin}: {len(variants)} variants, {len(skin_problems)} mismatches")
+        for problem in problems:
+            print(f"  ✗ {problem}")
+        return 1 if problems else 0
+
+    for skin, variants in by_skin.items():
+        manifest = pack_skin(root, skin, variants, out_dir, args.max_size, args.padding)
+        sizes = ", ".join(f"{s['width']}x{s['height']}" for s in manifest["sheets"])
+        print(f"✓ {skin}: {len(variants)} variants -> {len(manifest['sheets'])} sheet(s) [{sizes}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
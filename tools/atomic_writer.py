@@ -0,0 +1,322 @@
+"""
+ColorTrap - Atomic Batch Writer
+Stages generated files next to the project and publishes the whole batch
+with os.replace, so an interrupted run never leaves half-written outputs.
+Before the swap, commit() writes a journal of every target, staged file
+and backup; if the process dies mid-publish (SIGKILL, power loss), the
+next BatchWriter on that root rolls the batch back from the journal.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+
+from tools.manifest import hash_file
+from tools.profiling import count, STAT, BYTES_WRITTEN, FILES_WRITTEN, DIRS_CREATED
+
+STAGING_PARENT = ".colortrap"
+STAGING_PREFIX = "staging-"
+JOURNAL_FILE = "journal.json"
+BACKUP_DIR = "backup"
+
+
+def _pid_alive(pid):
+    if pid is None or os.name != "posix":
+        # No safe liveness probe elsewhere; one writer per root is assumed
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_pid(name):
+    """PID encoded in a staging-<pid>-<random> directory name, or None"""
+    try:
+        return int(name[len(STAGING_PREFIX):].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _undo(root, staging_dir, ops):
+    """
+    Put every journaled target back as it was before the batch
+    A backup that still exists goes back over its target; a new file whose
+    staged copy is gone was published and is removed. Safe to repeat.
+    Returns (restored, failed) counts
+    """
+    restored = failed = 0
+    for op in reversed(ops):
+        target = os.path.join(root, op["target"])
+        try:
+            if op["backup"] is not None:
+                backup = os.path.join(staging_dir, BACKUP_DIR, op["backup"])
+                if os.path.lexists(backup):
+                    os.replace(backup, target)
+                    restored += 1
+            elif not os.path.lexists(os.path.join(staging_dir, op["staged"])) and os.path.lexists(target):
+                os.remove(target)
+                restored += 1
+        except OSError:
+            failed += 1
+    return restored, failed
+
+
+def recover(root):
+    """
+    Roll back batches whose writer died while publishing, and delete
+    staging dirs abandoned before their commit
+    Staging dirs of live processes are left alone
+    Returns [(staging dir name, files restored)] for every journaled batch
+    """
+    parent = os.path.join(os.fspath(root), STAGING_PARENT)
+    try:
+        names = sorted(os.listdir(parent))
+    except FileNotFoundError:
+        return []
+
+    recovered = []
+    for name in names:
+        staging_dir = os.path.join(parent, name)
+        if not name.startswith(STAGING_PREFIX) or not os.path.isdir(staging_dir):
+            continue
+        if _pid_alive(_owner_pid(name)):
+            continue
+        try:
+            with open(os.path.join(staging_dir, JOURNAL_FILE), 'r', encoding='utf-8') as f:
+                ops = json.load(f)["ops"]
+        except FileNotFoundError:
+            # Died before publishing anything
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            continue
+        restored, failed = _undo(os.fspath(root), staging_dir, ops)
+        if failed:
+            raise OSError(f"Could not roll back {failed} files of the interrupted batch in {staging_dir}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        recovered.append((name, restored))
+    return recovered
+
+
+class StagedFile:
+    """One file waiting to be published"""
+
+    def __init__(self, rel_path, staged_path, data, overwrite, sha256=None):
+        self.rel_path = rel_path
+        self.staged_path = staged_path
+        # None for streamed files; sha256 is set instead
+        self.data = data
+        self.overwrite = overwrite
+        self.sha256 = sha256
+
+
+class BatchWriter:
+    """
+    Collects outputs in a temp dir on the same filesystem as root,
+    then publishes them all at once
+
+    Usage:
+        with BatchWriter(project_root) as writer:
+            writer.write("app/src/main/assets/config/game_config.json", data)
+
+    Creating a writer first recovers interrupted batches (see recover());
+    .recovered lists them
+    """
+
+    def __init__(self, root):
+        self.root = os.fspath(root)
+        self.staging_dir = None
+        self.staged = {}
+        self.published = []
+        self._lock = threading.Lock()
+        self._counter = 0
+        self.recovered = recover(self.root)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def _ensure_staging(self):
+        if self.staging_dir is None:
+            parent = os.path.join(self.root, STAGING_PARENT)
+            os.makedirs(parent, exist_ok=True)
+            self.staging_dir = tempfile.mkdtemp(prefix=f"{STAGING_PREFIX}{os.getpid()}-", dir=parent)
+        return self.staging_dir
+
+    def write(self, rel_path, data, overwrite=True):
+        """
+        Stage bytes (or str, encoded as UTF-8) for rel_path
+        overwrite=False publishes only if the target still does not exist
+        Safe to call from several threads
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        rel_path = rel_path.replace(os.sep, "/")
+
+        staged_path = self._next_staged_path()
+
+        # No fsync here; commit() flushes the staged files together before publishing
+        with open(staged_path, 'wb') as f:
+            f.write(data)
+        count(FILES_WRITTEN)
+        count(BYTES_WRITTEN, len(data))
+        self._stage(StagedFile(rel_path, staged_path, data, overwrite))
+
+    def write_stream(self, rel_path, fill, overwrite=True):
+        """
+        Stage a file produced by fill(f) on a seekable binary file, without
+        holding it in memory; returns its sha256 hex digest
+        """
+        rel_path = rel_path.replace(os.sep, "/")
+        staged_path = self._next_staged_path()
+        with open(staged_path, 'wb') as f:
+            fill(f)
+        sha256 = hash_file(staged_path)
+        count(FILES_WRITTEN)
+        count(BYTES_WRITTEN, os.path.getsize(staged_path))
+        self._stage(StagedFile(rel_path, staged_path, None, overwrite, sha256))
+        return sha256
+
+    def unstage(self, rel_path):
+        """Drop a staged file so commit() leaves the target alone"""
+        with self._lock:
+            entry = self.staged.pop(rel_path.replace(os.sep, "/"), None)
+        if entry is not None:
+            os.remove(entry.staged_path)
+
+    def _next_staged_path(self):
+        with self._lock:
+            staging = self._ensure_staging()
+            self._counter += 1
+            return os.path.join(staging, f"{self._counter:06d}")
+
+    def _stage(self, entry):
+        with self._lock:
+            previous = self.staged.get(entry.rel_path)
+            self.staged[entry.rel_path] = entry
+        if previous is not None:
+            os.remove(previous.staged_path)
+
+    def _sync_staged(self):
+        # Only this batch's files, not a system-wide os.sync()
+        for entry in self.staged.values():
+            fd = os.open(entry.staged_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _sync_dirs(self, dirs):
+        if os.name != "posix":
+            return
+        for d in dirs:
+            fd = os.open(d, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _write_journal(self, ops):
+        path = os.path.join(self.staging_dir, JOURNAL_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"pid": os.getpid(), "ops": ops}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._sync_dirs([self.staging_dir])
+
+    def commit(self):
+        """
+        Publish every staged file; on failure already-published files are
+        rolled back to their previous contents
+        Returns the list of published StagedFile entries
+        """
+        if not self.staged:
+            self.discard()
+            return []
+
+        self._sync_staged()
+        os.makedirs(os.path.join(self.staging_dir, BACKUP_DIR), exist_ok=True)
+
+        # Decide every move up front and journal it before touching the tree
+        ops = []
+        entries = []
+        for i, entry in enumerate(sorted(self.staged.values(), key=lambda e: e.rel_path)):
+            count(STAT)
+            exists = os.path.lexists(os.path.join(self.root, entry.rel_path))
+            if exists and not entry.overwrite:
+                continue
+            ops.append({
+                "target": entry.rel_path,
+                "staged": os.path.basename(entry.staged_path),
+                "backup": f"{i:06d}" if exists else None,
+            })
+            entries.append(entry)
+        if not ops:
+            self.staged = {}
+            self.discard()
+            return []
+        self._write_journal(ops)
+
+        touched_dirs = set()
+        known_dirs = set()
+        try:
+            for op, entry in zip(ops, entries):
+                target = os.path.join(self.root, entry.rel_path)
+                target_dir = os.path.dirname(target)
+                if target_dir not in known_dirs:
+                    count(STAT)
+                    if not os.path.isdir(target_dir):
+                        os.makedirs(target_dir, exist_ok=True)
+                        count(DIRS_CREATED)
+                    known_dirs.add(target_dir)
+
+                if op["backup"] is not None:
+                    os.replace(target, os.path.join(self.staging_dir, BACKUP_DIR, op["backup"]))
+                os.replace(entry.staged_path, target)
+                touched_dirs.add(target_dir)
+        except BaseException:
+            self._abort(ops)
+            raise
+
+        self._sync_dirs(touched_dirs)
+        # Dropping the journal marks the batch as published; only then go the backups
+        os.remove(os.path.join(self.staging_dir, JOURNAL_FILE))
+        self._sync_dirs([self.staging_dir])
+        self.published.extend(entries)
+        self.staged = {}
+        self.discard()
+        return entries
+
+    def _abort(self, ops):
+        """Roll back in-process; the journal stays if that fails, so the next run retries"""
+        _, failed = _undo(self.root, self.staging_dir, ops)
+        if failed:
+            self.staging_dir = None
+            self.staged = {}
+        else:
+            self.discard()
+
+    def discard(self):
+        """Drop everything that has not been published"""
+        if self.staging_dir is not None:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            self.staging_dir = None
+        self.staged = {}
+        parent = os.path.join(self.root, STAGING_PARENT)
+        try:
+            os.rmdir(parent)
+        except OSError:
+            # Not empty (manifest lives here) or already gone
+            pass
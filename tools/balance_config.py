@@ -0,0 +1,222 @@
+"""
+ColorTrap - balance_config.json helpers
+Loading, level-range parsing, a bisect-based interval index and a
+validator shared by the balance tooling
+
+Usage:
+    python -m tools.balance_config [--root PATH] [--strict]     # validate every mode
+    python -m tools.balance_config --query NORMAL 42            # params for one level
+"""
+
+import sys
+import json
+import bisect
+import argparse
+from pathlib import Path
+
+BALANCE_CONFIG_PATH = "app/src/main/assets/config/balance_config.json"
+GAME_CONFIG_PATH = "app/src/main/assets/config/game_config.json"
+
+LEVEL_FIELDS = ("gridSize", "forbiddenCount", "timeLimit")
+# GameMode.kt entries; every one needs a level table
+MODES = ("NORMAL", "HARD", "SUPER_HARD", "RELAX")
+
+# Validation severities
+ERROR = "error"
+WARNING = "warning"
+
+
+def load_balance_config(project_root="."):
+    with open(Path(project_root) / BALANCE_CONFIG_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_game_config(project_root="."):
+    with open(Path(project_root) / GAME_CONFIG_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_range(text):
+    """
+    "1-5" -> (1, 5), "81+" -> (81, None), "7" -> (7, 7)
+    Raises ValueError on anything else
+    """
+    text = text.strip()
+    if text.endswith("+"):
+        return int(text[:-1]), None
+    if "-" in text:
+        lo, hi = text.split("-", 1)
+        lo, hi = int(lo), int(hi)
+        if hi < lo:
+            raise ValueError(f"Range {text!r} ends before it starts")
+        return lo, hi
+    level = int(text)
+    return level, level
+
+
+class LevelIndex:
+    """
+    One mode's level ranges as sorted start bounds; params_for() is a bisect
+    Lookups follow LevelTables.kt: a level in a gap uses the range before
+    it, and levels before the first range use the first range
+    """
+
+    def __init__(self, levels):
+        ranges = []
+        for position, entry in enumerate(levels):
+            lo, hi = parse_range(entry["range"])
+            ranges.append((lo, position, hi, {field: entry[field] for field in LEVEL_FIELDS}))
+        if not ranges:
+            raise ValueError("Mode has no level ranges")
+        # Equal starts keep list order, so the later entry wins, as in the JSON
+        ranges.sort(key=lambda r: (r[0], r[1]))
+        self.starts = [r[0] for r in ranges]
+        self.ends = [r[2] for r in ranges]
+        self.params = [r[3] for r in ranges]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def position(self, level):
+        """Index of the range that serves level"""
+        return max(bisect.bisect_right(self.starts, level) - 1, 0)
+
+    def params_for(self, level):
+        """{gridSize, forbiddenCount, timeLimit} for level, O(log n)"""
+        return self.params[self.position(level)]
+
+    def covers(self, level):
+        """True when level lies inside a range rather than a gap"""
+        i = bisect.bisect_right(self.starts, level) - 1
+        return i >= 0 and (self.ends[i] is None or level <= self.ends[i])
+
+
+class BalanceIndex:
+    """LevelIndex per mode, built once from a parsed balance_config.json"""
+
+    def __init__(self, balance_config):
+        self.modes = {mode: LevelIndex(config["levels"])
+                      for mode, config in balance_config["modes"].items()}
+
+    def params_for(self, mode, level):
+        """KeyError for an unknown mode"""
+        return self.modes[mode].params_for(level)
+
+
+def expand_mode(levels, max_level):
+    """
+    Expand one mode's range list into dense per-level lists
+    Returns {field: [value for level 1..max_level]}; open-ended ("81+")
+    ranges fill to max_level, uncovered levels reuse the previous value
+    """
+    index = LevelIndex(levels)
+    rows = [index.params_for(level) for level in range(1, max_level + 1)]
+    return {field: [row[field] for row in rows] for field in LEVEL_FIELDS}
+
+
+def validate(balance_config, modes=MODES):
+    """
+    Check every mode in one pass over its sorted ranges
+    Returns [(severity, mode, message)]. Errors: missing modes, unparsable
+    or missing fields, non-positive values, not starting at level 1, gaps,
+    overlaps, no open-ended last range, gridSize shrinking or timeLimit
+    growing with level. Warning: forbiddenCount dropping with level
+    """
+    issues = []
+    configured = balance_config.get("modes", {})
+    for mode in modes:
+        if mode not in configured:
+            issues.append((ERROR, mode, "mode is missing"))
+
+    for mode, config in configured.items():
+        levels = config.get("levels", [])
+        if not levels:
+            issues.append((ERROR, mode, "no level ranges"))
+            continue
+
+        parsed = []
+        for entry in levels:
+            label = entry.get("range", "?")
+            try:
+                lo, hi = parse_range(str(label))
+            except ValueError as e:
+                issues.append((ERROR, mode, f"range {label!r}: {e}"))
+                continue
+            missing = [f for f in LEVEL_FIELDS if not isinstance(entry.get(f), (int, float))]
+            if missing:
+                issues.append((ERROR, mode, f"range {label!r}: missing or non-numeric {', '.join(missing)}"))
+                continue
+            if lo < 1:
+                issues.append((ERROR, mode, f"range {label!r}: levels start at 1"))
+            if entry["gridSize"] < 1 or entry["timeLimit"] <= 0 or entry["forbiddenCount"] < 0:
+                issues.append((ERROR, mode, f"range {label!r}: gridSize/timeLimit must be positive, forbiddenCount >= 0"))
+            parsed.append((lo, hi, label, entry))
+        if not parsed:
+            continue
+
+        parsed.sort(key=lambda p: p[0])
+        if parsed[0][0] != 1:
+            issues.append((ERROR, mode, f"first range {parsed[0][2]!r} does not start at level 1"))
+
+        previous = None
+        for lo, hi, label, entry in parsed:
+            if previous is not None:
+                p_lo, p_hi, p_label, p_entry = previous
+                if p_hi is None or lo <= p_hi:
+                    issues.append((ERROR, mode, f"{label!r} overlaps {p_label!r}"))
+                elif lo > p_hi + 1:
+                    issues.append((ERROR, mode, f"gap: levels {p_hi + 1}-{lo - 1} between {p_label!r} and {label!r}"))
+                if entry["gridSize"] < p_entry["gridSize"]:
+                    issues.append((ERROR, mode, f"gridSize shrinks from {p_entry['gridSize']} to {entry['gridSize']} at {label!r}"))
+                if entry["timeLimit"] > p_entry["timeLimit"]:
+                    issues.append((ERROR, mode, f"timeLimit grows from {p_entry['timeLimit']} to {entry['timeLimit']} at {label!r}"))
+                if entry["forbiddenCount"] < p_entry["forbiddenCount"]:
+                    issues.append((WARNING, mode, f"forbiddenCount drops from {p_entry['forbiddenCount']} to {entry['forbiddenCount']} at {label!r}"))
+            previous = (lo, hi, label, entry)
+
+        if parsed[-1][1] is not None:
+            issues.append((ERROR, mode, f"last range {parsed[-1][2]!r} is not open-ended (use \"N+\")"))
+    return issues
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - balance_config.json validator")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--config", default=None, help=f"Config file (default: {BALANCE_CONFIG_PATH})")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+    parser.add_argument("--query", nargs=2, metavar=("MODE", "LEVEL"), help="Print the parameters for one level")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    else:
+        config = load_balance_config(args.root)
+
+    if args.query:
+        mode, level = args.query
+        if mode not in MODES:
+            parser.error(f"--query: unknown mode {mode!r} (choose from {', '.join(MODES)})")
+        try:
+            level = int(level)
+        except ValueError:
+            parser.error(f"--query: level must be an integer, got {level!r}")
+        if mode not in config.get("modes", {}):
+            parser.error(f"--query: {mode} has no level table in this config")
+        print(json.dumps(BalanceIndex(config).params_for(mode, level)))
+        return 0
+
+    issues = validate(config)
+    for severity, mode, message in issues:
+        print(f"{'✗' if severity == ERROR else '⚠'} {mode}: {message}")
+    errors = sum(1 for severity, _, _ in issues if severity == ERROR)
+    warnings = len(issues) - errors
+    failed = errors or (args.strict and warnings)
+    modes = len(config.get("modes", {}))
+    strict = " (--strict: warnings fail)" if args.strict and warnings else ""
+    print(f"{'✗' if failed else '✓'} {modes} modes checked, {errors} errors, {warnings} warnings{strict}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Balance Auto-Tuner
+Searches each mode's per-range timeLimit and forbiddenCount so that the
+simulated player mix (tools/player_archetypes.json) matches the reach
+targets in tools/balance_targets.json, e.g. "50% of NORMAL runs reach
+level 40". gridSize and the ranges themselves are left alone.
+
+Modes are tuned independently with a (1 + λ) search: each generation
+mutates the incumbent, mostly in the direction of the worst-missed
+target, and keeps the best candidate. Candidates are evaluated in
+parallel with common random numbers, i.e. the same seeded streams, so
+they differ only by their parameters. Evaluations are raced. A cheap
+screening run rejects a candidate that is clearly worse than the
+incumbent before the full run. Results are memoized in
+.colortrap/tuner_cache.json. A mode stops after --patience generations
+without improvement.
+
+The proposal goes to .colortrap/tuner/balance_config.json together with a
+Markdown diff report. --apply writes it over the asset config (it must
+pass the validator) and regenerates LevelTables.kt.
+
+Usage:
+    python -m tools.balance_tuner [--root PATH] [--mode NORMAL ...] [--runs 40000] [--jobs N]
+                                  [--generations 40] [--patience 6] [--seed 0] [--apply]
+"""
+
+import os
+import sys
+import copy
+import json
+import math
+import difflib
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tools.balance_config import (
+    BALANCE_CONFIG_PATH, ERROR, MODES, load_balance_config, parse_range, validate,
+)
+from tools.survival_sim import (
+    SURVIVAL_VERSION, load_archetypes, mode_tables, shard_rng, simulate, survival_curve,
+)
+
+TARGETS_PATH = "tools/balance_targets.json"
+CACHE_PATH = ".colortrap/tuner_cache.json"
+OUTPUT_DIR = ".colortrap/tuner"
+# Part of the memo key with SURVIVAL_VERSION: bump when the evaluation changes
+TUNER_VERSION = 1
+
+DEFAULT_RUNS = 40_000
+# Screening runs are this fraction of the full evaluation
+SCREEN_FRACTION = 8
+# Reject at screening when worse than the incumbent by this many standard errors
+SCREEN_SIGMAS = 3.0
+TIME_MOVES = (0.1, 0.2, 0.3, 0.5)
+# Share of mutations that ignore the worst target and pick any tunable range
+EXPLORE = 0.25
+
+
+def load_targets(project_root="."):
+    with open(Path(project_root) / TARGETS_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def render_config(balance_config):
+    """Same layout as the checked-in balance_config.json, so diffs stay minimal"""
+    return json.dumps(balance_config, indent=2, ensure_ascii=False)
+
+
+# ==================== EVALUATION ====================
+
+def reach(levels, archetypes, target_levels, runs, seed, mode, lives=1):
+    """
+    Share of the archetype mix that reaches each target level
+    (reach level L = cleared at least L - 1 levels)
+    """
+    max_level = max(target_levels)
+    tables = mode_tables({"modes": {mode: {"levels": levels, "lives": lives}}}, mode, max_level)
+    total = None
+    for archetype_index, archetype in enumerate(archetypes.values()):
+        count = max(int(round(runs * archetype["share"])), 1)
+        histogram, _ = simulate(tables, archetype, count, shard_rng(seed, mode, archetype_index, 0))
+        total = histogram if total is None else total + histogram
+    curve = survival_curve(total)
+    return [float(curve[level - 1]) for level in target_levels]
+
+
+def _evaluate(task):
+    """Worker: (levels, archetypes, target levels, runs, seed, mode, lives) -> reach list"""
+    return reach(*task)
+
+
+def loss(reached, targets):
+    """Root mean squared reach error against the targets"""
+    return math.sqrt(sum((r - t["reach"]) ** 2 for r, t in zip(reached, targets)) / len(targets))
+
+
+class Memo:
+    """Evaluation results keyed by a hash of everything that feeds them, kept on disk"""
+
+    def __init__(self, project_root, archetypes, seed):
+        self.path = Path(project_root) / CACHE_PATH
+        self.salt = json.dumps({"version": TUNER_VERSION, "survivalVersion": SURVIVAL_VERSION,
+                                "archetypes": archetypes, "seed": seed}, sort_keys=True)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, mode, levels, lives, target_levels, runs):
+        text = json.dumps([self.salt, mode, levels, lives, target_levels, runs], sort_keys=True)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+# ==================== SEARCH ====================
+
+class ModeTuner:
+    """Tunes one mode's ranges; candidates are lists of (timeLimit, forbiddenCount)"""
+
+    def __init__(self, mode, levels, targets, bounds, rng, lives=1):
+        self.mode = mode
+        self.levels = levels
+        self.lives = lives
+        self.targets = sorted(targets, key=lambda t: t["level"])
+        self.target_levels = [t["level"] for t in self.targets]
+        self.time_bounds = bounds["timeLimit"]
+        self.forbidden_bounds = bounds["forbiddenCount"]
+        self.rng = rng
+        self.starts = [parse_range(entry["range"])[0] for entry in levels]
+        # Ranges past the last target cannot move the loss; they only follow the projection
+        self.tunable = [i for i, start in enumerate(self.starts) if start < max(self.target_levels)]
+        self.original = [(entry["timeLimit"], entry["forbiddenCount"]) for entry in levels]
+
+    def to_levels(self, params):
+        out = []
+        for entry, (time_limit, forbidden) in zip(self.levels, params):
+            entry = dict(entry)
+            entry["timeLimit"] = time_limit
+            entry["forbiddenCount"] = forbidden
+            out.append(entry)
+        return out
+
+    def project(self, params):
+        """
+        Clip to bounds and keep the validator happy: timeLimit never grows
+        with level, and forbiddenCount only drops where the original drops
+        """
+        out = []
+        for i, (time_limit, forbidden) in enumerate(params):
+            time_limit = round(min(max(time_limit, self.time_bounds[0]), self.time_bounds[1]), 1)
+            forbidden = int(min(max(forbidden, self.forbidden_bounds[0]), self.forbidden_bounds[1]))
+            if out:
+                time_limit = min(time_limit, out[-1][0])
+                if self.original[i][1] >= self.original[i - 1][1]:
+                    forbidden = max(forbidden, out[-1][1])
+            out.append((time_limit, forbidden))
+        return out
+
+    def mutate(self, params, reached):
+        """Nudge one range, usually before the worst-missed target and in its direction"""
+        errors = [r - t["reach"] for r, t in zip(reached, self.targets)]
+        worst = max(range(len(errors)), key=lambda i: abs(errors[i]))
+        before = [i for i in self.tunable if self.starts[i] < self.target_levels[worst]]
+        if self.rng.random() < EXPLORE or not before:
+            index = int(self.rng.choice(self.tunable))
+            harder = self.rng.random() < 0.5
+        else:
+            index = int(self.rng.choice(before))
+            # Too many players get through: make it harder
+            harder = errors[worst] > 0
+
+        params = list(params)
+        time_limit, forbidden = params[index]
+        if self.rng.random() < 0.7:
+            move = float(self.rng.choice(TIME_MOVES))
+            time_limit = time_limit - move if harder else time_limit + move
+        else:
+            forbidden = forbidden + 1 if harder else forbidden - 1
+        params[index] = (time_limit, forbidden)
+        return self.project(params)
+
+
+def tune_mode(tuner, pool, memo, archetypes, runs, seed, population, generations, patience, log=print):
+    """
+    Returns (best params, best reach, history) where history has one row per
+    generation: {generation, loss, evaluated, screened_out, memo_hits}
+    """
+    screen_runs = max(runs // SCREEN_FRACTION, 1000)
+    # Worst-case standard error of a reach estimate at screening size
+    screen_margin = SCREEN_SIGMAS * 0.5 / math.sqrt(screen_runs)
+
+    def evaluate(candidates, n):
+        """Reach per candidate, from the memo or the pool"""
+        keys = [memo.key(tuner.mode, tuner.to_levels(c), tuner.lives, tuner.target_levels, n) for c in candidates]
+        results = [memo.get(k) for k in keys]
+        todo = [i for i, r in enumerate(results) if r is None]
+        tasks = [(tuner.to_levels(candidates[i]), archetypes, tuner.target_levels, n, seed, tuner.mode, tuner.lives)
+                 for i in todo]
+        for i, reached in zip(todo, pool.map(_evaluate, tasks)):
+            memo.entries[keys[i]] = reached
+            results[i] = reached
+        return results, len(todo)
+
+    best = tuner.project(tuner.original)
+    (best_reach,), _ = evaluate([best], runs)
+    best_loss = loss(best_reach, tuner.targets)
+    history = [{"generation": 0, "loss": best_loss, "evaluated": 1, "screened_out": 0}]
+    stale = 0
+
+    for generation in range(1, generations + 1):
+        candidates = []
+        seen = {tuple(best)}
+        for _ in range(population * 4):
+            candidate = tuner.mutate(best, best_reach)
+            if tuple(candidate) not in seen:
+                seen.add(tuple(candidate))
+                candidates.append(candidate)
+            if len(candidates) == population:
+                break
+        if not candidates:
+            break
+
+        # Race: cheap screening first, full runs only for plausible candidates
+        screened, screen_new = evaluate(candidates, screen_runs)
+        survivors = [c for c, r in zip(candidates, screened)
+                     if loss(r, tuner.targets) <= best_loss + screen_margin]
+        full, full_new = evaluate(survivors, runs) if survivors else ([], 0)
+
+        improved = False
+        for candidate, reached in zip(survivors, full):
+            candidate_loss = loss(reached, tuner.targets)
+            if candidate_loss < best_loss - 1e-9:
+                best, best_reach, best_loss, improved = candidate, reached, candidate_loss, True
+        history.append({"generation": generation, "loss": best_loss,
+                        "evaluated": screen_new + full_new,
+                        "screened_out": len(candidates) - len(survivors)})
+        log(f"  {tuner.mode} gen {generation:>2}: loss {best_loss:.4f} "
+            f"({len(candidates)} candidates, {len(candidates) - len(survivors)} screened out)")
+
+        stale = 0 if improved else stale + 1
+        if stale >= patience:
+            break
+    return best, best_reach, history
+
+
+# ==================== REPORT ====================
+
+def diff_report(before_config, after_config, results):
+    """Markdown: per-mode reach vs target, changed ranges and the JSON diff"""
+    lines = ["# Balance tuner proposal", ""]
+    for mode, result in results.items():
+        lines += [f"## {mode}", "",
+                  f"Loss (RMS reach error): {result['loss_before']:.4f} → {result['loss_after']:.4f}", "",
+                  "| reach level | target | before | after |", "|---:|---:|---:|---:|"]
+        for target, old, new in zip(result["targets"], result["reach_before"], result["reach_after"]):
+            lines.append(f"| {target['level']} | {target['reach']:.0%} | {old:.1%} | {new:.1%} |")
+        lines.append("")
+        old_levels = before_config["modes"][mode]["levels"]
+        new_levels = after_config["modes"][mode]["levels"]
+        changed = [(o, n) for o, n in zip(old_levels, new_levels)
+                   if (o["timeLimit"], o["forbiddenCount"]) != (n["timeLimit"], n["forbiddenCount"])]
+        if changed:
+            lines += ["| range | timeLimit | forbiddenCount |", "|---|---|---|"]
+            for old, new in changed:
+                lines.append(f"| {old['range']} | {old['timeLimit']} → {new['timeLimit']} | "
+                             f"{old['forbiddenCount']} → {new['forbiddenCount']} |")
+        else:
+            lines.append("No range changed.")
+        lines.append("")
+
+    diff = difflib.unified_diff(render_config(before_config).splitlines(), render_config(after_config).splitlines(),
+                                fromfile=f"a/{BALANCE_CONFIG_PATH}", tofile=f"b/{BALANCE_CONFIG_PATH}", lineterm="")
+    lines += ["## Diff", "", "```diff", *diff, "```", ""]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Balance Auto-Tuner")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Mode to tune (repeatable, default: every mode with targets)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"Simulated runs per full evaluation (default: {DEFAULT_RUNS})")
+    parser.add_argument("--population", type=int, default=None, help="Candidates per generation (default: 2 x jobs, at least 8)")
+    parser.add_argument("--generations", type=int, default=40, help="Generation limit per mode (default: 40)")
+    parser.add_argument("--patience", type=int, default=6, help="Stop a mode after this many generations without improvement (default: 6)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for simulations and mutations (default: 0)")
+    parser.add_argument("--apply", action="store_true", help="Write the proposal over balance_config.json and regenerate LevelTables.kt")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    balance_config = load_balance_config(root)
+    archetypes = load_archetypes(root)
+    goals = load_targets(root)
+    modes = args.mode or [mode for mode in MODES if mode in goals["targets"] and mode in balance_config["modes"]]
+    population = args.population or max(2 * (args.jobs or os.cpu_count() or 1), 8)
+
+    memo = Memo(root, archetypes, args.seed)
+    proposal = copy.deepcopy(balance_config)
+    results = {}
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for mode in modes:
+            rng = np.random.default_rng(np.random.SeedSequence(args.seed, spawn_key=(MODES.index(mode),)))
+            config = balance_config["modes"][mode]
+            tuner = ModeTuner(mode, config["levels"], goals["targets"][mode], goals["bounds"], rng, config.get("lives", 1))
+            print(f"⚙ Tuning {mode} ({len(tuner.tunable)} of {len(tuner.levels)} ranges, {len(tuner.targets)} targets)")
+            best, best_reach, history = tune_mode(tuner, pool, memo, archetypes, args.runs, args.seed,
+                                                  population, args.generations, args.patience)
+            proposal["modes"][mode]["levels"] = tuner.to_levels(best)
+            before_reach = reach(config["levels"], archetypes, tuner.target_levels,
+                                 args.runs, args.seed, mode, tuner.lives)
+            results[mode] = {
+                "targets": tuner.targets,
+                "reach_before": before_reach,
+                "reach_after": best_reach,
+                "loss_before": loss(before_reach, tuner.targets),
+                "loss_after": history[-1]["loss"],
+                "history": history,
+            }
+    memo.save()
+
+    errors = [issue for issue in validate(proposal) if issue[0] == ERROR]
+    out_dir = root / OUTPUT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "balance_config.json").write_text(render_config(proposal), encoding='utf-8')
+    report = diff_report(balance_config, proposal, results)
+    (out_dir / "report.md").write_text(report, encoding='utf-8')
+
+    print(f"\n✓ Proposal: {OUTPUT_DIR}/balance_config.json, report: {OUTPUT_DIR}/report.md "
+          f"(memo: {memo.hits} hits, {memo.misses} misses)")
+    for mode, result in results.items():
+        print(f"  {mode}: loss {result['loss_before']:.4f} → {result['loss_after']:.4f}")
+    for _, mode, message in errors:
+        print(f"✗ {mode}: {message}")
+
+    if args.apply:
+        if errors:
+            print("✗ Not applied: the proposal fails validation")
+            return 1
+        (root / BALANCE_CONFIG_PATH).write_text(render_config(proposal), encoding='utf-8')
+        print(f"✓ Applied to {BALANCE_CONFIG_PATH}")
+        from tools import level_tables
+        level_tables.main(["--root", str(root)])
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
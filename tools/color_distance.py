@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Perceptual Color Distance Table
+Computes the mean and dominant CIELAB color of every skin variant with
+NumPy, builds the full CIEDE2000 (ΔE00) distance matrix in row blocks and
+writes assets/config/color_distance.json for the difficulty selector:
+per skin, the variant and group distance matrices plus ΔE thresholds for
+the minGroupDistance tiers in game_config.json (maximum/medium/low/minimal).
+Per-variant colors are cached by content hash, so reruns only decode new
+or edited images.
+
+Usage:
+    python -m tools.color_distance [--root PATH] [--check] [--sample 64]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from tools.assets import ASSETS_ROOT, SKINS_DIR, iter_skin_variants
+from tools.asset_cache import HashCache
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed by the asset tooling
+    Image = None
+
+OUTPUT_PATH = f"{ASSETS_ROOT}/config/color_distance.json"
+STATS_CACHE_PATH = ".colortrap/color_stats.json"
+TABLE_VERSION = 1
+DEFAULT_SAMPLE = 64
+BLOCK_ROWS = 512
+# ΔE00 values are stored as integers in tenths
+SCALE = 10
+
+# minGroupDistance tier -> percentile of the skin's group distances it must reach
+TIER_PERCENTILES = {
+    "maximum": 75,
+    "medium": 50,
+    "low": 25,
+    "minimal": 0,
+}
+
+# sRGB (D65) -> XYZ, and the D65 white point
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+
+def srgb_to_lab(rgb):
+    """(..., 3) sRGB in 0..255 -> (..., 3) CIELAB (D65)"""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _RGB_TO_XYZ.T / _WHITE_D65
+    eps, kappa = 216 / 24389, 24389 / 27
+    f = np.where(xyz > eps, np.cbrt(xyz), (kappa * xyz + 16) / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def delta_e_2000(lab1, lab2, dtype=np.float64):
+    """CIEDE2000 between broadcastable (..., 3) Lab arrays"""
+    L1, a1, b1 = np.moveaxis(np.asarray(lab1, dtype=dtype), -1, 0)
+    L2, a2, b2 = np.moveaxis(np.asarray(lab2, dtype=dtype), -1, 0)
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    C_bar7 = ((C1 + C2) / 2) ** 7
+    G = 0.5 * (1 - np.sqrt(C_bar7 / (C_bar7 + 25.0 ** 7)))
+    a1p = (1 + G) * a1
+    a2p = (1 + G) * a2
+    C1p = np.hypot(a1p, b1)
+    C2p = np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    chroma_zero = (C1p * C2p) == 0
+    dh = h2p - h1p
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chroma_zero, 0.0, dh)
+    dHp = 2 * np.sqrt(C1p * C2p) * np.sin(np.radians(dh) / 2)
+
+    Lp_bar = (L1 + L2) / 2
+    Cp_bar = (C1p + C2p) / 2
+    h_sum = h1p + h2p
+    hp_bar = np.where(np.abs(h1p - h2p) > 180,
+                      np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2),
+                      h_sum / 2)
+    hp_bar = np.where(chroma_zero, h_sum, hp_bar)
+
+    T = (1 - 0.17 * np.cos(np.radians(hp_bar - 30))
+         + 0.24 * np.cos(np.radians(2 * hp_bar))
+         + 0.32 * np.cos(np.radians(3 * hp_bar + 6))
+         - 0.20 * np.cos(np.radians(4 * hp_bar - 63)))
+    d_theta = 30 * np.exp(-(((hp_bar - 275) / 25) ** 2))
+    Cp_bar7 = Cp_bar ** 7
+    R_C = 2 * np.sqrt(Cp_bar7 / (Cp_bar7 + 25.0 ** 7))
+    L50 = (Lp_bar - 50) ** 2
+    S_L = 1 + 0.015 * L50 / np.sqrt(20 + L50)
+    S_C = 1 + 0.045 * Cp_bar
+    S_H = 1 + 0.015 * Cp_bar * T
+    R_T = -np.sin(np.radians(2 * d_theta)) * R_C
+
+    tl, tc, th = dLp / S_L, dCp / S_C, dHp / S_H
+    return np.sqrt(tl * tl + tc * tc + th * th + R_T * tc * th)
+
+
+def distance_matrix(labs, block_rows=BLOCK_ROWS):
+    """
+    Full (N, N) float32 ΔE00 matrix, computed block_rows rows at a time to
+    bound memory; only the upper triangle is evaluated (ΔE00 is symmetric)
+    """
+    labs = np.asarray(labs, dtype=np.float32)
+    n = len(labs)
+    out = np.empty((n, n), dtype=np.float32)
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = delta_e_2000(labs[start:stop, None, :], labs[None, start:, :], dtype=np.float32)
+        out[start:stop, start:] = block
+        out[start:, start:stop] = block.T
+    return out
+
+
+def image_colors(path, sample=DEFAULT_SAMPLE, bins=16):
+    """
+    (mean Lab, dominant Lab) over visible pixels, weighted by alpha
+    Dominant = mean Lab of the most populated sRGB bin (bins per channel)
+    """
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        if sample and max(img.size) > sample:
+            img.thumbnail((sample, sample), Image.Resampling.BOX)
+        px = np.asarray(img, dtype=np.float64).reshape(-1, 4)
+
+    weight = px[:, 3] / 255.0
+    visible = weight > 0
+    if not visible.any():
+        zero = [0.0, 0.0, 0.0]
+        return zero, zero
+    rgb, weight = px[visible, :3], weight[visible]
+    lab = srgb_to_lab(rgb)
+    mean = (lab * weight[:, None]).sum(axis=0) / weight.sum()
+
+    q = np.minimum((rgb * bins / 256).astype(np.int64), bins - 1)
+    bin_ids = (q[:, 0] * bins + q[:, 1]) * bins + q[:, 2]
+    top = np.argmax(np.bincount(bin_ids, weights=weight, minlength=bins ** 3))
+    in_top = bin_ids == top
+    dominant = (lab[in_top] * weight[in_top, None]).sum(axis=0) / weight[in_top].sum()
+    return mean.tolist(), dominant.tolist()
+
+
+def _load_stats_cache(root):
+    try:
+        with open(root / STATS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_stats_cache(root, cache):
+    path = root / STATS_CACHE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def collect_colors(root, sample=DEFAULT_SAMPLE):
+    """
+    Returns ({skin: [(group, file, mean_lab, dominant_lab)]}, decoded count)
+    Colors are cached by content hash + sample size
+    """
+    hashes = HashCache(root)
+    old_cache = _load_stats_cache(root)
+    cache = {}
+    skins = {}
+    decoded = 0
+
+    for skin, group, entry in iter_skin_variants(root):
+        rel = f"{ASSETS_ROOT}/{SKINS_DIR}/{skin}/{group}/{entry.name}"
+        key = f"{hashes.digest(rel, entry.stat())}-s{sample}"
+        colors = cache.get(key) or old_cache.get(key)
+        if colors is None:
+            colors = image_colors(entry.path, sample)
+            decoded += 1
+        cache[key] = colors
+        skins.setdefault(skin, []).append((group, entry.name, colors[0], colors[1]))
+
+    hashes.save()
+    _save_stats_cache(root, cache)
+    return skins, decoded
+
+
+def _quantize(matrix):
+    return np.rint(matrix * SCALE).astype(np.int32).ravel().tolist()
+
+
+def build_table(skins):
+    """color_distance.json contents for {skin: [(group, file, mean_lab, dominant_lab)]}"""
+    table = {"version": TABLE_VERSION, "scale": SCALE, "metric": "CIEDE2000", "skins": {}}
+    for skin, variants in sorted(skins.items()):
+        groups = sorted({group for group, _, _, _ in variants})
+        group_index = {group: i for i, group in enumerate(groups)}
+        means = np.array([mean for _, _, mean, _ in variants])
+        dominants = np.array([dom for _, _, _, dom in variants])
+
+        # Group color = mean of its variants' dominant colors
+        members = np.array([group_index[group] for group, _, _, _ in variants])
+        group_labs = np.array([dominants[members == i].mean(axis=0) for i in range(len(groups))])
+        group_matrix = distance_matrix(group_labs)
+
+        off_diag = group_matrix[~np.eye(len(groups), dtype=bool)]
+        thresholds = {
+            tier: round(float(np.percentile(off_diag, pct)) if off_diag.size and pct else 0.0, 1)
+            for tier, pct in TIER_PERCENTILES.items()
+        }
+
+        table["skins"][skin] = {
+            "groups": groups,
+            "variants": [[group_index[group], name] for group, name, _, _ in variants],
+            "meanLab": np.round(means, 2).tolist(),
+            "dominantLab": np.round(dominants, 2).tolist(),
+            "groupDistance": _quantize(group_matrix),
+            "variantDistance": _quantize(distance_matrix(dominants)),
+            "minGroupDistance": thresholds,
+        }
+    return table
+
+
+def render_table(table):
+    return json.dumps(table, separators=(",", ":"), sort_keys=True) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Perceptual Color Distance Table")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--sample", type=int, default=DEFAULT_SAMPLE, help="Downscale images to this edge before analysis (0 = full size)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if color_distance.json is out of date instead of writing it")
+    args = parser.parse_args(argv)
+    if Image is None:
+        raise SystemExit("✗ Pillow is required: pip install -r tools/requirements.txt")
+
+    root = Path(args.root)
+    skins, decoded = collect_colors(root, args.sample)
+    content = render_table(build_table(skins))
+    output = root / OUTPUT_PATH
+    current = output.read_text(encoding='utf-8') if output.exists() else None
+
+    variants = sum(len(v) for v in skins.values())
+    summary = f"{len(skins)} skins, {variants} variants, {decoded} decoded"
+
+    if args.check:
+        if current != content:
+            print(f"✗ {OUTPUT_PATH} is out of date ({summary}); run python -m tools.color_distance")
+            return 1
+        print(f"✓ {OUTPUT_PATH} is up to date ({summary})")
+        return 0
+
+    if current == content:
+        print(f"→ Unchanged: {OUTPUT_PATH} ({summary})")
+        return 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.replace(tmp_path, output)
+    print(f"✓ Wrote {OUTPUT_PATH} ({summary})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Coin Economy Simulator
+Simulates a player population over weeks of play against the `items`
+block of balance_config.json and the faucets in DynamicGameViewModel. Each
+run pays max(level × perLevel, minimum) coins at game over, plus rewardAd
+when the player watches the one reward ad a run allows, which also skips
+the failed level. Purchase policies in tools/economy_config.json buy items
+before a run, up to items.maxPerRun each. Items are used when a run would
+end, and save it with a per-item chance. The level where a run would end,
+and whether by timeout or wrong tap, are drawn from the distribution the
+survival simulator measures for each (mode, archetype).
+
+All players advance together, one run slot at a time. A run samples its
+ending level by inverse CDF and, after each save, resamples conditioned
+on the level it reached, so a run costs one draw per death instead of
+one per level. Reports are cached under
+.colortrap/economy-cache/ by a hash of every input, so rerunning an
+unchanged scenario just prints the stored report.
+
+Usage:
+    python -m tools.economy_sim [--root PATH] [--players 50000] [--weeks 8] [--seed 0] [--json PATH] [--no-cache]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from tools.balance_config import load_balance_config
+from tools.survival_sim import SURVIVAL_VERSION, TIMEOUT, load_archetypes, mode_tables, shard_rng, simulate
+
+ECONOMY_CONFIG_PATH = "tools/economy_config.json"
+CACHE_DIR = os.path.join(".colortrap", "economy-cache")
+# Part of the cache key with SURVIVAL_VERSION: bump when the economy model changes
+ECONOMY_VERSION = 1
+
+DEFAULT_PLAYERS = 50_000
+DEFAULT_WEEKS = 8
+HAZARD_RUNS = 100_000
+MAX_LEVEL = 300
+# Item "saves" values
+ANY = "any"
+
+
+def load_economy_config(project_root="."):
+    with open(Path(project_root) / ECONOMY_CONFIG_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def scenario_key(balance_config, archetypes, economy, players, weeks, seed, hazard_runs=HAZARD_RUNS):
+    """sha256 over every input that can change the report"""
+    scenario = {
+        "version": ECONOMY_VERSION,
+        "survivalVersion": SURVIVAL_VERSION,
+        "modes": balance_config["modes"],
+        "items": balance_config["items"],
+        "archetypes": archetypes,
+        "economy": economy,
+        "players": players,
+        "weeks": weeks,
+        "seed": seed,
+        "hazardRuns": hazard_runs,
+        "maxLevel": MAX_LEVEL,
+    }
+    text = json.dumps(scenario, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def ending_tables(balance_config, archetypes, modes, seed, runs=HAZARD_RUNS):
+    """
+    One row per (mode, archetype), over levels cleared 0..MAX_LEVEL:
+    (cumulative share of runs ending there, share of those ended by a timeout)
+    The last column holds the runs that cleared every simulated level
+    """
+    cdf_rows, timeout_rows = [], []
+    for mode in modes:
+        tables = mode_tables(balance_config, mode, MAX_LEVEL)
+        for archetype_index, archetype in enumerate(archetypes.values()):
+            histogram, causes = simulate(tables, archetype, runs,
+                                         shard_rng(seed, mode, archetype_index, 0))
+            cdf_rows.append(np.cumsum(histogram) / histogram.sum())
+            timeout_rows.append(causes[TIMEOUT] / np.maximum(histogram, 1))
+    cdf = np.array(cdf_rows)
+    cdf[:, -1] = 1.0
+    return cdf, np.array(timeout_rows)
+
+
+def _pick(rng, shares, n):
+    """n indices drawn with the given {name: share} weights"""
+    weights = np.array(list(shares.values()), dtype=np.float64)
+    return rng.choice(len(weights), size=n, p=weights / weights.sum()).astype(np.int16)
+
+
+class Economy:
+    """Population state plus the per-run and per-week bookkeeping"""
+
+    def __init__(self, balance_config, archetypes, economy, players, seed=0, hazard_runs=HAZARD_RUNS):
+        population = economy["population"]
+        self.modes = list(population["modes"])
+        self.archetype_names = list(archetypes)
+        self.policy_names = list(population["policies"])
+        items = balance_config["items"]
+        self.items = list(items["costs"])
+        self.costs = np.array([items["costs"][i] for i in self.items], dtype=np.int64)
+        self.max_per_run = np.array([items["maxPerRun"].get(i, 0) for i in self.items], dtype=np.int16)
+        self.save_chance = np.array([economy["items"][i]["saveChance"] for i in self.items])
+        self.saves = [economy["items"][i]["saves"] for i in self.items]
+        self.coins = economy["coins"]
+        self.seconds_per_level = economy["secondsPerLevel"]
+        self.seconds_per_run = economy["secondsPerRun"]
+
+        # Per policy: items it buys in priority order (also the use order) and its reserve
+        self.policy_items = [[self.items.index(i) for i in economy["policies"][name]["buy"]]
+                             for name in self.policy_names]
+        self.policy_reserve = np.array([economy["policies"][name]["reserve"] for name in self.policy_names])
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+        self.players = players
+        self.archetype = _pick(rng, {n: a["share"] for n, a in archetypes.items()}, players)
+        self.policy = _pick(rng, population["policies"], players)
+        self.mode = _pick(rng, population["modes"], players)
+        self.table = self.mode * len(self.archetype_names) + self.archetype
+        habits = [population["archetypes"][name] for name in self.archetype_names]
+        self.sessions_per_day = np.array([h["sessionsPerDay"] for h in habits])[self.archetype]
+        self.runs_per_session = np.array([h["runsPerSession"] for h in habits], dtype=np.int32)[self.archetype]
+        self.ad_rate = np.array([h["rewardAdRate"] for h in habits])[self.archetype]
+
+        self.cdf, self.timeout_share = ending_tables(balance_config, archetypes, self.modes, seed, hazard_runs)
+        # Rows shifted apart so one searchsorted serves every table
+        self._offset_cdf = (self.cdf + 2.0 * np.arange(len(self.cdf))[:, None]).ravel()
+
+        self.balance = np.zeros(players, dtype=np.int64)
+        self.earned = np.zeros(players, dtype=np.int64)
+        self.spent = np.zeros(players, dtype=np.int64)
+        self.seconds = np.zeros(players, dtype=np.float64)
+        self.runs = np.zeros(players, dtype=np.int64)
+        self.inventory = np.zeros((players, len(self.items)), dtype=np.int16)
+        self.items_used = np.zeros(len(self.items), dtype=np.int64)
+        # Play hours at which cumulative earnings first covered each item
+        self.afford_hours = np.full((players, len(self.items)), np.nan)
+
+    def _buy(self, p):
+        """Top up each policy item to maxPerRun while the reserve allows"""
+        for policy_index, wanted in enumerate(self.policy_items):
+            if not wanted:
+                continue
+            buyers = p[self.policy[p] == policy_index]
+            reserve = self.policy_reserve[policy_index]
+            for j in wanted:
+                for _ in range(self.max_per_run[j]):
+                    can = (self.inventory[buyers, j] < self.max_per_run[j]) & \
+                          (self.balance[buyers] - self.costs[j] >= reserve)
+                    if not can.any():
+                        break
+                    who = buyers[can]
+                    self.inventory[who, j] += 1
+                    self.balance[who] -= self.costs[j]
+                    self.spent[who] += self.costs[j]
+
+    def _ending(self, rng, table, start):
+        """Levels cleared by runs that have cleared start levels, drawn per table row"""
+        width = self.cdf.shape[1]
+        before = np.where(start > 0, self.cdf[table, np.maximum(start - 1, 0)], 0.0)
+        u = before + rng.random(table.size) * (1.0 - before)
+        flat = np.searchsorted(self._offset_cdf, u + 2.0 * table, side='right')
+        return np.clip(flat - table * width, start, width - 1)
+
+    def _save(self, rng, p, timed_out, usable):
+        """Use items on ending runs in policy order; returns (saved, (n, items) used)"""
+        saved = np.zeros(p.size, dtype=bool)
+        used = np.zeros((p.size, len(self.items)), dtype=np.int16)
+        for policy_index, wanted in enumerate(self.policy_items):
+            for j in wanted:
+                cause_ok = True if self.saves[j] == ANY else (timed_out if self.saves[j] == TIMEOUT else ~timed_out)
+                use = ~saved & cause_ok & usable[:, j] & (self.policy[p] == policy_index)
+                if not use.any():
+                    continue
+                self.inventory[p[use], j] -= 1
+                self.items_used[j] += int(use.sum())
+                used[use, j] = 1
+                saved |= use & (rng.random(p.size) < self.save_chance[j])
+        return saved, used
+
+    def play_run(self, rng, p):
+        """One run for each player in p"""
+        self._buy(p)
+        n = p.size
+        table = self.table[p]
+        cleared = np.zeros(n, dtype=np.int64)
+        start = np.zeros(n, dtype=np.int64)
+        watched_ad = np.zeros(n, dtype=bool)
+        used_this_run = np.zeros((n, len(self.items)), dtype=np.int16)
+        active = np.arange(n)
+
+        # Every save spends an item or the ad, so this ends after a few rounds
+        while active.size:
+            ending = self._ending(rng, table[active], start[active])
+            survived = ending >= MAX_LEVEL
+            cleared[active[survived]] = MAX_LEVEL
+            active, ending = active[~survived], ending[~survived]
+            if not active.size:
+                break
+
+            timed_out = rng.random(active.size) < self.timeout_share[table[active], ending]
+            usable = (self.inventory[p[active]] > 0) & (used_this_run[active] < self.max_per_run)
+            saved, used = self._save(rng, p[active], timed_out, usable)
+            used_this_run[active] += used
+            ad = ~saved & ~watched_ad[active] & (rng.random(active.size) < self.ad_rate[p[active]])
+            watched_ad[active[ad]] = True
+
+            # A save (item or ad) counts the level as cleared
+            go_on = saved | ad
+            cleared[active[~go_on]] = ending[~go_on]
+            start[active[go_on]] = ending[go_on] + 1
+            active = active[go_on]
+
+        coins = np.maximum(self.coins["perLevel"] * (cleared + 1), self.coins["minimum"]) + \
+            watched_ad * self.coins["rewardAd"]
+        self.balance[p] += coins
+        self.earned[p] += coins
+        self.seconds[p] += cleared * self.seconds_per_level + self.seconds_per_run
+        self.runs[p] += 1
+        hours = self.seconds[p] / 3600.0
+        first = np.isnan(self.afford_hours[p]) & (self.earned[p][:, None] >= self.costs)
+        rows, cols = np.nonzero(first)
+        self.afford_hours[p[rows], cols] = hours[rows]
+
+    def play_day(self, rng):
+        sessions = rng.poisson(self.sessions_per_day)
+        runs_today = sessions * self.runs_per_session
+        for slot in range(int(runs_today.max(initial=0))):
+            self.play_run(rng, np.flatnonzero(runs_today > slot))
+
+
+def run_scenario(balance_config, archetypes, economy, players=DEFAULT_PLAYERS, weeks=DEFAULT_WEEKS, seed=0,
+                 hazard_runs=HAZARD_RUNS):
+    """Simulate weeks of play; returns the JSON-ready report"""
+    sim = Economy(balance_config, archetypes, economy, players, seed, hazard_runs)
+    weekly = []
+    for week in range(weeks):
+        earned, spent, balance = sim.earned.sum(), sim.spent.sum(), sim.balance.mean()
+        for day in range(7):
+            sim.play_day(np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1, week * 7 + day))))
+        mean_balance = float(sim.balance.mean())
+        week_earned = int(sim.earned.sum() - earned)
+        week_spent = int(sim.spent.sum() - spent)
+        weekly.append({
+            "week": week + 1,
+            "earnedPerPlayer": round(week_earned / players, 1),
+            "spentPerPlayer": round(week_spent / players, 1),
+            "meanBalance": round(mean_balance, 1),
+            # Growth of the unspent coin stock: the inflation signal
+            "balanceGrowth": round((mean_balance - balance) / balance, 4) if balance else None,
+            "sinkRatio": round(week_spent / week_earned, 4) if week_earned else None,
+        })
+
+    segments = {}
+    for a, archetype in enumerate(sim.archetype_names):
+        for q, policy in enumerate(sim.policy_names):
+            members = (sim.archetype == a) & (sim.policy == q)
+            if not members.any():
+                continue
+            hours = sim.seconds[members].sum() / 3600.0
+            afford = sim.afford_hours[members]
+            segments[f"{archetype}/{policy}"] = {
+                "players": int(members.sum()),
+                "runsPerWeek": round(float(sim.runs[members].mean()) / weeks, 1),
+                "coinsPerHour": round(float(sim.earned[members].sum()) / hours, 1) if hours else 0.0,
+                "finalBalance": round(float(sim.balance[members].mean()), 1),
+                # Median play hours until earnings covered each item (null: most never did)
+                "hoursToAfford": {item: (round(float(np.nanmedian(afford[:, j])), 2)
+                                         if np.mean(~np.isnan(afford[:, j])) >= 0.5 else None)
+                                  for j, item in enumerate(sim.items)},
+            }
+
+    total_hours = sim.seconds.sum() / 3600.0
+    return {
+        "players": players,
+        "weeks": weeks,
+        "seed": seed,
+        "coinsPerHour": round(float(sim.earned.sum()) / total_hours, 1) if total_hours else 0.0,
+        "itemsUsed": {item: int(n) for item, n in zip(sim.items, sim.items_used)},
+        "weekly": weekly,
+        "segments": segments,
+    }
+
+
+def cached_scenario(project_root, balance_config, archetypes, economy, players, weeks, seed,
+                    use_cache=True, hazard_runs=HAZARD_RUNS):
+    """(report, cache hit?) with the report stored under its scenario hash"""
+    key = scenario_key(balance_config, archetypes, economy, players, weeks, seed, hazard_runs)
+    cache_file = Path(project_root) / CACHE_DIR / f"{key}.json"
+    if use_cache:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f), True
+        except (OSError, ValueError):
+            pass
+    report = run_scenario(balance_config, archetypes, economy, players, weeks, seed, hazard_runs)
+    report["scenario"] = key
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_file.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, cache_file)
+    return report, False
+
+
+def print_report(report):
+    print(f"\nCoins per hour (all players): {report['coinsPerHour']:,.0f}")
+    print(f"\n{'week':>4} {'earned':>9} {'spent':>9} {'balance':>9} {'growth':>8} {'sink':>6}")
+    for row in report["weekly"]:
+        growth = f"{row['balanceGrowth']:.1%}" if row["balanceGrowth"] is not None else "-"
+        sink = f"{row['sinkRatio']:.0%}" if row["sinkRatio"] is not None else "-"
+        print(f"{row['week']:>4} {row['earnedPerPlayer']:>9,.0f} {row['spentPerPlayer']:>9,.0f} "
+              f"{row['meanBalance']:>9,.0f} {growth:>8} {sink:>6}")
+
+    items = list(report["itemsUsed"])
+    header = "".join(f"{item:>12}" for item in items)
+    print(f"\n{'segment':<20} {'players':>7} {'coins/h':>8}  hours to afford:{header}")
+    for name, segment in report["segments"].items():
+        cells = "".join(f"{h:>12.2f}" if h is not None else f"{'-':>12}" for h in segment["hoursToAfford"].values())
+        print(f"{name:<20} {segment['players']:>7,} {segment['coinsPerHour']:>8,.0f}  {'':>15}{cells}")
+    print("\nItems used: " + ", ".join(f"{item} {n:,}" for item, n in report["itemsUsed"].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Coin Economy Simulator")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS, help=f"Simulated players (default: {DEFAULT_PLAYERS})")
+    parser.add_argument("--weeks", type=int, default=DEFAULT_WEEKS, help=f"Weeks of play (default: {DEFAULT_WEEKS})")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed (default: 0)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute even if this scenario is cached")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    balance_config = load_balance_config(root)
+    archetypes = load_archetypes(root)
+    economy = load_economy_config(root)
+
+    started = time.perf_counter()
+    report, hit = cached_scenario(root, balance_config, archetypes, economy,
+                                  args.players, args.weeks, args.seed, use_cache=not args.no_cache)
+    source = "from cache" if hit else f"in {time.perf_counter() - started:.1f} s"
+    print(f"✓ {args.players:,} players × {args.weeks} weeks {source} (scenario {report['scenario'][:12]})")
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
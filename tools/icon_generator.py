@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Launcher Icon Generator
+Renders every launcher icon product (legacy square, legacy round, adaptive
+foreground, Play Store 512 px) at every mipmap density from one master
+image. Renders run on a process pool that decodes the master once per
+worker; results are cached by master hash + product + size, and outputs
+whose bytes are unchanged are not rewritten.
+
+Usage:
+    python -m tools.icon_generator --master art/colortrap_icon.png [--root PATH] [--name colortrap_icon]
+    python -m tools.icon_generator --master art/colortrap_icon.png --check   # CI: exit 1 if res/ is stale
+"""
+
+import io
+import os
+import sys
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.assets import RES_ROOT
+from tools.manifest import hash_bytes, hash_file
+from tools.asset_cache import blob_path, publish_blob
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:  # Pillow is only needed by the asset tooling
+    Image = None
+
+DEFAULT_MASTER = "art/colortrap_icon.png"
+DEFAULT_NAME = "colortrap_icon"
+PLAY_STORE_PATH = "app/src/main/colortrap_icon_round-playstore.png"
+PLAY_STORE_SIZE = 512
+RENDER_VERSION = 1
+
+# mipmap qualifier -> scale from dp
+DENSITIES = {
+    "mdpi": 1.0,
+    "hdpi": 1.5,
+    "xhdpi": 2.0,
+    "xxhdpi": 3.0,
+    "xxxhdpi": 4.0,
+}
+
+# product -> (file suffix, canvas dp, artwork dp, circle mask)
+# Adaptive foregrounds are 108 dp with the artwork inside the 72 dp visible area
+PRODUCTS = {
+    "legacy": ("", 48, 48, False),
+    "round": ("_round", 48, 48, True),
+    "foreground": ("_round_foreground", 108, 72, False),
+}
+
+_master = None
+
+
+def _init_worker(master_path):
+    # One decode per worker; every render reuses it
+    global _master
+    with Image.open(master_path) as img:
+        _master = img.convert("RGBA")
+        _master.load()
+
+
+def render(canvas_px, art_px, circle):
+    """PNG/WebP-ready RGBA image: master fitted into art_px, centered on canvas_px"""
+    art = _master.copy()
+    art.thumbnail((art_px, art_px), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    canvas = Image.new("RGBA", (canvas_px, canvas_px), (0, 0, 0, 0))
+    canvas.paste(art, ((canvas_px - art.width) // 2, (canvas_px - art.height) // 2), art)
+    if circle:
+        # Supersampled mask for a smooth edge
+        mask = Image.new("L", (canvas_px * 4, canvas_px * 4), 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, canvas_px * 4 - 1, canvas_px * 4 - 1), fill=255)
+        mask = mask.resize((canvas_px, canvas_px), Image.Resampling.LANCZOS)
+        alpha = Image.composite(canvas.getchannel("A"), mask, mask)
+        canvas.putalpha(alpha)
+    return canvas
+
+
+def _render_job(job):
+    """Worker: (rel_path, canvas_px, art_px, circle, fmt, cache_path) -> (rel_path, bytes)"""
+    rel_path, canvas_px, art_px, circle, fmt, cache_path = job
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return rel_path, f.read()
+    buffer = io.BytesIO()
+    image = render(canvas_px, art_px, circle)
+    if fmt == "WEBP":
+        # Lossless quality is encoder effort; past 80 it is ~10x slower for <1% smaller files
+        image.save(buffer, "WEBP", lossless=True, quality=80, method=6)
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    data = buffer.getvalue()
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    publish_blob(tmp_path, cache_path)
+    return rel_path, data
+
+
+def plan_jobs(root, master_sha, name, densities=DENSITIES, play_store=True):
+    """One render job per product and density, plus the Play Store PNG"""
+    jobs = []
+    for product, (suffix, canvas_dp, art_dp, circle) in PRODUCTS.items():
+        for density, scale in densities.items():
+            canvas_px, art_px = round(canvas_dp * scale), round(art_dp * scale)
+            rel = f"{RES_ROOT}/mipmap-{density}/{name}{suffix}.webp"
+            key = f"{master_sha}-{product}-{canvas_px}-{art_px}-v{RENDER_VERSION}"
+            jobs.append((rel, canvas_px, art_px, circle, "WEBP", blob_path(root, "icons", key, ".webp")))
+    if play_store:
+        key = f"{master_sha}-playstore-{PLAY_STORE_SIZE}-v{RENDER_VERSION}"
+        jobs.append((PLAY_STORE_PATH, PLAY_STORE_SIZE, PLAY_STORE_SIZE, False, "PNG",
+                     blob_path(root, "icons", key, ".png")))
+    return jobs
+
+
+def stale_siblings(root, rel_path):
+    """Same resource name with another extension (would clash in aapt)"""
+    folder, filename = os.path.split(os.path.join(os.fspath(root), rel_path))
+    stem = os.path.splitext(filename)[0]
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(folder, n) for n in names
+            if n != filename and os.path.splitext(n)[0] == stem and not n.endswith(".xml")]
+
+
+def generate(root, master_path, name=DEFAULT_NAME, jobs=None, check=False):
+    """Returns (written, unchanged, removed) project-relative paths"""
+    master_sha = hash_file(master_path)
+    render_jobs = plan_jobs(root, master_sha, name)
+    written, unchanged, removed = [], [], []
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(os.fspath(master_path),)) as pool:
+        for rel_path, data in pool.map(_render_job, render_jobs):
+            full_path = os.path.join(os.fspath(root), rel_path)
+            siblings = stale_siblings(root, rel_path)
+            if os.path.exists(full_path) and hash_file(full_path) == hash_bytes(data) and not siblings:
+                unchanged.append(rel_path)
+                continue
+            written.append(rel_path)
+            removed.extend(os.path.relpath(p, root).replace(os.sep, "/") for p in siblings)
+            if check:
+                continue
+            for path in siblings:
+                os.remove(path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            tmp_path = full_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, full_path)
+    return written, unchanged, removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Launcher Icon Generator")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--master", default=DEFAULT_MASTER, help=f"Master icon, ideally square and >= 1024 px (default: {DEFAULT_MASTER})")
+    parser.add_argument("--name", default=DEFAULT_NAME, help=f"Resource name (default: {DEFAULT_NAME})")
+    parser.add_argument("--jobs", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any output is out of date instead of writing")
+    args = parser.parse_args(argv)
+    if Image is None:
+        raise SystemExit("✗ Pillow is required: pip install -r tools/requirements.txt")
+
+    root = Path(args.root)
+    master = Path(args.master)
+    if not master.is_absolute():
+        master = root / master
+    if not master.exists():
+        print(f"✗ Master icon not found: {master}")
+        return 1
+
+    written, unchanged, removed = generate(root, master, args.name, args.jobs, args.check)
+    verb = "Stale" if args.check else "Wrote"
+    for rel in written:
+        print(f"{'✗' if args.check else '✓'} {verb}: {rel}")
+    for rel in removed:
+        print(f"{'✗' if args.check else '✓'} {'Would remove' if args.check else 'Removed'}: {rel}")
+    print(f"→ {len(written)} written, {len(unchanged)} unchanged")
+    return 1 if args.check and (written or removed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
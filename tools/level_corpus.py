@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Golden Level Corpus
+Writes seeded levels from tools/level_engine.py for each GameMode into a
+compact binary record stream, and reads them back by (mode, level, seed)
+or sequentially. The writer and reader work one level block at a time,
+so a corpus of millions of levels never has to fit in memory.
+
+Level (mode, level, seed) is row seed % 256 of the engine batch drawn from
+SeedSequence(base seed, (mode, level, seed // 256)). The same level comes
+out whatever the corpus size, and --verify can regenerate any of them.
+
+Layout (little-endian):
+    header   40 B   magic "CTL1", version u16, flags u16, mode count u8,
+                    group count u8, reserved u16, first level u32,
+                    last level u32, seeds per level u32, base seed u64,
+                    balance config hash u64 (first 8 bytes of its sha256)
+    modes    u8 × mode count, indices into GameMode (NORMAL, HARD, SUPER_HARD, RELAX)
+    groups   per color group: name length u8 + UTF-8 name
+    records  per mode, per level, seeds per level fixed-size records:
+                    safe group u8 (0xFF = none), tiles u8 × gridSize,
+                    forbidden u8 × forbidden slots, unused slots 0xFF;
+                    each tile byte is group << 3 | variant
+    index    16 B per (mode, level), in record order: block offset u64,
+                    gridSize u8, forbidden slots u8, difficulty u8, pad,
+                    timeLimit f32
+    trailer  12 B   index offset u64, magic "CTLI"
+
+The extra forbidden count is drawn per level, so records reserve the most
+forbidden colors the level's band allows. Every seed of a level then has
+the same gridSize and slot count, all records of a block are the same
+size and a seed is one multiply away.
+
+Usage:
+    python -m tools.level_corpus [--root PATH] [--out PATH] [--mode NORMAL ...]
+                                 [--levels 1-200] [--seeds 100] [--seed 0]
+    python -m tools.level_corpus --info PATH | --verify PATH
+    python -m tools.level_corpus --get PATH MODE LEVEL SEED
+"""
+
+import sys
+import json
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from tools.balance_config import MODES, load_balance_config, parse_range
+from tools.level_engine import DIFFICULTIES, VARIANTS_PER_GROUP, LevelEngine
+
+MAGIC = b"CTL1"
+TRAILER_MAGIC = b"CTLI"
+VERSION = 2
+HEADER = struct.Struct("<4sHHBBHIIIQQ")
+INDEX_ENTRY = struct.Struct("<QBBBxf")
+TRAILER = struct.Struct("<Q4s")
+# Seeds drawn per engine batch; fixed so a level never depends on corpus size
+SEED_BLOCK = 256
+# Also pads unused forbidden slots; variant 7 is never used, so no tile packs to it
+NO_GROUP = 0xFF
+VARIANT_BITS = 3
+MAX_GROUPS = 1 << (8 - VARIANT_BITS)
+CORPUS_PATH = ".colortrap/golden_levels.ctl"
+# Records read per chunk when streaming
+READ_CHUNK = 4096
+
+
+class CorpusError(Exception):
+    """Malformed corpus file or out-of-range lookup"""
+
+
+def config_hash(balance_config):
+    """First 8 bytes of the sha256 of the mode tables, as an int"""
+    text = json.dumps(balance_config["modes"], sort_keys=True, separators=(",", ":"))
+    return int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'little')
+
+
+# ==================== GENERATION ====================
+
+def block_rng(base_seed, mode, level, block):
+    return np.random.default_rng(np.random.SeedSequence(base_seed, spawn_key=(MODES.index(mode), level, block)))
+
+
+def pack_batch(batch):
+    """
+    (n, record size) uint8 records plus the block's (gridSize, forbidden
+    slots, difficulty, timeLimit); CorpusError if they differ across rows
+    """
+    tiles = int(batch.grid_size[0])
+    forbidden = int(batch.forbidden_slots[0])
+    for name, column in (("gridSize", batch.grid_size), ("forbidden slots", batch.forbidden_slots),
+                         ("difficulty", batch.difficulty), ("timeLimit", batch.time_limit)):
+        if (column != column[0]).any():
+            raise CorpusError(f"{batch.mode} level {batch.level[0]}: {name} varies within the level")
+    safe = np.where(batch.safe_group >= 0, batch.safe_group, NO_GROUP).astype(np.uint8)
+    tile_bytes = (batch.tile_group[:, :tiles].astype(np.uint8) << VARIANT_BITS) | batch.tile_variant[:, :tiles].astype(np.uint8)
+    forbidden_group = batch.forbidden_group[:, :forbidden]
+    forbidden_bytes = np.where(
+        forbidden_group >= 0,
+        (forbidden_group.astype(np.uint8) << VARIANT_BITS) | batch.forbidden_variant[:, :forbidden].astype(np.uint8),
+        NO_GROUP).astype(np.uint8)
+    records = np.concatenate([safe[:, None], tile_bytes, forbidden_bytes], axis=1)
+    meta = (tiles, forbidden, int(batch.difficulty[0]), float(batch.time_limit[0]))
+    return records, meta
+
+
+def level_blocks(engine, mode, level, seeds, base_seed):
+    """Yield (records, meta) for seeds 0..seeds-1 of one level, SEED_BLOCK at a time"""
+    for block in range(0, seeds, SEED_BLOCK):
+        batch = engine.generate(mode, np.full(SEED_BLOCK, level), block_rng(base_seed, mode, level, block // SEED_BLOCK))
+        records, meta = pack_batch(batch)
+        yield records[:min(SEED_BLOCK, seeds - block)], meta
+
+
+def regenerate(engine, mode, level, seed, base_seed=0):
+    """The packed record for one (mode, level, seed), without a corpus"""
+    batch = engine.generate(mode, np.full(SEED_BLOCK, level), block_rng(base_seed, mode, level, seed // SEED_BLOCK))
+    records, meta = pack_batch(batch)
+    return records[seed % SEED_BLOCK].tobytes(), meta
+
+
+# ==================== WRITER ====================
+
+class CorpusWriter:
+    """
+    Streams levels to a binary file object; blocks must arrive in
+    corpus order (modes as given, levels ascending, seeds ascending)
+    Only the (mode, level) index is kept in memory
+    """
+
+    def __init__(self, f, modes, first_level, last_level, seeds_per_level, groups, base_seed=0, balance_hash=0):
+        if len(groups) > MAX_GROUPS:
+            raise CorpusError(f"At most {MAX_GROUPS} color groups fit a tile byte, got {len(groups)}")
+        if VARIANTS_PER_GROUP >= 1 << VARIANT_BITS:
+            raise CorpusError(f"Variant indices must stay below {(1 << VARIANT_BITS) - 1} to keep 0xFF free")
+        self.f = f
+        self.modes = list(modes)
+        self.first_level = first_level
+        self.last_level = last_level
+        self.seeds_per_level = seeds_per_level
+        self.index = []
+        self._expected = iter([(m, lvl) for m in self.modes for lvl in range(first_level, last_level + 1)])
+        self._current = None
+        self._written = 0
+        self.records = 0
+
+        names = b"".join(bytes([len(n.encode('utf-8'))]) + n.encode('utf-8') for n in groups)
+        self.offset = 0
+        self._write(HEADER.pack(MAGIC, VERSION, 0, len(self.modes), len(groups), 0,
+                                first_level, last_level, seeds_per_level, base_seed, balance_hash))
+        self._write(bytes(MODES.index(m) for m in self.modes))
+        self._write(names)
+
+    def _write(self, data):
+        self.f.write(data)
+        self.offset += len(data)
+
+    def _finish_level(self):
+        if self._current is not None and self._written != self.seeds_per_level:
+            mode, level = self._current
+            raise CorpusError(f"{mode} level {level}: {self._written} of {self.seeds_per_level} seeds written")
+
+    def write(self, mode, level, records, meta):
+        """Append packed records (see pack_batch) for the next seeds of (mode, level)"""
+        if (mode, level) != self._current:
+            self._finish_level()
+            expected = next(self._expected, None)
+            if expected != (mode, level):
+                raise CorpusError(f"Expected {expected}, got {(mode, level)}")
+            self._current = (mode, level)
+            self._written = 0
+            tiles, forbidden, difficulty, time_limit = meta
+            self.index.append(INDEX_ENTRY.pack(self.offset, tiles, forbidden, difficulty, time_limit))
+        self._write(np.ascontiguousarray(records, dtype=np.uint8).tobytes())
+        self._written += len(records)
+        self.records += len(records)
+
+    def close(self):
+        self._finish_level()
+        if next(self._expected, None) is not None:
+            raise CorpusError("Corpus closed before every (mode, level) was written")
+        index_offset = self.offset
+        self._write(b"".join(self.index))
+        self._write(TRAILER.pack(index_offset, TRAILER_MAGIC))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def build_corpus(path, engine, modes, first_level, last_level, seeds_per_level, base_seed=0, balance_hash=0):
+    """Generate and write the corpus level by level; returns the record count"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            with CorpusWriter(f, modes, first_level, last_level, seeds_per_level, engine.groups,
+                              base_seed, balance_hash) as writer:
+                for mode in modes:
+                    for level in range(first_level, last_level + 1):
+                        for records, meta in level_blocks(engine, mode, level, seeds_per_level, base_seed):
+                            writer.write(mode, level, records, meta)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(path)
+    return writer.records
+
+
+# ==================== READER ====================
+
+class LevelCorpus:
+    """
+    Random access and streaming over a corpus file; holds the header and
+    the (mode, level) index, and reads records on demand
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._read_header()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_header(self):
+        f = self._file
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size:
+            raise CorpusError("File too short for a corpus header")
+        (magic, version, _flags, mode_count, group_count, _,
+         self.first_level, self.last_level, self.seeds_per_level,
+         self.base_seed, self.balance_hash) = HEADER.unpack(head)
+        if magic != MAGIC:
+            raise CorpusError(f"Bad magic {magic!r}")
+        if version != VERSION:
+            raise CorpusError(f"Unsupported corpus version {version}")
+        self.modes = [MODES[code] for code in f.read(mode_count)]
+        self.groups = []
+        for _ in range(group_count):
+            length = f.read(1)[0]
+            self.groups.append(f.read(length).decode('utf-8'))
+
+        f.seek(-TRAILER.size, 2)
+        index_offset, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            raise CorpusError("Missing corpus trailer (truncated file?)")
+        levels = self.last_level - self.first_level + 1
+        f.seek(index_offset)
+        raw = f.read(INDEX_ENTRY.size * levels * len(self.modes))
+        if len(raw) != INDEX_ENTRY.size * levels * len(self.modes):
+            raise CorpusError("Corpus index is truncated")
+        self.index = [INDEX_ENTRY.unpack_from(raw, i) for i in range(0, len(raw), INDEX_ENTRY.size)]
+
+    def __len__(self):
+        return len(self.index) * self.seeds_per_level
+
+    def _entry(self, mode, level):
+        if mode not in self.modes:
+            raise CorpusError(f"Mode {mode} is not in this corpus")
+        if not self.first_level <= level <= self.last_level:
+            raise CorpusError(f"Level {level} is outside {self.first_level}-{self.last_level}")
+        levels = self.last_level - self.first_level + 1
+        return self.index[self.modes.index(mode) * levels + level - self.first_level]
+
+    def record(self, mode, level, seed):
+        """Raw packed record bytes for one level"""
+        if not 0 <= seed < self.seeds_per_level:
+            raise CorpusError(f"Seed {seed} is outside 0-{self.seeds_per_level - 1}")
+        offset, tiles, forbidden, _, _ = self._entry(mode, level)
+        size = 1 + tiles + forbidden
+        self._file.seek(offset + seed * size)
+        return self._file.read(size)
+
+    def get(self, mode, level, seed):
+        """One level as a DynamicLevel-shaped dict"""
+        return self.decode(mode, level, seed, self.record(mode, level, seed))
+
+    def decode(self, mode, level, seed, record):
+        _, tiles, forbidden, difficulty, time_limit = self._entry(mode, level)
+        mask = (1 << VARIANT_BITS) - 1
+
+        def tile(i, byte):
+            return {"id": i, "colorGroup": self.groups[byte >> VARIANT_BITS], "variantIndex": byte & mask}
+
+        safe = record[0]
+        return {
+            "mode": mode,
+            "levelNumber": level,
+            "seed": seed,
+            "difficulty": DIFFICULTIES[difficulty],
+            "gridSize": tiles,
+            "timeLimit": round(time_limit, 3),
+            # Tile ids are display positions
+            "tiles": [tile(i, b) for i, b in enumerate(record[1:1 + tiles])],
+            "forbiddenColors": [tile(-(i + 1), b) for i, b in enumerate(record[1 + tiles:]) if b != NO_GROUP],
+            "safeColorGroup": self.groups[safe] if safe != NO_GROUP else None,
+        }
+
+    def blocks(self):
+        """
+        Yield (mode, level, first seed, records ndarray) through the whole
+        corpus in file order, at most READ_CHUNK records at a time
+        """
+        levels = self.last_level - self.first_level + 1
+        for position, (offset, tiles, forbidden, _, _) in enumerate(self.index):
+            mode = self.modes[position // levels]
+            level = self.first_level + position % levels
+            size = 1 + tiles + forbidden
+            self._file.seek(offset)
+            for start in range(0, self.seeds_per_level, READ_CHUNK):
+                count = min(READ_CHUNK, self.seeds_per_level - start)
+                data = self._file.read(count * size)
+                if len(data) != count * size:
+                    raise CorpusError(f"{mode} level {level}: records are truncated")
+                yield mode, level, start, np.frombuffer(data, dtype=np.uint8).reshape(count, size)
+
+    def levels(self):
+        """Yield every level as a dict, streaming"""
+        for mode, level, start, records in self.blocks():
+            for i, record in enumerate(records):
+                yield self.decode(mode, level, start + i, record.tobytes())
+
+    def group_changes(self, groups):
+        """How groups differs from the corpus group list, or None when equal"""
+        if list(groups) == self.groups:
+            return None
+        added = [g for g in groups if g not in self.groups]
+        removed = [g for g in self.groups if g not in groups]
+        parts = ([f"added {', '.join(added)}"] if added else []) + ([f"removed {', '.join(removed)}"] if removed else [])
+        return "; ".join(parts) or "reordered"
+
+    def verify(self, engine):
+        """(mode, level, seed) of every record that differs from a fresh generation"""
+        bad = []
+        # READ_CHUNK is a multiple of SEED_BLOCK, so chunks hold whole seed blocks
+        for mode, level, start, records in self.blocks():
+            for first in range(0, len(records), SEED_BLOCK):
+                batch = engine.generate(mode, np.full(SEED_BLOCK, level),
+                                        block_rng(self.base_seed, mode, level, (start + first) // SEED_BLOCK))
+                expected, _ = pack_batch(batch)
+                chunk = records[first:first + SEED_BLOCK]
+                if expected.shape[1] != chunk.shape[1]:
+                    bad.extend((mode, level, start + first + i) for i in range(len(chunk)))
+                    continue
+                differs = (chunk != expected[:len(chunk)]).any(axis=1)
+                bad.extend((mode, level, start + first + int(i)) for i in np.flatnonzero(differs))
+        return bad
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Golden Level Corpus")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--out", default=None, help=f"Corpus path (default: {CORPUS_PATH})")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Mode to include (repeatable, default: all)")
+    parser.add_argument("--levels", default="1-200", help="Level range, e.g. 1-200 (default: 1-200)")
+    parser.add_argument("--seeds", type=int, default=100, help="Seeds per level (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed (default: 0)")
+    parser.add_argument("--info", metavar="PATH", help="Print a corpus header")
+    parser.add_argument("--verify", metavar="PATH", help="Regenerate every level and compare; exit 1 on mismatch")
+    parser.add_argument("--get", nargs=4, metavar=("PATH", "MODE", "LEVEL", "SEED"), help="Print one level as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        return _run(args, parser)
+    except CorpusError as e:
+        print(f"✗ {e}")
+        return 1
+
+
+def _run(args, parser):
+    if args.get:
+        path, mode, level, seed = args.get
+        with LevelCorpus(path) as corpus:
+            print(json.dumps(corpus.get(mode, int(level), int(seed)), indent=2))
+        return 0
+
+    if args.info:
+        with LevelCorpus(args.info) as corpus:
+            size = Path(args.info).stat().st_size
+            print(f"{args.info}: {len(corpus):,} levels, {size:,} bytes ({size / max(len(corpus), 1):.1f} B/level)")
+            print(f"  modes {', '.join(corpus.modes)}; levels {corpus.first_level}-{corpus.last_level}; "
+                  f"{corpus.seeds_per_level} seeds/level; base seed {corpus.base_seed}; "
+                  f"{len(corpus.groups)} color groups; balance {corpus.balance_hash:016x}")
+        return 0
+
+    root = Path(args.root)
+    balance_config = load_balance_config(root)
+    engine = LevelEngine.from_project(root)
+
+    if args.verify:
+        with LevelCorpus(args.verify) as corpus:
+            if corpus.balance_hash != config_hash(balance_config):
+                print("⚠ balance_config.json changed since this corpus was written; mismatches are expected")
+            changed = corpus.group_changes(engine.groups)
+            if changed:
+                print(f"⚠ Color groups changed since this corpus was written ({changed}); mismatches are expected")
+            bad = corpus.verify(engine)
+            for mode, level, seed in bad[:20]:
+                print(f"✗ {mode} level {level} seed {seed} differs")
+            print(f"{'✗' if bad else '✓'} {len(corpus):,} levels, {len(bad):,} differ")
+        return 1 if bad else 0
+
+    lo, hi = parse_range(args.levels)
+    if hi is None:
+        parser.error("--levels needs an upper bound")
+    modes = args.mode or [mode for mode in MODES if mode in engine.tables]
+    out = Path(args.out) if args.out else root / CORPUS_PATH
+    count = build_corpus(out, engine, modes, lo, hi, args.seeds, args.seed, config_hash(balance_config))
+    size = out.stat().st_size
+    print(f"✓ Wrote {out} ({count:,} levels, {size:,} bytes, {size / max(count, 1):.1f} B/level)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Level Engine
+Seeded NumPy port of DynamicLevelGenerator.generateLevel for bulk QA.
+Levels are generated in batches as structure-of-arrays (one array per
+field, tiles and forbidden sets padded with -1), so a batch of 100k
+levels is a handful of vectorized ops. The rules follow the Kotlin
+generator: 4 grid colors picked per difficulty, tiles cycle through them
+and are shuffled, N-1 = 3 distinct grid groups are forbidden, plus 0-3
+extra groups that are not on the grid, drawn per level from the
+getExtraForbiddenCount() bands. gridSize and timeLimit come from
+balance_config.json; color groups come from the game_config.json default
+skin in skin_index.json. balance_config.json forbiddenCount values the
+generator cannot produce are reported as config warnings.
+
+Usage:
+    python -m tools.level_engine [--root PATH] [--mode NORMAL ...] [--levels 1-200]
+                                 [--count 1000000] [--seed 0] [--batch 200000] [--json PATH]
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from tools.assets import iter_skin_variants
+from tools.balance_config import (
+    MODES, LevelIndex, load_balance_config, load_game_config, parse_range,
+)
+from tools.skin_index import INDEX_PATH
+
+# DynamicLevelGenerator constants
+GRID_COLOR_COUNT = 4
+GRID_FORBIDDEN = GRID_COLOR_COUNT - 1   # N-1 rule
+MAX_EXTRA_FORBIDDEN = 3
+MAX_FORBIDDEN = GRID_FORBIDDEN + MAX_EXTRA_FORBIDDEN
+VARIANTS_PER_GROUP = 3                  # (0..2).random()
+
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD", "SUPER_HARD")
+
+# determineDifficulty(): first level of each tier per mode
+DIFFICULTY_TIERS = {
+    "NORMAL": ((1, "EASY"), (21, "MEDIUM"), (41, "HARD"), (61, "SUPER_HARD")),
+    "HARD": ((1, "MEDIUM"), (11, "HARD"), (31, "SUPER_HARD")),
+    "SUPER_HARD": ((1, "HARD"), (11, "SUPER_HARD")),
+    "RELAX": ((1, "EASY"),),
+}
+
+# getExtraForbiddenCount(): (first level, min, max) extra groups per band,
+# drawn uniformly per level
+EXTRA_FORBIDDEN_BANDS = {
+    "NORMAL": ((1, 0, 0), (21, 0, 1), (41, 1, 2)),
+    "HARD": ((1, 0, 1), (11, 1, 2), (31, 2, 3)),
+    "SUPER_HARD": ((1, 1, 2), (11, 2, 3)),
+    "RELAX": ((1, 0, 0),),
+}
+
+# selectGridColorGroups(): grid slot -> position in a random permutation
+# of the color groups (EASY 4 different, MEDIUM 2 same + 2, HARD 3 same + 1,
+# SUPER_HARD all the same)
+GRID_PATTERNS = np.array([
+    [0, 1, 2, 3],
+    [0, 0, 1, 2],
+    [0, 0, 0, 1],
+    [0, 0, 0, 0],
+], dtype=np.intp)
+DISTINCT_GRID_GROUPS = np.array([len(set(p)) for p in GRID_PATTERNS.tolist()], dtype=np.intp)
+
+DEFAULT_BATCH = 200_000
+
+
+def load_color_groups(project_root=".", skin=None):
+    """
+    (skin, sorted color groups, {group: variant count}) for skin, or the
+    game_config.json default skin. Reads skin_index.json and falls back to
+    walking assets/skins when the index is missing
+    """
+    root = Path(project_root)
+    if skin is None:
+        skin = load_game_config(root).get("skins", {}).get("defaultSkin", "color")
+    try:
+        with open(root / INDEX_PATH, 'r', encoding='utf-8') as f:
+            groups = json.load(f)["skins"].get(skin, {})
+        counts = {group: len(variants) for group, variants in groups.items()}
+    except (OSError, ValueError, KeyError):
+        counts = {}
+        for _, group, _ in iter_skin_variants(root, skins=[skin]):
+            counts[group] = counts.get(group, 0) + 1
+    if not counts:
+        raise ValueError(f"Skin {skin!r} has no color groups")
+    return skin, sorted(counts), counts
+
+
+class ModeTables:
+    """
+    One mode's balance ranges, difficulty tiers and extra-forbidden bands
+    as NumPy lookup arrays
+    """
+
+    def __init__(self, levels, tiers, extra_bands):
+        index = LevelIndex(levels)
+        self.index = index
+        self.starts = np.array(index.starts, dtype=np.int64)
+        self.grid_size = np.array([p["gridSize"] for p in index.params], dtype=np.int16)
+        self.time_limit = np.array([p["timeLimit"] for p in index.params], dtype=np.float32)
+        self.tier_starts = np.array([start for start, _ in tiers], dtype=np.int64)
+        self.tier_codes = np.array([DIFFICULTIES.index(name) for _, name in tiers], dtype=np.int8)
+        self.extra_starts = np.array([start for start, _, _ in extra_bands], dtype=np.int64)
+        self.extra_min = np.array([lo for _, lo, _ in extra_bands], dtype=np.int8)
+        self.extra_max = np.array([hi for _, _, hi in extra_bands], dtype=np.int8)
+
+    @staticmethod
+    def _position(starts, levels):
+        # Same rule as LevelIndex.position, for a whole array of levels
+        return np.maximum(np.searchsorted(starts, levels, side='right') - 1, 0)
+
+    def lookup(self, levels):
+        """(gridSize, timeLimit, difficulty code, extra min, extra max) arrays"""
+        i = self._position(self.starts, levels)
+        d = self._position(self.tier_starts, levels)
+        e = self._position(self.extra_starts, levels)
+        return self.grid_size[i], self.time_limit[i], self.tier_codes[d], self.extra_min[e], self.extra_max[e]
+
+    def forbidden_totals(self, lo, hi):
+        """(min, max) forbidden count the generator produces for levels lo..hi (hi None = open)"""
+        bands = [b for b in range(len(self.extra_starts))
+                 if (hi is None or self.extra_starts[b] <= hi)
+                 and (b + 1 == len(self.extra_starts) or self.extra_starts[b + 1] > lo)]
+        return (GRID_FORBIDDEN + int(self.extra_min[bands].min()),
+                GRID_FORBIDDEN + int(self.extra_max[bands].max()))
+
+
+class LevelBatch:
+    """
+    Structure-of-arrays for n levels of one mode
+    Per level: level, difficulty (index into DIFFICULTIES), grid_size,
+    time_limit, forbidden_count, forbidden_slots (the most forbidden
+    colors the rules allow at that level), safe_group. Per slot, padded
+    with -1: grid_colors (n, 4), tile_group / tile_variant / tile_id
+    (n, max gridSize) in shuffled order, and forbidden_group /
+    forbidden_variant (n, 6), grid groups first
+    """
+
+    def __init__(self, mode, **arrays):
+        self.mode = mode
+        self.__dict__.update(arrays)
+
+    def __len__(self):
+        return len(self.level)
+
+    def describe(self, i, groups):
+        """Level i as a DynamicLevel-shaped dict with group names"""
+        def name(g):
+            return groups[g]
+
+        tiles = [{"id": int(t), "colorGroup": name(g), "variantIndex": int(v)}
+                 for g, v, t in zip(self.tile_group[i], self.tile_variant[i], self.tile_id[i]) if g >= 0]
+        forbidden = [{"id": -(j + 1), "colorGroup": name(g), "variantIndex": int(v)}
+                     for j, (g, v) in enumerate(zip(self.forbidden_group[i], self.forbidden_variant[i])) if g >= 0]
+        safe = int(self.safe_group[i])
+        return {
+            "mode": self.mode,
+            "levelNumber": int(self.level[i]),
+            "difficulty": DIFFICULTIES[self.difficulty[i]],
+            "gridSize": int(self.grid_size[i]),
+            "timeLimit": round(float(self.time_limit[i]), 3),
+            "tiles": tiles,
+            "forbiddenColors": forbidden,
+            "safeColorGroup": name(safe) if safe >= 0 else None,
+        }
+
+
+class LevelEngine:
+    """Balance tables per mode plus the color groups of one skin"""
+
+    def __init__(self, balance_config, groups, variant_counts=None, modes=MODES):
+        if len(groups) < GRID_COLOR_COUNT:
+            raise ValueError(f"Need at least {GRID_COLOR_COUNT} color groups, got {len(groups)}")
+        self.groups = list(groups)
+        counts = variant_counts or {}
+        self.variant_counts = np.array([counts.get(g, VARIANTS_PER_GROUP) for g in self.groups], dtype=np.int16)
+        configured = balance_config["modes"]
+        self.tables = {mode: ModeTables(configured[mode]["levels"], DIFFICULTY_TIERS[mode],
+                                        EXTRA_FORBIDDEN_BANDS[mode])
+                       for mode in modes if mode in configured}
+
+    @classmethod
+    def from_project(cls, project_root=".", skin=None):
+        _, groups, counts = load_color_groups(project_root, skin)
+        return cls(load_balance_config(project_root), groups, counts)
+
+    def generate(self, mode, levels, rng):
+        """LevelBatch for an array of level numbers, drawing from rng"""
+        tables = self.tables[mode]
+        levels = np.asarray(levels, dtype=np.int32)
+        n = len(levels)
+        group_count = len(self.groups)
+        rows = np.arange(n)[:, None]
+        grid_size, time_limit, difficulty, extra_min, extra_max = tables.lookup(levels)
+
+        # One random permutation of the groups per level drives every group
+        # choice: its head fills the grid pattern, its tail is the pool of
+        # extra forbidden groups (groups not on the grid, already shuffled)
+        perm = np.argsort(rng.random((n, group_count)), axis=1).astype(np.int16)
+        grid_colors = np.take_along_axis(perm, GRID_PATTERNS[difficulty], axis=1)
+        distinct = DISTINCT_GRID_GROUPS[difficulty]
+
+        # generateTiles(): slot i gets grid color i % 4, then shuffle
+        width = int(grid_size.max()) if n else 0
+        slots = np.arange(width)
+        valid = slots < grid_size[:, None]
+        group_by_slot = grid_colors[:, slots % GRID_COLOR_COUNT]
+        variant_by_slot = rng.integers(0, VARIANTS_PER_GROUP, (n, width), dtype=np.int8)
+        keys = rng.random((n, width))
+        keys[~valid] = 2.0
+        order = np.argsort(keys, axis=1)
+        tile_group = np.where(valid, np.take_along_axis(group_by_slot, order, axis=1), -1).astype(np.int16)
+        tile_variant = np.where(valid, np.take_along_axis(variant_by_slot, order, axis=1), -1).astype(np.int8)
+        tile_id = np.where(valid, order, -1).astype(np.int16)
+
+        # selectForbiddenTiles() step 1: distinct grid groups, shuffled, take 3
+        heads = np.arange(GRID_COLOR_COUNT)
+        keys = rng.random((n, GRID_COLOR_COUNT))
+        keys[heads >= distinct[:, None]] = 2.0
+        shuffled = np.take_along_axis(perm[:, :GRID_COLOR_COUNT], np.argsort(keys, axis=1), axis=1)
+        grid_forbidden_count = np.minimum(distinct, GRID_FORBIDDEN)
+        grid_valid = np.arange(GRID_FORBIDDEN) < grid_forbidden_count[:, None]
+        grid_forbidden = np.where(grid_valid, shuffled[:, :GRID_FORBIDDEN], -1)
+        safe_group = np.where(distinct > GRID_FORBIDDEN, shuffled[:, GRID_FORBIDDEN], -1).astype(np.int16)
+        # Each takes the variant of the first tile of its group
+        first_tile = np.argmax(tile_group[:, None, :] == grid_forbidden[:, :, None], axis=2)
+        grid_variant = np.where(grid_valid, np.take_along_axis(tile_variant, first_tile, axis=1), -1)
+
+        # Step 2: extra groups off the grid, drawn from the level's band and
+        # capped at the pool of groups not on the grid
+        extra = rng.integers(extra_min, extra_max.astype(np.intp) + 1, dtype=np.intp)
+        extra = np.minimum(extra, group_count - distinct)
+        pool = np.minimum(distinct[:, None] + np.arange(MAX_EXTRA_FORBIDDEN), group_count - 1)
+        extra_valid = np.arange(MAX_EXTRA_FORBIDDEN) < extra[:, None]
+        extra_group = np.where(extra_valid, np.take_along_axis(perm, pool, axis=1), -1)
+        extra_variant = np.where(extra_valid, rng.integers(0, VARIANTS_PER_GROUP, (n, MAX_EXTRA_FORBIDDEN)), -1)
+
+        # Grid groups then extras, valid entries packed to the front
+        forbidden_valid = np.concatenate([grid_valid, extra_valid], axis=1)
+        pack = np.argsort(~forbidden_valid, axis=1, kind='stable')
+        forbidden_group = np.take_along_axis(np.concatenate([grid_forbidden, extra_group], axis=1), pack, axis=1)
+        forbidden_variant = np.take_along_axis(np.concatenate([grid_variant, extra_variant], axis=1), pack, axis=1)
+
+        return LevelBatch(
+            mode,
+            level=levels,
+            difficulty=difficulty,
+            grid_size=grid_size,
+            time_limit=time_limit,
+            grid_colors=grid_colors,
+            tile_group=tile_group,
+            tile_variant=tile_variant,
+            tile_id=tile_id,
+            forbidden_group=forbidden_group.astype(np.int16),
+            forbidden_variant=forbidden_variant.astype(np.int8),
+            forbidden_count=(grid_forbidden_count + extra).astype(np.int8),
+            forbidden_slots=(GRID_FORBIDDEN + extra_max).astype(np.int8),
+            safe_group=safe_group,
+        )
+
+    def config_warnings(self):
+        """
+        [(mode, message)] for balance_config.json ranges whose forbiddenCount
+        the generator never produces; the extra count comes from
+        getExtraForbiddenCount(), not from the config
+        """
+        warnings = []
+        for mode, tables in self.tables.items():
+            for lo, hi, params in zip(tables.index.starts, tables.index.ends, tables.index.params):
+                low, high = tables.forbidden_totals(lo, hi)
+                if not low <= params["forbiddenCount"] <= high:
+                    label = f"{lo}+" if hi is None else f"{lo}-{hi}"
+                    warnings.append((mode, f"range {label!r}: forbiddenCount {params['forbiddenCount']} "
+                                           f"outside the {low}-{high} the generator produces"))
+        return warnings
+
+    def _presence(self, group_slots):
+        """(n, groups) bool: which groups occur in each row of a padded slot array"""
+        n = group_slots.shape[0]
+        # -1 padding lands in the extra last column, which is dropped
+        present = np.zeros((n, len(self.groups) + 1), dtype=bool)
+        present[np.arange(n)[:, None], group_slots] = True
+        return present[:, :-1]
+
+    def check(self, batch):
+        """
+        Batch-wide invariants as {name: (n,) bool array, True = violated}
+        """
+        on_grid = self._presence(batch.tile_group)
+        forbidden = self._presence(batch.forbidden_group)
+        tiles = batch.tile_group >= 0
+        forbidden_slots = batch.forbidden_group >= 0
+
+        # Every grid-forbidden (group, variant) must be a tile the player sees
+        shown = (batch.tile_group[:, None, :] == batch.forbidden_group[:, :, None]) & \
+                (batch.tile_variant[:, None, :] == batch.forbidden_variant[:, :, None])
+        from_grid = np.take_along_axis(on_grid, np.maximum(batch.forbidden_group, 0), axis=1) & forbidden_slots
+        variant_limit = self.variant_counts[np.maximum(batch.tile_group, 0)]
+
+        return {
+            "tile count equals gridSize": tiles.sum(axis=1) != batch.grid_size,
+            "exactly one safe color": (on_grid & ~forbidden).sum(axis=1) != 1,
+            "safe color is on the grid and not forbidden":
+                (batch.safe_group < 0) | forbidden[np.arange(len(batch)), np.maximum(batch.safe_group, 0)],
+            "forbidden groups are distinct": forbidden.sum(axis=1) != batch.forbidden_count,
+            "extra forbidden count within its band":
+                (batch.forbidden_count - np.minimum(DISTINCT_GRID_GROUPS[batch.difficulty], GRID_FORBIDDEN)
+                 > batch.forbidden_slots - GRID_FORBIDDEN),
+            "grid-forbidden sample is a grid tile": (from_grid & ~shown.any(axis=2)).any(axis=1),
+            "tile variant exists in skin": (tiles & (batch.tile_variant >= variant_limit)).any(axis=1),
+        }
+
+
+def level_stream(levels, count, batch):
+    """Yield level-number arrays of at most batch items cycling through levels"""
+    levels = np.asarray(levels, dtype=np.int32)
+    for start in range(0, count, batch):
+        yield levels[np.arange(start, min(start + batch, count)) % len(levels)]
+
+
+def chunk_rng(seed, mode, chunk):
+    """Independent generator per (seed, mode, chunk); reruns are reproducible"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(MODES.index(mode), chunk)))
+
+
+def generate_levels(engine, mode, levels, count, seed=0, batch=DEFAULT_BATCH):
+    """Yield LevelBatches covering count levels of mode, cycling through levels"""
+    for chunk, level_numbers in enumerate(level_stream(levels, count, batch)):
+        yield engine.generate(mode, level_numbers, chunk_rng(seed, mode, chunk))
+
+
+def run(engine, modes, levels, count, seed=0, batch=DEFAULT_BATCH):
+    """
+    Generate and check count levels per mode
+    Returns {mode: {levels, seconds, violations: {name: {count, example}}}}
+    """
+    report = {}
+    for mode in modes:
+        started = time.perf_counter()
+        violations = {}
+        generated = 0
+        for level_batch in generate_levels(engine, mode, levels, count, seed, batch):
+            for name, failed in engine.check(level_batch).items():
+                entry = violations.setdefault(name, {"count": 0, "example": None})
+                hits = np.flatnonzero(failed)
+                entry["count"] += int(hits.size)
+                if hits.size and entry["example"] is None:
+                    entry["example"] = level_batch.describe(hits[0], engine.groups)
+            generated += len(level_batch)
+        report[mode] = {
+            "levels": generated,
+            "seconds": round(time.perf_counter() - started, 3),
+            "violations": violations,
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Level Engine")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Mode to generate (repeatable, default: all)")
+    parser.add_argument("--levels", default="1-200", help="Level range to cycle through, e.g. 1-200 (default: 1-200)")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Levels per mode (default: 1000000)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed (default: 0)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help=f"Levels per NumPy batch (default: {DEFAULT_BATCH})")
+    parser.add_argument("--skin", help="Skin whose color groups are used (default: game_config defaultSkin)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    lo, hi = parse_range(args.levels)
+    if hi is None:
+        parser.error("--levels needs an upper bound")
+    engine = LevelEngine.from_project(args.root, args.skin)
+    modes = args.mode or [mode for mode in MODES if mode in engine.tables]
+    report = run(engine, modes, np.arange(lo, hi + 1), args.count, args.seed, args.batch)
+
+    for mode, message in engine.config_warnings():
+        if mode in modes:
+            print(f"⚠ {mode}: {message}")
+
+    failed = False
+    for mode, result in report.items():
+        rate = result["levels"] / result["seconds"] if result["seconds"] else 0.0
+        print(f"{mode}: {result['levels']:,} levels in {result['seconds']:.2f} s ({rate:,.0f}/s)")
+        for name, entry in result["violations"].items():
+            if entry["count"]:
+                failed = True
+                share = entry["count"] / result["levels"]
+                example = entry["example"]
+                print(f"  ✗ {name}: {entry['count']:,} ({share:.1%}), "
+                      f"e.g. level {example['levelNumber']} ({example['difficulty']})")
+            else:
+                print(f"  ✓ {name}")
+
+    if args.json:
+        text = json.dumps({"seed": args.seed, "levels": args.levels, "modes": report}, indent=2)
+        if args.json == "-":
+            print(text)
+        else:
+            Path(args.json).write_text(text + "\n", encoding='utf-8')
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
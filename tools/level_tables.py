@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Level Table Generator
+Expands balance_config.json into dense per-level IntArray/FloatArray
+lookups and emits them as a Kotlin object, so the app reads level
+parameters in O(1) without parsing ranges at runtime.
+
+Usage:
+    python -m tools.level_tables [--root PATH] [--max-level 200] [--check]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+from tools.balance_config import MODES, load_balance_config, expand_mode
+
+OUTPUT_PATH = "app/src/main/java/com/colortrap/game/data/config/LevelTables.kt"
+PACKAGE = "com.colortrap.game.data.config"
+DEFAULT_MAX_LEVEL = 200
+VALUES_PER_LINE = 20
+
+
+def _kotlin_float(value):
+    text = repr(float(value))
+    return f"{text}f"
+
+
+def _array_literal(kind, values, indent="        "):
+    if kind == "Int":
+        items = [str(int(v)) for v in values]
+    else:
+        items = [_kotlin_float(v) for v in values]
+    lines = []
+    for i in range(0, len(items), VALUES_PER_LINE):
+        lines.append(indent + ", ".join(items[i:i + VALUES_PER_LINE]))
+    fn = "intArrayOf" if kind == "Int" else "floatArrayOf"
+    return f"{fn}(\n" + ",\n".join(lines) + f"\n    )"
+
+
+def render_kotlin(balance_config, max_level=DEFAULT_MAX_LEVEL):
+    """Render LevelTables.kt from a parsed balance_config.json"""
+    modes = balance_config["modes"]
+    default_mode = "NORMAL" if "NORMAL" in modes else next(iter(modes))
+
+    out = [
+        f"package {PACKAGE}",
+        "",
+        "import com.colortrap.game.data.models.GameMode",
+        "",
+        "// GENERATED by tools/level_tables.py from assets/config/balance_config.json",
+        "// Do not edit by hand; rerun the generator after changing the JSON.",
+        "",
+        "/**",
+        " * Precomputed level parameters, one array slot per level (index 0 = level 1).",
+        " * Levels above MAX_LEVEL use the MAX_LEVEL values.",
+        " */",
+        "object LevelTables {",
+        "",
+        f"    const val MAX_LEVEL = {max_level}",
+        "",
+    ]
+
+    for mode, mode_config in modes.items():
+        tables = expand_mode(mode_config["levels"], max_level)
+        out.append(f"    // ==================== {mode.replace('_', ' ')} MODE ====================")
+        out.append("")
+        out.append(f"    private val {mode}_GRID_SIZE = " + _array_literal("Int", tables["gridSize"]))
+        out.append("")
+        out.append(f"    private val {mode}_FORBIDDEN_COUNT = " + _array_literal("Int", tables["forbiddenCount"]))
+        out.append("")
+        out.append(f"    private val {mode}_TIME_LIMIT = " + _array_literal("Float", tables["timeLimit"]))
+        out.append("")
+
+    def accessor(name, kind, suffix):
+        lines = [
+            f"    fun {name}(mode: GameMode, level: Int): {kind} {{",
+            "        val index = level.coerceIn(1, MAX_LEVEL) - 1",
+            "        return when (mode) {",
+        ]
+        # One branch per GameMode value, no else: kotlinc flags it as redundant
+        for mode in MODES:
+            table = mode if mode in modes else default_mode
+            lines.append(f"            GameMode.{mode} -> {table}_{suffix}[index]")
+        lines.append("        }")
+        lines.append("    }")
+        return lines
+
+    out.append("    // ==================== LOOKUPS ====================")
+    out.append("")
+    out += accessor("gridSize", "Int", "GRID_SIZE")
+    out.append("")
+    out += accessor("forbiddenCount", "Int", "FORBIDDEN_COUNT")
+    out.append("")
+    out += accessor("timeLimit", "Float", "TIME_LIMIT")
+    out.append("}")
+    return "\n".join(out) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Level Table Generator")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--max-level", type=int, default=DEFAULT_MAX_LEVEL, help="Last level with its own table slot")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if LevelTables.kt is out of date instead of writing it")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    content = render_kotlin(load_balance_config(root), args.max_level)
+    output = root / OUTPUT_PATH
+
+    current = output.read_text(encoding='utf-8') if output.exists() else None
+    if args.check:
+        if current != content:
+            print(f"✗ {OUTPUT_PATH} is out of date; run python -m tools.level_tables")
+            return 1
+        print(f"✓ {OUTPUT_PATH} is up to date")
+        return 0
+
+    if current == content:
+        print(f"→ Unchanged: {OUTPUT_PATH}")
+        return 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    print(f"✓ Wrote {OUTPUT_PATH} ({args.max_level} levels x {len(load_balance_config(root)['modes'])} modes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
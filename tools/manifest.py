@@ -0,0 +1,111 @@
+"""
+ColorTrap - Generated Artifact Manifest
+Records the content hash of every generated file in .colortrap/manifest.json
+so reruns can skip identical outputs and detect hand-edited files
+"""
+
+import os
+import json
+import hashlib
+
+from tools.profiling import count, STAT
+
+MANIFEST_DIR = ".colortrap"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# check() results
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+DRIFT = "drift"
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Manifest:
+    """Content-hash manifest for generated artifacts, keyed by project-relative path"""
+
+    def __init__(self, project_root):
+        self.project_root = project_root
+        self.path = os.path.join(project_root, MANIFEST_DIR, MANIFEST_FILE)
+        self.artifacts = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.artifacts = data.get("artifacts", {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "artifacts": self.artifacts}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def check(self, rel_path, data):
+        """
+        Compare generated bytes against disk and the manifest record
+        Returns NEW, CHANGED, UNCHANGED or DRIFT (file was edited by hand)
+        """
+        return self.check_hash(rel_path, hash_bytes(data))
+
+    def check_hash(self, rel_path, new_hash):
+        """check() for output that is only known by its sha256 (streamed files)"""
+        full_path = os.path.join(self.project_root, rel_path)
+        record = self.artifacts.get(rel_path)
+
+        count(STAT)
+        try:
+            st = os.stat(full_path)
+        except FileNotFoundError:
+            return NEW
+
+        # Fast path: untouched since we wrote it and the output is the same
+        if (record and record["sha256"] == new_hash
+                and record.get("size") == st.st_size
+                and record.get("mtime_ns") == st.st_mtime_ns):
+            return UNCHANGED
+
+        disk_hash = hash_file(full_path)
+        if disk_hash == new_hash:
+            self._remember(rel_path, new_hash, st)
+            return UNCHANGED
+
+        if record and disk_hash != record["sha256"]:
+            return DRIFT
+
+        return CHANGED
+
+    def record(self, rel_path, data):
+        """Store the hash of bytes just written to rel_path"""
+        self.record_hash(rel_path, hash_bytes(data))
+
+    def record_hash(self, rel_path, sha256):
+        full_path = os.path.join(self.project_root, rel_path)
+        self._remember(rel_path, sha256, os.stat(full_path))
+
+    def _remember(self, rel_path, sha256, st):
+        entry = {"sha256": sha256, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        if self.artifacts.get(rel_path) != entry:
+            self.artifacts[rel_path] = entry
+            self.dirty = True
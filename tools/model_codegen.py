@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Compact Model Generator
+Renders tools/model_schema.py into Kotlin: value classes, Int-packed tiles,
+Long bitsets, IntArray-backed grids and plain structs with in-place setters.
+
+Usage:
+    python -m tools.model_codegen [--root PATH] [--check]
+"""
+
+import re
+import sys
+import argparse
+from pathlib import Path
+
+from tools import model_schema
+
+HEADER = """// GENERATED by tools/model_codegen.py from tools/model_schema.py
+// Do not edit by hand; change the schema and rerun the generator."""
+
+
+def upper_snake(name):
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).upper()
+
+
+def _to_int32(value):
+    value &= 0xFFFFFFFF
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def _file(schema, body, imports=()):
+    lines = [f"package {schema.PACKAGE}", ""]
+    if imports:
+        lines += [f"import {i}" for i in imports] + [""]
+    lines += [HEADER, "", body.rstrip("\n"), ""]
+    return "\n".join(lines)
+
+
+def _doc(text, indent=""):
+    return f"{indent}/**\n{indent} * {text}\n{indent} */"
+
+
+def _unwrap(schema, type_name, expr):
+    """Kotlin expression giving the raw Int of a field value"""
+    for vc in schema.VALUE_CLASSES:
+        if vc["name"] == type_name:
+            return f"{expr}.{vc['field']}"
+    return expr
+
+
+def packed_layout(model):
+    """[(name, shift, width, type)] with low bits first"""
+    layout = []
+    shift = 0
+    for name, width, type_name in model["fields"]:
+        layout.append((name, shift, width, type_name))
+        shift += width
+    return layout
+
+
+def render_value_class(schema, vc):
+    body = [
+        _doc(vc["doc"]),
+        "@JvmInline",
+        f"value class {vc['name']}(val {vc['field']}: {vc['type']})",
+    ]
+    return _file(schema, "\n".join(body))
+
+
+def render_packed(schema, model):
+    name = model["name"]
+    layout = packed_layout(model)
+    out = [_doc(model["doc"]), "@JvmInline", f"value class {name}(val bits: Int) {{", ""]
+
+    signed = model.get("signed", ())
+    for field, shift, width, type_name in layout:
+        mask = f"0x{(1 << width) - 1:X}"
+        raw = f"(bits ushr {shift}) and {mask}"
+        if field in signed:
+            # Move the field to the top bits, then shift back arithmetically
+            left = 32 - shift - width
+            raw = f"{f'(bits shl {left})' if left else 'bits'} shr {32 - width}"
+        value = raw if type_name == "Int" else f"{type_name}({raw})"
+        out.append(f"    val {field}: {type_name} get() = {value}")
+    out.append("")
+
+    for field, shift, width, type_name in layout:
+        mask = f"0x{(1 << width) - 1:X}"
+        const = f"{upper_snake(field)}_MASK"
+        out.append(f"    fun with{field[0].upper()}{field[1:]}(value: {type_name}): {name} =")
+        out.append(f"        {name}((bits and {const}.inv()) or (({_unwrap(schema, type_name, 'value')} and {mask}) shl {shift}))")
+        out.append("")
+
+    out.append("    companion object {")
+    for field, shift, width, type_name in layout:
+        out.append(f"        const val {upper_snake(field)}_SHIFT = {shift}")
+        out.append(f"        const val {upper_snake(field)}_MASK = {_to_int32(((1 << width) - 1) << shift)}")
+    out.append("")
+    params = ", ".join(f"{field}: {type_name}" for field, _, _, type_name in layout)
+    packs = " or\n                ".join(
+        f"(({_unwrap(schema, type_name, field)} and 0x{(1 << width) - 1:X}) shl {shift})"
+        for field, shift, width, type_name in layout
+    )
+    out.append(f"        fun of({params}): {name} = {name}(")
+    out.append(f"            {packs}")
+    out.append("        )")
+    out.append("    }")
+    out.append("}")
+    return _file(schema, "\n".join(out))
+
+
+def render_bitset(schema, model):
+    name = model["name"]
+    element = model["element"]
+    raw = _unwrap(schema, element, "id")
+    body = f"""{_doc(model["doc"])}
+@JvmInline
+value class {name}(val bits: Long) {{
+
+    operator fun contains(id: {element}): Boolean = bits and bit(id) != 0L
+
+    operator fun plus(id: {element}): {name} = {name}(bits or bit(id))
+
+    operator fun minus(id: {element}): {name} = {name}(bits and bit(id).inv())
+
+    val size: Int get() = bits.countOneBits()
+
+    fun isEmpty(): Boolean = bits == 0L
+
+    inline fun forEach(action: ({element}) -> Unit) {{
+        var rest = bits
+        while (rest != 0L) {{
+            action({element}(rest.countTrailingZeroBits()))
+            rest = rest and (rest - 1)
+        }}
+    }}
+
+    companion object {{
+        const val CAPACITY = {model["capacity"]}
+        val EMPTY = {name}(0L)
+
+        // shl masks its count to 6 bits, so larger ids would alias to 0..63
+        private fun bit(id: {element}): Long {{
+            require({raw} in 0 until CAPACITY) {{ "{element} ${{{raw}}} outside 0 until $CAPACITY" }}
+            return 1L shl {raw}
+        }}
+    }}
+}}
+"""
+    return _file(schema, body)
+
+
+def render_grid(schema, model):
+    name = model["name"]
+    element = model["element"]
+    bitset = model["bitset"]
+    field = model["bitset_field"]
+    body = f"""{_doc(model["doc"])}
+class {name}(val cells: IntArray) {{
+
+    constructor(size: Int) : this(IntArray(size))
+
+    val size: Int get() = cells.size
+
+    operator fun get(index: Int): {element} = {element}(cells[index])
+
+    operator fun set(index: Int, value: {element}) {{
+        cells[index] = value.bits
+    }}
+
+    fun shuffleInPlace(random: kotlin.random.Random) {{
+        for (i in cells.size - 1 downTo 1) {{
+            val j = random.nextInt(i + 1)
+            val tmp = cells[i]
+            cells[i] = cells[j]
+            cells[j] = tmp
+        }}
+    }}
+
+    fun {field}s(): {bitset} {{
+        var set = {bitset}.EMPTY
+        for (cell in cells) set += {element}(cell).{field}
+        return set
+    }}
+
+    fun copyOf(): {name} = {name}(cells.copyOf())
+}}
+"""
+    return _file(schema, body)
+
+
+def render_struct(schema, model):
+    name = model["name"]
+    keyword = "var" if model["mutable"] else "val"
+    out = [_doc(model["doc"]), f"class {name}("]
+    params = []
+    for field, type_name, default in model["fields"]:
+        param = f"    {keyword} {field}: {type_name}"
+        if default is not None:
+            param += f" = {default}"
+        params.append(param)
+    out.append(",\n".join(params))
+    out.append(") {")
+    header_end = len(out)
+
+    flags = model.get("flags")
+    if flags:
+        for flag in flags["names"]:
+            const = f"FLAG_{upper_snake(flag)}"
+            out.append("")
+            out.append(f"    var {flag}: Boolean")
+            out.append(f"        get() = {flags['field']} and {const} != 0")
+            out.append("        set(value) {")
+            out.append(f"            {flags['field']} = if (value) {flags['field']} or {const} else {flags['field']} and {const}.inv()")
+            out.append("        }")
+
+    counters = model.get("counters")
+    if counters:
+        cap = counters["name"][0].upper() + counters["name"][1:]
+        arr = counters["field"]
+        enum = counters["enum"]
+        out.append("")
+        out.append(f"    fun {counters['name']}Count(type: {enum}): Int = {arr}[type.ordinal]")
+        out.append("")
+        out.append(f"    fun set{cap}Count(type: {enum}, count: Int) {{")
+        out.append(f"        {arr}[type.ordinal] = count")
+        out.append("    }")
+        out.append("")
+        out.append(f"    fun add{cap}(type: {enum}, delta: Int = 1) {{")
+        out.append(f"        {arr}[type.ordinal] += delta")
+        out.append("    }")
+
+    if flags:
+        out.append("")
+        out.append("    companion object {")
+        for i, flag in enumerate(flags["names"]):
+            out.append(f"        const val FLAG_{upper_snake(flag)} = 1 shl {i}")
+        out.append("    }")
+
+    if len(out) == header_end:
+        # No members: no empty body
+        out[-1] = ")"
+    else:
+        out.append("}")
+    return _file(schema, "\n".join(out), model.get("imports", ()))
+
+
+def render_all(schema=model_schema):
+    """{relative output path: Kotlin source} for every model in the schema"""
+    files = {}
+
+    def add(model_name, source):
+        files[f"{schema.OUTPUT_DIR}/{model_name}.kt"] = source
+
+    for vc in schema.VALUE_CLASSES:
+        add(vc["name"], render_value_class(schema, vc))
+    for model in schema.PACKED:
+        if sum(width for _, width, _ in model["fields"]) > 32:
+            raise ValueError(f"{model['name']} needs more than 32 bits")
+        add(model["name"], render_packed(schema, model))
+    for model in schema.BITSETS:
+        if model["capacity"] > 64:
+            raise ValueError(f"{model['name']} capacity exceeds a Long")
+        add(model["name"], render_bitset(schema, model))
+    for model in schema.GRIDS:
+        add(model["name"], render_grid(schema, model))
+    for model in schema.STRUCTS:
+        add(model["name"], render_struct(schema, model))
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Compact Model Generator")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if generated models are out of date instead of writing them")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    stale = []
+    for rel_path, content in render_all().items():
+        path = root / rel_path
+        current = path.read_text(encoding='utf-8') if path.exists() else None
+        if current == content:
+            continue
+        stale.append(rel_path)
+        if not args.check:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(content)
+            print(f"✓ Wrote {rel_path}")
+
+    if args.check and stale:
+        for rel_path in stale:
+            print(f"✗ Out of date: {rel_path}")
+        return 1
+    if not stale:
+        print("✓ Compact models are up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
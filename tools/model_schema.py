@@ -0,0 +1,104 @@
+"""
+ColorTrap - Compact Model Schema
+Declarative description of the packed Kotlin data models generated by
+tools/model_codegen.py. Edit this file, then rerun the generator.
+"""
+
+PACKAGE = "com.colortrap.game.data.models.compact"
+OUTPUT_DIR = "app/src/main/java/com/colortrap/game/data/models/compact"
+
+# Single-Int wrappers
+VALUE_CLASSES = [
+    {
+        "name": "ColorId",
+        "doc": "Index of a color group in the active skin's group list",
+        "field": "raw",
+        "type": "Int",
+    },
+]
+
+# Several small fields packed into one Int, low bits first
+PACKED = [
+    {
+        "name": "CompactTile",
+        "doc": "One tile packed into an Int (replaces DynamicTile's object per cell); "
+               "id is -128..127: grid position, or -1, -2, ... for forbidden tiles",
+        "fields": [
+            ("colorId", 16, "ColorId"),
+            ("variant", 8, "Int"),
+            ("id", 8, "Int"),  # position in the grid, negative for forbidden tiles
+        ],
+        # Read back with sign extension
+        "signed": ["id"],
+    },
+]
+
+# Sets of small ids stored as one Long
+BITSETS = [
+    {
+        "name": "ColorSet",
+        "doc": "Set of color groups (e.g. the forbidden colors of a level)",
+        "element": "ColorId",
+        "capacity": 64,
+    },
+]
+
+# Arrays of packed values backed by a primitive array
+GRIDS = [
+    {
+        "name": "TileGrid",
+        "doc": "Level tiles stored in one IntArray",
+        "element": "CompactTile",
+        "bitset": "ColorSet",
+        "bitset_field": "colorId",
+    },
+]
+
+# Plain classes; mutable ones get in-place setters instead of copy()
+STRUCTS = [
+    {
+        "name": "CompactLevel",
+        "doc": "Level data without per-tile objects (compact DynamicLevel)",
+        "mutable": False,
+        "imports": ["com.colortrap.game.data.models.DifficultyLevel"],
+        "fields": [
+            ("levelNumber", "Int", None),
+            ("gridSize", "Int", None),
+            ("tiles", "TileGrid", None),
+            ("forbiddenTiles", "TileGrid", None),
+            ("forbiddenColors", "ColorSet", None),
+            ("timeLimit", "Float", None),
+            ("difficulty", "DifficultyLevel", None),
+        ],
+    },
+    {
+        "name": "CompactGameState",
+        "doc": "Mutable game state with bit flags and per-item counters (compact DynamicGameState)",
+        "mutable": True,
+        "imports": [
+            "com.colortrap.game.data.models.GameMode",
+            "com.colortrap.game.data.models.ItemType",
+        ],
+        "fields": [
+            ("mode", "GameMode", "GameMode.NORMAL"),
+            ("currentLevel", "Int", "1"),
+            ("score", "Int", "0"),
+            ("coins", "Int", "0"),
+            ("lives", "Int", "3"),
+            ("timeRemaining", "Float", "5f"),
+            ("flags", "Int", "0"),
+            ("level", "CompactLevel?", "null"),
+            ("items", "IntArray", "IntArray(ItemType.values().size)"),
+            ("consecutiveCorrect", "Int", "0"),
+        ],
+        "flags": {
+            "field": "flags",
+            "names": ["isPlaying", "isPaused", "isGameOver", "activeShield", "slowTimeActive"],
+        },
+        "counters": {
+            "field": "items",
+            "enum": "ItemType",
+            "name": "item",
+        },
+    },
+]
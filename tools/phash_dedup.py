@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Near-Duplicate Asset Scanner
+Computes a perceptual signature for every image in one streaming pass
+(64-bit aHash + 64-bit dHash on grayscale, plus the mean color so
+differently colored tiles of the same shape stay apart), indexes them
+in a BK-tree and reports clusters of near-duplicates with a suggested
+file to keep. Signatures are cached by content hash.
+
+Usage:
+    python -m tools.phash_dedup [--root PATH] [--include-res] [--bits 6] [--color-tol 2] [--json PATH] [--fail]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from tools.assets import ASSETS_ROOT, RES_ROOT, is_image, iter_files
+from tools.asset_cache import HashCache
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed by the asset tooling
+    Image = None
+
+SIGNATURE_CACHE_PATH = ".colortrap/phash_cache.json"
+DEFAULT_BITS = 6
+# Tiles are mostly flat shapes whose shades differ by a few levels, so the
+# color tolerance is far tighter than the hash tolerance
+DEFAULT_COLOR_TOL = 2
+
+
+def signature(path):
+    """(ahash, dhash, (r, g, b) mean over visible pixels) for one image"""
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        small = img.resize((9, 8), Image.Resampling.BOX)
+        gray = small.convert("L")
+        tiny = img.resize((8, 8), Image.Resampling.BOX)
+
+    g = gray.tobytes()
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            dhash = (dhash << 1) | (g[row * 9 + col] > g[row * 9 + col + 1])
+
+    t = tiny.convert("L").tobytes()
+    avg = sum(t) / 64
+    ahash = 0
+    for v in t:
+        ahash = (ahash << 1) | (v > avg)
+
+    px = tiny.tobytes()
+    alpha = sum(px[3::4]) or 1
+    mean = tuple(round(sum(v * a for v, a in zip(px[c::4], px[3::4])) / alpha) for c in range(3))
+    return ahash, dhash, mean
+
+
+def hash_bits(a, b):
+    """Hamming(aHash) + Hamming(dHash)"""
+    return bin(a[0] ^ b[0]).count("1") + bin(a[1] ^ b[1]).count("1")
+
+
+def color_diff(a, b):
+    """Chebyshev distance between the mean colors, in 0-255 levels"""
+    return max(abs(x - y) for x, y in zip(a[2], b[2]))
+
+
+def distance(a, b):
+    """BK-tree metric: a sum of two metrics, so pruning stays exact"""
+    return hash_bits(a, b) + color_diff(a, b)
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer-metric keys; items are (key, value)"""
+
+    def __init__(self, metric):
+        self.metric = metric
+        self.root = None
+        self.size = 0
+
+    def add(self, key, value):
+        self.size += 1
+        node = [key, [value], {}]
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            d = self.metric(key, current[0])
+            if d == 0:
+                # Identical signature: share the node
+                current[1].append(value)
+                return
+            child = current[2].get(d)
+            if child is None:
+                current[2][d] = node
+                return
+            current = child
+
+    def query(self, key, radius):
+        """[(distance, value)] for every item within radius of key"""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_key, values, children = stack.pop()
+            d = self.metric(key, node_key)
+            if d <= radius:
+                found.extend((d, v) for v in values)
+            for child_d, child in children.items():
+                if d - radius <= child_d <= d + radius:
+                    stack.append(child)
+        return found
+
+
+def _resource_identity(rel_path):
+    """res/mipmap-hdpi/ic_launcher.png -> ('mipmap', 'ic_launcher'); None outside res/"""
+    if not rel_path.startswith(RES_ROOT + "/"):
+        return None
+    parts = rel_path[len(RES_ROOT) + 1:].split("/")
+    if len(parts) != 2:
+        return None
+    return parts[0].split("-")[0], os.path.splitext(parts[1])[0]
+
+
+def _load_cache(root):
+    try:
+        with open(root / SIGNATURE_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(root, cache):
+    path = root / SIGNATURE_CACHE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _key(sig):
+    return sig[0], sig[1], tuple(sig[2])
+
+
+def scan(root, tops, bits=DEFAULT_BITS, color_tol=DEFAULT_COLOR_TOL):
+    """
+    Hash every image under tops, inserting into the BK-tree as we go
+    Returns (clusters, files scanned, images decoded); each cluster is a
+    list of {path, bytes, sha256, bits, color, exact} with the suggested
+    keeper first; a pair is near-duplicate when both tolerances hold
+    """
+    hashes = HashCache(root)
+    old_cache = _load_cache(root)
+    cache = {}
+    tree = BKTree(distance)
+    parent = {}
+    files = {}
+    decoded = 0
+
+    def find(p):
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    for top in tops:
+        for rel, entry in iter_files(root, top):
+            if not is_image(entry.name):
+                continue
+            st = entry.stat()
+            sha256 = hashes.digest(rel, st)
+            sig = cache.get(sha256) or old_cache.get(sha256)
+            if sig is None:
+                sig = list(signature(entry.path))
+                decoded += 1
+            cache[sha256] = sig
+            key = _key(sig)
+
+            files[rel] = {"path": rel, "bytes": st.st_size, "sha256": sha256}
+            parent[rel] = rel
+            identity = _resource_identity(rel)
+            # Query before inserting: each pair is seen exactly once
+            for _, (other_key, other) in tree.query(key, bits + color_tol):
+                if hash_bits(key, other_key) > bits or color_diff(key, other_key) > color_tol:
+                    continue
+                if identity is not None and identity == _resource_identity(other):
+                    continue  # same resource at another density
+                parent[find(rel)] = find(other)
+            tree.add(key, (key, rel))
+
+    hashes.save()
+    _save_cache(root, cache)
+
+    groups = {}
+    for rel in files:
+        groups.setdefault(find(rel), []).append(files[rel])
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        # Keep the smallest file; ties go to the first path in name order
+        members.sort(key=lambda m: (m["bytes"], m["path"]))
+        keeper = members[0]
+        k = _key(cache[keeper["sha256"]])
+        for m in members:
+            other = _key(cache[m["sha256"]])
+            m["bits"] = hash_bits(k, other)
+            m["color"] = color_diff(k, other)
+            m["exact"] = m["sha256"] == keeper["sha256"]
+        clusters.append(members)
+    clusters.sort(key=lambda c: (-sum(m["bytes"] for m in c[1:]), c[0]["path"]))
+    return clusters, len(files), decoded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Near-Duplicate Asset Scanner")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--include-res", action="store_true", help="Also scan app/src/main/res (density variants are not reported)")
+    parser.add_argument("--bits", type=int, default=DEFAULT_BITS, help="Max differing aHash + dHash bits (default: 6)")
+    parser.add_argument("--color-tol", type=int, default=DEFAULT_COLOR_TOL, help="Max mean color difference in 0-255 levels (default: 2)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the clusters as JSON")
+    parser.add_argument("--fail", action="store_true", help="Exit 1 when any cluster is found (CI)")
+    args = parser.parse_args(argv)
+    if Image is None:
+        raise SystemExit("✗ Pillow is required: pip install -r tools/requirements.txt")
+
+    root = Path(args.root)
+    tops = [ASSETS_ROOT] + ([RES_ROOT] if args.include_res else [])
+    clusters, scanned, decoded = scan(root, tops, args.bits, args.color_tol)
+    reclaimable = sum(m["bytes"] for c in clusters for m in c[1:])
+
+    for cluster in clusters:
+        keeper, dupes = cluster[0], cluster[1:]
+        print(f"\n● keep {keeper['path']} ({keeper['bytes']:,} B)")
+        for m in dupes:
+            kind = "exact" if m["exact"] else f"{m['bits']} bits, Δcolor {m['color']}"
+            print(f"  ↳ {m['path']} ({m['bytes']:,} B, {kind})")
+
+    mark = "✓" if not clusters else "⚠"
+    print(f"\n{mark} {scanned} images ({decoded} decoded): {len(clusters)} clusters, "
+          f"{sum(len(c) - 1 for c in clusters)} dedup targets, {reclaimable:,} B reclaimable")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"bits": args.bits, "colorTol": args.color_tol, "clusters": clusters}, f, indent=2)
+    return 1 if clusters and args.fail else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
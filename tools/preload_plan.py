@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Screen Preload Plan
+Scans the Kotlin sources under ui/screens for asset references (string
+paths, string constants, R.drawable/mipmap/raw/font ids) and skin tile
+loads, orders screens by the navigation graph, and writes
+assets/config/preload_manifest.json: per screen, the assets it is the
+first to use, in first-use order. The splash phase warms the "preload"
+list: the images of every screen up to and including the first one that
+generates a level, prioritised and capped at half the DynamicSkinManager
+bitmap cache so warming never evicts the rest of it.
+
+Usage:
+    python -m tools.preload_plan [--root PATH] [--budget N] [--check]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from tools.assets import ASSETS_ROOT, RES_ROOT, SKINS_DIR, is_image, iter_skin_variants
+from tools.spec_compiler import load_compiled
+
+OUTPUT_PATH = f"{ASSETS_ROOT}/config/preload_manifest.json"
+MANIFEST_VERSION = 2
+NAV_GRAPH = "ui/navigation/AppNavGraph.kt"
+SCREENS_DIR = "ui/screens"
+LEVEL_GENERATOR = "domain/DynamicLevelGenerator.kt"
+ASSET_SCANNER = "utils/DynamicAssetScanner.kt"
+SKIN_MANAGER = "domain/DynamicSkinManager.kt"
+# DynamicSkinManager.MAX_CACHE_SIZE when the source cannot be read
+DEFAULT_CACHE_SIZE = 50
+
+_CONST = re.compile(r'\bconst\s+val\s+(\w+)\s*(?::\s*String\s*)?=\s*"([^"$]*)"')
+_STRING = re.compile(r'"([^"$\\]+)"')
+_RES_ID = re.compile(r'\bR\.(drawable|mipmap|raw|font)\.(\w+)')
+_TILE_LOAD = re.compile(r'\bloadTileBitmap(?:Sync)?\(\s*([^,()]+)\s*,\s*([^,()]+?)\s*\)')
+_VARIANT_RANGE = re.compile(r'variantIndex\s*=\s*\((\d+)\.\.(\d+)\)\.random\(\)')
+_COMPOSABLE = re.compile(r'composable\(\s*route\s*=\s*Screen\.(\w+)\.route')
+_NAVIGATE = re.compile(r'navigate\(\s*Screen\.(\w+)\.')
+_START = re.compile(r'startDestination\s*=\s*Screen\.(\w+)\.route')
+_SCREEN_CALL = re.compile(r'^\s*(\w+Screen)\(', re.M)
+_SCREEN_IMPORT = re.compile(r'import\s+[\w.]+\.ui\.screens\.(\w+)\.(\w+)')
+_CACHE_SIZE = re.compile(r'\bMAX_CACHE_SIZE\s*=\s*(\d+)')
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _line_of(text, offset):
+    return text.count("\n", 0, offset) + 1
+
+
+def parse_nav_graph(source):
+    """
+    Returns (screens in BFS order from startDestination, {route name: Composable})
+    Routes never reached from the start are not included
+    """
+    blocks = list(_COMPOSABLE.finditer(source))
+    composables = {}
+    edges = {}
+    for i, match in enumerate(blocks):
+        end = blocks[i + 1].start() if i + 1 < len(blocks) else len(source)
+        body = source[match.end():end]
+        call = _SCREEN_CALL.search(body)
+        if call:
+            composables[match.group(1)] = call.group(1)
+        edges[match.group(1)] = [m.group(1) for m in _NAVIGATE.finditer(body)]
+
+    start = _START.search(source)
+    order = []
+    queue = [start.group(1)] if start else list(edges)[:1]
+    while queue:
+        route = queue.pop(0)
+        if route in order:
+            continue
+        order.append(route)
+        queue.extend(r for r in edges.get(route, []) if r not in order)
+    return order, composables
+
+
+def string_constants(kotlin_base):
+    """{NAME: value} for every `const val NAME = "..."` in the app sources"""
+    constants = {}
+    for dirpath, _, filenames in os.walk(kotlin_base):
+        for name in filenames:
+            if name.endswith(".kt"):
+                for match in _CONST.finditer(_read(os.path.join(dirpath, name))):
+                    constants.setdefault(match.group(1), match.group(2))
+    return constants
+
+
+class AssetResolver:
+    """Maps Kotlin strings and resource ids to files that exist in the tree"""
+
+    def __init__(self, root):
+        self.root = os.fspath(root)
+        self.assets_base = os.path.join(self.root, ASSETS_ROOT)
+        self.by_basename = {}
+        for dirpath, _, filenames in os.walk(self.assets_base):
+            rel_dir = os.path.relpath(dirpath, self.assets_base).replace(os.sep, "/")
+            if rel_dir == SKINS_DIR or rel_dir.startswith(SKINS_DIR + "/"):
+                continue
+            for name in filenames:
+                rel = name if rel_dir == "." else f"{rel_dir}/{name}"
+                self.by_basename.setdefault(name, []).append(rel)
+
+    def asset(self, value):
+        """Asset-relative path for a string, or None"""
+        if not value or value.startswith("/") or " " in value:
+            return None
+        if os.path.isfile(os.path.join(self.assets_base, value)):
+            return value
+        candidates = self.by_basename.get(value, [])
+        return candidates[0] if len(candidates) == 1 else None
+
+    def resource(self, res_type, name):
+        """True when res/<type>[-qualifiers]/<name>.* exists"""
+        base = os.path.join(self.root, RES_ROOT)
+        try:
+            folders = [d for d in os.listdir(base) if d == res_type or d.startswith(res_type + "-")]
+        except FileNotFoundError:
+            return False
+        return any(os.path.splitext(f)[0] == name
+                   for d in folders for f in os.listdir(os.path.join(base, d)))
+
+
+def variant_range(generator_source):
+    """Variant indices the level generator can pick, e.g. (0..2).random() -> [0, 1, 2]"""
+    indices = set()
+    for match in _VARIANT_RANGE.finditer(generator_source):
+        indices.update(range(int(match.group(1)), int(match.group(2)) + 1))
+    return sorted(indices)
+
+
+def _screen_files(screen_dir):
+    """*Screen.kt first, then *ViewModel.kt, then the rest (name order within each)"""
+    names = sorted(n for n in os.listdir(screen_dir) if n.endswith(".kt"))
+    rank = lambda n: (0 if n.endswith("Screen.kt") else 1 if n.endswith("ViewModel.kt") else 2, n)
+    return [os.path.join(screen_dir, n) for n in sorted(names, key=rank)]
+
+
+def scan_screen(screen_dir, resolver, constants, skin_tiles, level_variants):
+    """
+    References in first-use order: [(kind, value, source)]
+    kind is 'asset' (assets-relative path), 'resource' ('drawable/name') or
+    'missing' (a resource id with no file)
+    """
+    refs = []
+    generates_level = False
+    for path in _screen_files(screen_dir):
+        source = _read(path)
+        rel_source = os.path.basename(path)
+        generates_level = generates_level or "generateLevel(" in source
+        found = []
+
+        for match in _STRING.finditer(source):
+            asset = resolver.asset(match.group(1))
+            if asset:
+                found.append((match.start(), "asset", asset))
+        for name, value in constants.items():
+            asset = resolver.asset(value)
+            if asset:
+                for match in re.finditer(rf'\b{name}\b', source):
+                    found.append((match.start(), "asset", asset))
+        for match in _RES_ID.finditer(source):
+            value = f"{match.group(1)}/{match.group(2)}"
+            kind = "resource" if resolver.resource(match.group(1), match.group(2)) else "missing"
+            found.append((match.start(), kind, value))
+        for match in _TILE_LOAD.finditer(source):
+            index = match.group(2)
+            indices = [int(index)] if index.isdigit() else level_variants
+            # Group-major: every wanted variant of the first group, then the next
+            for group, variants in skin_tiles:
+                for i in indices:
+                    if i < len(variants):
+                        found.append((match.start(), "asset", variants[i]))
+
+        for offset, kind, value in sorted(found, key=lambda f: f[0]):
+            refs.append((kind, value, f"{rel_source}:{_line_of(source, offset)}"))
+    return refs, generates_level
+
+
+def cache_size(kotlin_base):
+    """DynamicSkinManager.MAX_CACHE_SIZE, the bitmap cache preloading fills"""
+    try:
+        match = _CACHE_SIZE.search(_read(os.path.join(kotlin_base, SKIN_MANAGER)))
+    except FileNotFoundError:
+        match = None
+    return int(match.group(1)) if match else DEFAULT_CACHE_SIZE
+
+
+def preload_list(screens, first_level_screen, skin_tiles, budget):
+    """
+    Images to warm on splash, at most budget of them: screen images first,
+    in first-use order, then tiles variant-major (every group's first
+    variant before any second), so a truncated list still covers every group
+    Returns (paths, number of images left to load on demand)
+    """
+    tile_rank = {path: (i, g) for g, (_, variants) in enumerate(skin_tiles) for i, path in enumerate(variants)}
+    images = []
+    for screen in screens:
+        images += [a for a in screen["assets"] if is_image(a)]
+        if screen["screen"] == first_level_screen:
+            break
+    others = [a for a in images if a not in tile_rank]
+    tiles = sorted((a for a in images if a in tile_rank), key=tile_rank.get)
+    ordered = others + tiles
+    return ordered[:budget], max(len(ordered) - budget, 0)
+
+
+def build_manifest(root, budget=None):
+    """budget: images in the preload list (default: half the bitmap cache)"""
+    spec = load_compiled(root)
+    kotlin_base = os.path.join(os.fspath(root), spec["kotlin_base"])
+    nav_source = _read(os.path.join(kotlin_base, NAV_GRAPH))
+    routes, composables = parse_nav_graph(nav_source)
+
+    # Composable name -> screens/<dir>, from the nav graph imports
+    screen_dirs = {m.group(2): m.group(1) for m in _SCREEN_IMPORT.finditer(nav_source)}
+    screens_base = os.path.join(kotlin_base, SCREENS_DIR)
+    all_dirs = sorted(d for d in os.listdir(screens_base) if os.path.isdir(os.path.join(screens_base, d)))
+
+    ordered = []
+    for route in routes:
+        folder = screen_dirs.get(composables.get(route))
+        if folder and folder not in [f for _, f, _ in ordered]:
+            ordered.append((route, folder, True))
+    for folder in all_dirs:
+        if folder not in [f for _, f, _ in ordered]:
+            ordered.append((folder, folder, False))
+
+    constants = string_constants(kotlin_base)
+    # Tiles resolve through DynamicAssetScanner.SKINS_PATH ("skins/<skin>")
+    scanner_consts = dict(_CONST.findall(_read(os.path.join(kotlin_base, ASSET_SCANNER))))
+    skin = scanner_consts.get("SKINS_PATH", f"{SKINS_DIR}/color").split("/")[-1]
+    skin_tiles = {}
+    for _, group, entry in iter_skin_variants(root, [skin]):
+        skin_tiles.setdefault(group, []).append(f"{SKINS_DIR}/{skin}/{group}/{entry.name}")
+    skin_tiles = sorted(skin_tiles.items())
+    level_variants = variant_range(_read(os.path.join(kotlin_base, LEVEL_GENERATOR)))
+
+    resolver = AssetResolver(root)
+    seen = set()
+    screens = []
+    first_level_screen = None
+    for route, folder, routed in ordered:
+        refs, generates_level = scan_screen(os.path.join(screens_base, folder), resolver,
+                                            constants, skin_tiles, level_variants)
+        entry = {"screen": route, "dir": folder, "routed": routed,
+                 "assets": [], "images": 0, "resources": [], "missing": []}
+        for kind, value, source in refs:
+            if (kind, value) in seen:
+                continue
+            seen.add((kind, value))
+            bucket = {"asset": "assets", "resource": "resources", "missing": "missing"}[kind]
+            entry[bucket].append(value)
+            if kind == "asset" and is_image(value):
+                entry["images"] += 1
+        if generates_level and routed and first_level_screen is None:
+            first_level_screen = route
+        screens.append(entry)
+
+    cache = cache_size(kotlin_base)
+    budget = cache // 2 if budget is None else min(budget, cache)
+    preload, dropped = preload_list(screens, first_level_screen, skin_tiles, budget)
+
+    return {
+        "version": MANIFEST_VERSION,
+        "startScreen": routes[0] if routes else None,
+        "firstLevelScreen": first_level_screen,
+        "preload": {"cacheSize": cache, "budget": budget, "assets": preload, "onDemand": dropped},
+        "screens": screens,
+    }
+
+
+def render_manifest(manifest):
+    return json.dumps(manifest, indent=2) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Screen Preload Plan")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--budget", type=int, default=None,
+                        help="Images to preload, at most the bitmap cache size (default: half of it)")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 if preload_manifest.json is out of date or its preload list exceeds the cache")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    manifest = build_manifest(root, args.budget)
+    content = render_manifest(manifest)
+    output = root / OUTPUT_PATH
+    current = output.read_text(encoding='utf-8') if output.exists() else None
+
+    for screen in manifest["screens"]:
+        flag = "" if screen["routed"] else " (not in nav graph)"
+        print(f"→ {screen['screen']}{flag}: {len(screen['assets'])} assets "
+              f"({screen['images']} images), {len(screen['resources'])} resources")
+        for missing in screen["missing"]:
+            print(f"  ⚠ R.{missing.replace('/', '.')} has no file under res/")
+    preload = manifest["preload"]
+    summary = (f"first level: {manifest['firstLevelScreen']}, preload {len(preload['assets'])}"
+               f"/{preload['cacheSize']} cache slots")
+    if preload["onDemand"]:
+        print(f"⚠ {preload['onDemand']} images up to {manifest['firstLevelScreen']} exceed the preload "
+              f"budget of {preload['budget']} and load on demand")
+
+    if args.check:
+        try:
+            on_disk = json.loads(current)["preload"]["assets"] if current else []
+        except (ValueError, KeyError, TypeError):
+            on_disk = []
+        if len(on_disk) > preload["cacheSize"]:
+            print(f"✗ {OUTPUT_PATH} preloads {len(on_disk)} images, more than the "
+                  f"{preload['cacheSize']}-entry bitmap cache")
+            return 1
+        if current != content:
+            print(f"✗ {OUTPUT_PATH} is out of date ({summary}); run python -m tools.preload_plan")
+            return 1
+        print(f"✓ {OUTPUT_PATH} is up to date ({summary})")
+        return 0
+
+    if current == content:
+        print(f"→ Unchanged: {OUTPUT_PATH} ({summary})")
+        return 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.replace(tmp_path, output)
+    print(f"✓ Wrote {OUTPUT_PATH} ({summary})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+ColorTrap - Setup Profiling
+Per-phase wall time and I/O counters, with optional cProfile capture.
+The tooling calls count() at each stat, scan, write and mkdir it performs.
+"""
+
+import os
+import json
+import time
+import threading
+
+STAT = "files_stat"
+SCANNED = "entries_scanned"
+BYTES_WRITTEN = "bytes_written"
+FILES_WRITTEN = "files_written"
+DIRS_CREATED = "dirs_created"
+
+COUNTER_KEYS = (STAT, SCANNED, BYTES_WRITTEN, FILES_WRITTEN, DIRS_CREATED)
+
+_lock = threading.Lock()
+_counters = dict.fromkeys(COUNTER_KEYS, 0)
+
+
+def count(key, n=1):
+    """Add n to a process-wide I/O counter (thread-safe)"""
+    with _lock:
+        _counters[key] += n
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.cprof = None
+
+    def __enter__(self):
+        if self.profiler.cprofile_dir:
+            import cProfile
+            self.cprof = cProfile.Profile()
+            self.cprof.enable()
+        self.before = counters()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start
+        after = counters()
+        if self.cprof is not None:
+            self.cprof.disable()
+            os.makedirs(self.profiler.cprofile_dir, exist_ok=True)
+            self.cprof.dump_stats(os.path.join(self.profiler.cprofile_dir, f"{self.name}.prof"))
+
+        record = {"wall_ms": round(wall * 1000, 3)}
+        for key in COUNTER_KEYS:
+            record[key] = after[key] - self.before[key]
+        if exc_type is not None:
+            record["failed"] = True
+        self.profiler.phases[self.name] = record
+        return False
+
+
+class PhaseProfiler:
+    """
+    Usage:
+        profiler = PhaseProfiler()
+        with profiler.phase("create_json_configs"):
+            ...
+        profiler.dump("profile.json")
+    """
+
+    def __init__(self, cprofile_dir=None):
+        self.cprofile_dir = cprofile_dir
+        self.phases = {}
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def totals(self):
+        totals = {"wall_ms": 0.0}
+        totals.update(dict.fromkeys(COUNTER_KEYS, 0))
+        for record in self.phases.values():
+            for key in totals:
+                totals[key] += record.get(key, 0)
+        totals["wall_ms"] = round(totals["wall_ms"], 3)
+        return totals
+
+    def to_dict(self):
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "phases": self.phases,
+            "totals": self.totals(),
+        }
+
+    def dump(self, path):
+        """Write the profile as JSON; '-' prints it to stdout"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path == "-":
+            print(text)
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
@@ -0,0 +1,123 @@
+"""
+ColorTrap - Project Root Resolver
+Order: --root, $COLORTRAP_ROOT, cached result for this cwd, upward marker
+search. Never blocks on input() when stdin is not a terminal.
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+
+ENV_VAR = "COLORTRAP_ROOT"
+MARKERS = ("settings.gradle.kts", "app/build.gradle.kts")
+DEFAULT_MAX_DEPTH = 8
+CACHE_FILE = "project_roots.json"
+
+
+class ProjectRootError(Exception):
+    """Raised when the project root cannot be resolved non-interactively"""
+
+
+def is_project_root(path):
+    return any((path / marker).is_file() for marker in MARKERS)
+
+
+def find_upward(start, max_depth=DEFAULT_MAX_DEPTH):
+    """Check start and up to max_depth parents for a marker file"""
+    path = start
+    for _ in range(max_depth + 1):
+        if is_project_root(path):
+            return path
+        # Running from the folder that contains the checkout
+        child = path / "ColorTrap"
+        if is_project_root(child):
+            return child
+        if path.parent == path:
+            break
+        path = path.parent
+    return None
+
+
+def cache_path():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "colortrap" / CACHE_FILE
+
+
+def _load_cache():
+    try:
+        with open(cache_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_cache(cwd, root):
+    cache = _load_cache()
+    if cache.get(str(cwd)) == str(root):
+        return
+    cache[str(cwd)] = str(root)
+    path = cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only home must not break resolution
+        pass
+
+
+def is_interactive():
+    if os.environ.get("CI"):
+        return False
+    try:
+        return sys.stdin is not None and sys.stdin.isatty()
+    except ValueError:
+        return False
+
+
+def resolve_project_root(cli_root=None, cwd=None, max_depth=DEFAULT_MAX_DEPTH,
+                         interactive=None, use_cache=True, prompt=input):
+    """
+    Resolve the ColorTrap project root
+    Raises ProjectRootError instead of prompting when not interactive
+    """
+    # 1. Explicit choices are trusted as-is (verify_project reports problems)
+    if cli_root:
+        return Path(cli_root).expanduser().resolve()
+    env_root = os.environ.get(ENV_VAR)
+    if env_root:
+        return Path(env_root).expanduser().resolve()
+
+    cwd = Path(cwd or Path.cwd()).resolve()
+
+    # 2. Cached answer for this working directory
+    if use_cache:
+        cached = _load_cache().get(str(cwd))
+        if cached and is_project_root(Path(cached)):
+            return Path(cached)
+
+    # 3. Marker search
+    root = find_upward(cwd, max_depth)
+    if root is not None:
+        if use_cache:
+            _store_cache(cwd, root)
+        return root
+
+    if interactive is None:
+        interactive = is_interactive()
+    if not interactive:
+        raise ProjectRootError(
+            f"Could not find {' or '.join(MARKERS)} within {max_depth} levels above {cwd}; "
+            f"pass --root or set {ENV_VAR}"
+        )
+
+    user_path = prompt("Enter ColorTrap project path: ").strip()
+    if not user_path:
+        raise ProjectRootError("No project path given")
+    return Path(user_path).expanduser().resolve()
@@ -0,0 +1,165 @@
+"""
+ColorTrap - Project Spec
+Single declarative description of the scaffolded project layout.
+Edit this file, not the scaffolders; tools/spec_compiler.py turns it into
+the normalized plan both create_structure.py and setup_phase_2.py use.
+"""
+
+BASE_PACKAGE = "com.colortrap.game"
+KOTLIN_ROOT = "app/src/main/java"
+ASSETS_ROOT = "app/src/main/assets"
+
+# Body used for every file without an explicit template
+STUB_BODY = """// TODO: Copy code from artifacts
+// See COPY_GUIDE.md for artifact sources
+"""
+
+# ==================== KOTLIN LAYOUT ====================
+# Folder (relative to the base package) -> files
+LAYOUT = {
+    # Data Layer
+    "data/models": [
+        "GameMode.kt",
+        "ItemType.kt",
+        "LevelModifier.kt",
+        "DifficultyLevel.kt",
+        "DynamicColorGroup.kt",
+        "TileVariant.kt",
+        "DynamicLevel.kt",
+        "DynamicTile.kt",
+        "DynamicGameState.kt",
+    ],
+
+    "data/config": [
+        "GameConfig.kt",
+        "ShopConfig.kt",
+        "TextConfig.kt",
+        "BalanceConfig.kt",
+    ],
+
+    "data/repository": [
+        "GameRepository.kt",
+        "PreferencesRepository.kt",
+    ],
+
+    "data/local": [
+        "PreferencesManager.kt",
+    ],
+
+    # Domain Layer
+    "domain": [
+        "DynamicSkinManager.kt",
+        "DifficultyBasedSelector.kt",
+        "DynamicLevelGenerator.kt",
+        "ConfigManager.kt",
+    ],
+
+    # Utils
+    "utils": [
+        "DynamicAssetScanner.kt",
+        "AssetLoader.kt",
+        "SoundManager.kt",
+        "VibrationManager.kt",
+        "AdManager.kt",
+        "Constants.kt",
+        "Extensions.kt",
+    ],
+
+    # UI Components
+    "ui/components": [
+        "DynamicTileGrid.kt",
+        "DynamicColorDisplayBar.kt",
+        "TopBar.kt",
+        "ItemBar.kt",
+    ],
+
+    # UI Screens
+    "ui/screens/splash": [
+        "SplashScreen.kt",
+        "SplashViewModel.kt",
+    ],
+
+    "ui/screens/menu": [
+        "MainMenuScreen.kt",
+        "MainMenuViewModel.kt",
+    ],
+
+    "ui/screens/game": [
+        "DynamicGameScreen.kt",
+        "DynamicGameViewModel.kt",
+    ],
+
+    "ui/screens/gameover": [
+        "GameOverScreen.kt",
+        "GameOverViewModel.kt",
+    ],
+
+    "ui/screens/shop": [
+        "ShopScreen.kt",
+        "ShopViewModel.kt",
+    ],
+
+    "ui/screens/settings": [
+        "SettingsScreen.kt",
+        "SettingsViewModel.kt",
+    ],
+
+    # Navigation
+    "ui/navigation": [
+        "Screen.kt",
+        "AppNavGraph.kt",
+    ],
+
+    # Note: ui/theme already exists from project creation
+}
+
+# ==================== FILE TEMPLATES ====================
+# Body written after the package declaration
+TEMPLATES = {
+    "data/models/GameMode.kt": """enum class GameMode {
+    NORMAL,
+    HARD,
+    SUPER_HARD,
+    RELAX,
+    ENDLESS,
+    DAILY_CHALLENGE
+}
+""",
+
+    "data/models/ItemType.kt": """enum class ItemType {
+    ADD_TIME,
+    HINT,
+    SHIELD,
+    REMOVE_TRAP,
+    SLOW_TIME,
+    SHUFFLE
+}
+""",
+
+    "data/models/LevelModifier.kt": """enum class LevelModifier {
+    COLORS_DISAPPEAR,
+    SHUFFLE_TILES,
+    SIMILAR_COLORS,
+    TEXT_ONLY,
+    COMBO_MODIFIER
+}
+""",
+
+    "data/models/DifficultyLevel.kt": """enum class DifficultyLevel {
+    EASY,
+    MEDIUM,
+    HARD,
+    SUPER_HARD
+}
+""",
+}
+
+# ==================== ASSETS ====================
+# Folders under ASSETS_ROOT kept alive with a .gitkeep
+ASSET_FOLDERS = [
+    "config",
+    "skins/color",
+    "audio",
+    "effects",
+    "ui",
+]
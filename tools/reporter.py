@@ -0,0 +1,245 @@
+"""
+ColorTrap - Progress Reporters
+Sinks shared by create_structure.py and setup_phase_2.py:
+human (buffered, coalesced progress line), quiet and JSON lines.
+Output is flushed in batches instead of once per file.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+
+# ANSI colors
+class Colors:
+    GREEN = '\033[92m'
+    BLUE = '\033[94m'
+    YELLOW = '\033[93m'
+    RED = '\033[91m'
+    CYAN = '\033[96m'
+    MAGENTA = '\033[95m'
+    BOLD = '\033[1m'
+    END = '\033[0m'
+
+ANSI_RE = re.compile(r'\033\[[0-9;]*m')
+
+FLUSH_EVERY = 64          # buffered lines before a write
+PROGRESS_INTERVAL = 0.1   # seconds between progress line redraws
+
+
+def _supports_color(stream):
+    if os.environ.get("NO_COLOR"):
+        return False
+    if os.environ.get("FORCE_COLOR"):
+        return True
+    try:
+        return stream.isatty() and (os.name != "nt" or "WT_SESSION" in os.environ or "ANSICON" in os.environ)
+    except (AttributeError, ValueError):
+        return False
+
+
+class Reporter:
+    """Base sink; every method is a no-op"""
+
+    def header(self, text):
+        pass
+
+    def success(self, text):
+        pass
+
+    def info(self, text):
+        pass
+
+    def warning(self, text):
+        pass
+
+    def error(self, text):
+        pass
+
+    def item(self, action, path):
+        """One per-file event (created, skipped, ...), coalesced by sinks"""
+        pass
+
+    def text(self, text=""):
+        """Free-form human text (summaries); machine sinks ignore it"""
+        pass
+
+    def summary(self, stats):
+        """Final machine-readable stats"""
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class HumanReporter(Reporter):
+    """Buffered console output with a single rate-limited progress line"""
+
+    def __init__(self, stream=None, width=70, color=None, verbose=False):
+        self.stream = stream or sys.stdout
+        self.width = width
+        self.color = _supports_color(self.stream) if color is None else color
+        self.verbose = verbose
+        self.live = self._isatty()
+        self.buffer = []
+        self.counts = {}
+        self.last_draw = 0.0
+        self.progress_shown = False
+
+    def _isatty(self):
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def _emit(self, line):
+        if not self.color:
+            line = ANSI_RE.sub("", line)
+        self.buffer.append(line + "\n")
+        if len(self.buffer) >= FLUSH_EVERY:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        if not self.buffer:
+            return
+        if self.progress_shown:
+            self.stream.write("\r\033[K" if self.live else "")
+            self.progress_shown = False
+        self.stream.write("".join(self.buffer))
+        self.buffer = []
+
+    def _end_items(self):
+        # Collapse the per-file events of the current section into one line
+        if not self.counts:
+            return
+        parts = ", ".join(f"{n} {action}" for action, n in self.counts.items())
+        self.counts = {}
+        if self.progress_shown and self.live:
+            self.stream.write("\r\033[K")
+            self.progress_shown = False
+        self._emit(f"{Colors.BLUE}→ {parts}{Colors.END}")
+
+    def header(self, text):
+        self._end_items()
+        bar = '=' * self.width
+        self._emit(f"\n{Colors.CYAN}{Colors.BOLD}{bar}{Colors.END}")
+        self._emit(f"{Colors.CYAN}{Colors.BOLD}{text:^{self.width}}{Colors.END}")
+        self._emit(f"{Colors.CYAN}{Colors.BOLD}{bar}{Colors.END}\n")
+
+    def success(self, text):
+        self._end_items()
+        self._emit(f"{Colors.GREEN}✓ {text}{Colors.END}")
+
+    def info(self, text):
+        self._end_items()
+        self._emit(f"{Colors.BLUE}→ {text}{Colors.END}")
+
+    def warning(self, text):
+        self._end_items()
+        self._emit(f"{Colors.YELLOW}⚠ {text}{Colors.END}")
+
+    def error(self, text):
+        self._end_items()
+        self._emit(f"{Colors.RED}✗ {text}{Colors.END}")
+        self.flush()
+
+    def item(self, action, path):
+        self.counts[action] = self.counts.get(action, 0) + 1
+        if self.verbose:
+            self._emit(f"{Colors.BLUE}→   ✓ {path}{Colors.END}")
+            return
+        if not self.live:
+            return
+        now = time.monotonic()
+        if now - self.last_draw < PROGRESS_INTERVAL:
+            return
+        self.last_draw = now
+        self._write_buffer()
+        parts = ", ".join(f"{n} {a}" for a, n in self.counts.items())
+        self.stream.write(f"\r\033[K→ {parts} ... {path}"[:self.width + 8])
+        self.stream.flush()
+        self.progress_shown = True
+
+    def text(self, text=""):
+        self._end_items()
+        self._emit(text)
+
+    def flush(self):
+        self._end_items()
+        self._write_buffer()
+        self.stream.flush()
+
+
+class QuietReporter(Reporter):
+    """Only warnings and errors, written to stderr (or nothing with stream=False)"""
+
+    def __init__(self, stream=None):
+        self.stream = sys.stderr if stream is None else stream
+
+    def warning(self, text):
+        if self.stream:
+            self.stream.write(f"⚠ {text}\n")
+
+    def error(self, text):
+        if self.stream:
+            self.stream.write(f"✗ {text}\n")
+            self.stream.flush()
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per event, written in batches"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.buffer = []
+
+    def _event(self, event, **fields):
+        record = {"event": event, "t": round(time.time(), 3)}
+        for key, value in fields.items():
+            record[key] = ANSI_RE.sub("", value).strip() if isinstance(value, str) else value
+        self.buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+        if len(self.buffer) >= FLUSH_EVERY:
+            self.flush()
+
+    def header(self, text):
+        self._event("section", name=text)
+
+    def success(self, text):
+        self._event("success", message=text)
+
+    def info(self, text):
+        self._event("info", message=text)
+
+    def warning(self, text):
+        self._event("warning", message=text)
+
+    def error(self, text):
+        self._event("error", message=text)
+        self.flush()
+
+    def item(self, action, path):
+        self._event("item", action=action, path=path)
+
+    def summary(self, stats):
+        self._event("summary", stats=stats)
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write("".join(self.buffer))
+            self.buffer = []
+        self.stream.flush()
+
+
+SINKS = ("human", "quiet", "json")
+
+
+def make_reporter(kind="human", verbose=False, width=70):
+    if kind == "quiet":
+        return QuietReporter()
+    if kind == "json":
+        return JsonLinesReporter()
+    return HumanReporter(width=width, verbose=verbose)
@@ -0,0 +1,205 @@
+"""
+ColorTrap - Scaffold Engine
+Two-phase plan/apply engine for materializing the Kotlin file structure
+"""
+
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.profiling import count, SCANNED, BYTES_WRITTEN, FILES_WRITTEN, DIRS_CREATED
+
+# Plan actions
+CREATE = "create"
+SKIP = "skip"
+CONFLICT = "conflict"
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class PlanEntry:
+    """Single planned file operation"""
+
+    def __init__(self, action, rel_path, content=None, reason=""):
+        self.action = action
+        self.rel_path = rel_path
+        self.content = content
+        self.reason = reason
+
+    def to_dict(self):
+        return {
+            "action": self.action,
+            "path": self.rel_path,
+            "reason": self.reason,
+        }
+
+
+class ScaffoldPlan:
+    """Full set of folders and files to create, skip or report as conflicts"""
+
+    def __init__(self, base):
+        self.base = base
+        self.folders = []
+        self.entries = []
+
+    def by_action(self, action):
+        return [e for e in self.entries if e.action == action]
+
+    @property
+    def creates(self):
+        return self.by_action(CREATE)
+
+    @property
+    def skips(self):
+        return self.by_action(SKIP)
+
+    @property
+    def conflicts(self):
+        return self.by_action(CONFLICT)
+
+    def to_dict(self):
+        return {
+            "base": str(self.base),
+            "folders": list(self.folders),
+            "entries": [e.to_dict() for e in self.entries],
+            "counts": {
+                "folders": len(self.folders),
+                CREATE: len(self.creates),
+                SKIP: len(self.skips),
+                CONFLICT: len(self.conflicts),
+            },
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def snapshot_tree(base):
+    """
+    Walk base once with os.scandir
+    Returns {relative posix path: "dir" | "file"} for everything below base
+    """
+    snapshot = {}
+    if not os.path.isdir(base):
+        return snapshot
+
+    stack = [("", os.fspath(base))]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                count(SCANNED)
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    snapshot[rel] = "dir"
+                    stack.append((rel, entry.path))
+                else:
+                    snapshot[rel] = "file"
+    return snapshot
+
+
+def build_plan(base, structure, snapshot=None):
+    """
+    Phase 1: compute the plan without touching the filesystem
+    structure: {folder_path: [(filename, content), ...]}
+    """
+    if snapshot is None:
+        snapshot = snapshot_tree(base)
+
+    plan = ScaffoldPlan(base)
+    planned_folders = set()
+
+    for folder_path, files in structure.items():
+        folder_kind = snapshot.get(folder_path)
+
+        if folder_kind == "file":
+            # A file sits where the package folder should be
+            for filename, content in files:
+                plan.entries.append(PlanEntry(
+                    CONFLICT, f"{folder_path}/{filename}", content,
+                    reason=f"{folder_path} is a file",
+                ))
+            continue
+
+        if folder_kind is None:
+            # Record every missing ancestor so apply can mkdir in order
+            parts = folder_path.split("/")
+            for i in range(1, len(parts) + 1):
+                ancestor = "/".join(parts[:i])
+                if snapshot.get(ancestor) is None and ancestor not in planned_folders:
+                    planned_folders.add(ancestor)
+                    plan.folders.append(ancestor)
+
+        for filename, content in files:
+            rel_path = f"{folder_path}/{filename}"
+            kind = snapshot.get(rel_path)
+
+            if kind is None:
+                plan.entries.append(PlanEntry(CREATE, rel_path, content))
+            elif kind == "file":
+                plan.entries.append(PlanEntry(SKIP, rel_path, reason="exists"))
+            else:
+                plan.entries.append(PlanEntry(
+                    CONFLICT, rel_path, content, reason="path is a directory",
+                ))
+
+    return plan
+
+
+def _write_file(path, content):
+    # "x" mode: never clobber a file that appeared after the snapshot
+    data = content.encode('utf-8')
+    with open(path, 'xb') as f:
+        f.write(data)
+    count(FILES_WRITTEN)
+    count(BYTES_WRITTEN, len(data))
+
+
+def apply_plan(plan, max_workers=DEFAULT_MAX_WORKERS, writer=None):
+    """
+    Phase 2: create folders in order, then write files through a bounded pool
+    With a BatchWriter, files are only staged and appear on its commit()
+    Returns the list of entries actually created
+    """
+    base = os.fspath(plan.base)
+
+    if writer is None:
+        # Parents are listed before children, so plain mkdir is enough
+        for folder in plan.folders:
+            os.makedirs(os.path.join(base, folder), exist_ok=True)
+            count(DIRS_CREATED)
+
+    creates = plan.creates
+    if not creates:
+        return []
+
+    if writer is not None:
+        base_rel = os.path.relpath(base, writer.root).replace(os.sep, "/")
+
+    def write(entry):
+        if writer is not None:
+            writer.write(f"{base_rel}/{entry.rel_path}", entry.content, overwrite=False)
+            return entry
+        try:
+            _write_file(os.path.join(base, entry.rel_path), entry.content)
+        except FileExistsError:
+            entry.action = SKIP
+            entry.reason = "created concurrently"
+            return None
+        return entry
+
+    workers = max(1, min(max_workers, len(creates)))
+    if workers == 1:
+        results = [write(e) for e in creates]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(write, creates))
+
+    return [e for e in results if e is not None]
+
+
+def materialize(base, structure, max_workers=DEFAULT_MAX_WORKERS):
+    """Plan and apply in one call; returns the plan"""
+    plan = build_plan(base, structure)
+    apply_plan(plan, max_workers=max_workers)
+    return plan
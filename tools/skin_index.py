@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Skin Asset Index
+Walks app/src/main/assets/skins once and writes assets/config/skin_index.json
+(skins -> color groups -> ordered variants with PNG/WebP/JPEG dimensions),
+so the app loads one file instead of calling AssetManager.list() per folder.
+Incremental: image headers are only re-read when size or mtime changes.
+
+Usage:
+    python -m tools.skin_index [--root PATH] [--check]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from tools.assets import ASSETS_ROOT, SKINS_DIR, iter_skin_variants, read_image_size
+
+INDEX_PATH = f"{ASSETS_ROOT}/config/skin_index.json"
+CACHE_PATH = ".colortrap/skin_index_cache.json"
+INDEX_VERSION = 1
+
+
+def _load_cache(root):
+    try:
+        with open(root / CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(root, cache):
+    path = root / CACHE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def build_index(root, cache=None):
+    """
+    Returns (index dict, new cache, number of headers read)
+    Cache maps asset-relative path -> [size, mtime_ns, width, height]
+    """
+    cache = cache or {}
+    new_cache = {}
+    skins = {}
+    headers_read = 0
+
+    for skin, group, entry in iter_skin_variants(root):
+        rel = f"{SKINS_DIR}/{skin}/{group}/{entry.name}"
+        st = entry.stat()
+        cached = cache.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            width, height = cached[2], cached[3]
+        else:
+            size = read_image_size(entry.path) or (0, 0)
+            width, height = size
+            headers_read += 1
+        new_cache[rel] = [st.st_size, st.st_mtime_ns, width, height]
+        skins.setdefault(skin, {}).setdefault(group, []).append([entry.name, width, height])
+
+    index = {
+        "version": INDEX_VERSION,
+        "basePath": SKINS_DIR,
+        "skins": skins,
+    }
+    return index, new_cache, headers_read
+
+
+def render_index(index):
+    # Compact: the app parses this on cold start
+    return json.dumps(index, separators=(",", ":"), sort_keys=True) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Skin Asset Index")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if skin_index.json is out of date instead of writing it")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    index, cache, headers_read = build_index(root, _load_cache(root))
+    content = render_index(index)
+    output = root / INDEX_PATH
+    current = output.read_text(encoding='utf-8') if output.exists() else None
+
+    variants = sum(len(v) for groups in index["skins"].values() for v in groups.values())
+    summary = f"{len(index['skins'])} skins, {variants} variants, {headers_read} headers read"
+
+    if args.check:
+        if current != content:
+            print(f"✗ {INDEX_PATH} is out of date ({summary}); run python -m tools.skin_index")
+            return 1
+        print(f"✓ {INDEX_PATH} is up to date ({summary})")
+        return 0
+
+    _save_cache(root, cache)
+    if current == content:
+        print(f"→ Unchanged: {INDEX_PATH} ({summary})")
+        return 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.replace(tmp_path, output)
+    print(f"✓ Wrote {INDEX_PATH} ({summary})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
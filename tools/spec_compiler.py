@@ -0,0 +1,106 @@
+"""
+ColorTrap - Spec Compiler
+Compiles tools/project_spec.py into a normalized plan (paths, package names,
+rendered file contents) and caches it on disk keyed by the spec hash.
+A cache hit never imports the spec module.
+"""
+
+import os
+import json
+import hashlib
+import importlib
+import importlib.util
+
+SPEC_MODULE = "tools.project_spec"
+COMPILER_VERSION = 2
+CACHE_DIR = os.path.join(".colortrap", "spec-cache")
+
+_memo = {}
+
+
+def spec_source_path():
+    return importlib.util.find_spec(SPEC_MODULE).origin
+
+
+def spec_hash(source_path=None):
+    """sha256 of the spec source plus the compiler version"""
+    source_path = source_path or spec_source_path()
+    h = hashlib.sha256(f"compiler-v{COMPILER_VERSION}\n".encode('utf-8'))
+    with open(source_path, 'rb') as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def compile_spec(spec):
+    """Render the spec module into a JSON-serializable plan"""
+    folders = {}
+    for folder_path, files in spec.LAYOUT.items():
+        package = spec.BASE_PACKAGE + "." + folder_path.replace("/", ".")
+        entries = []
+        for filename in files:
+            body = spec.TEMPLATES.get(f"{folder_path}/{filename}")
+            entries.append({
+                "file": filename,
+                "package": package,
+                "content": f"package {package}\n\n{body or spec.STUB_BODY}",
+                "complete": body is not None,
+            })
+        folders[folder_path] = entries
+
+    kotlin_base = spec.KOTLIN_ROOT + "/" + spec.BASE_PACKAGE.replace(".", "/")
+    return {
+        "compiler_version": COMPILER_VERSION,
+        "base_package": spec.BASE_PACKAGE,
+        "kotlin_base": kotlin_base,
+        "assets_root": spec.ASSETS_ROOT,
+        "asset_folders": list(spec.ASSET_FOLDERS),
+        "folders": folders,
+    }
+
+
+def load_compiled(cache_root=None):
+    """
+    Return the compiled plan, from memory, the on-disk cache or a fresh compile
+    cache_root: directory holding .colortrap/spec-cache (None disables the disk cache)
+    """
+    key = spec_hash()
+    if key in _memo:
+        return _memo[key]
+
+    cache_file = None
+    if cache_root is not None:
+        cache_file = os.path.join(os.fspath(cache_root), CACHE_DIR, f"{key}.json")
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                compiled = json.load(f)
+            _memo[key] = compiled
+            return compiled
+        except (FileNotFoundError, ValueError):
+            pass
+
+    compiled = compile_spec(importlib.import_module(SPEC_MODULE))
+    compiled["spec_hash"] = key
+
+    if cache_file is not None:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_path = cache_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(compiled, f)
+        os.replace(tmp_path, cache_file)
+
+        # Entries for older spec versions are never read again
+        cache_dir = os.path.dirname(cache_file)
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json") and name != f"{key}.json":
+                os.remove(os.path.join(cache_dir, name))
+
+    _memo[key] = compiled
+    return compiled
+
+
+def kotlin_structure(compiled):
+    """Compiled plan -> {folder_path: [(filename, content), ...]} for the scaffold engine"""
+    return {
+        folder_path: [(e["file"], e["content"]) for e in entries]
+        for folder_path, entries in compiled["folders"].items()
+    }
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Player Survival Simulator
+Monte Carlo runs of each game mode against balance_config.json for the
+player archetypes in tools/player_archetypes.json. A run plays level after
+level. Each attempt needs a reaction time under the level's timeLimit,
+plus a tap that does not hit a forbidden color. Reaction time grows with
+gridSize (scanning) and forbiddenCount (recall). A failed attempt costs a
+life; the other modes have one. With lives left (RELAX), the two failures
+follow DynamicGameViewModel: after a wrong tap the same level continues
+with the time still on the clock (onWrongClick), and after a timeout the
+run moves on to the next level (onTimeUp -> startNewLevel). Reward-ad
+continues are not modelled. Runs are split into shards on a process pool. Every shard has
+its own SeedSequence stream and returns a run-length histogram, so
+merging is cheap and a fixed seed always gives the same curves.
+
+Usage:
+    python -m tools.survival_sim [--root PATH] [--runs 1000000] [--mode NORMAL ...]
+                                 [--seed 0] [--jobs N] [--max-level 300] [--json PATH]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tools.balance_config import MODES, expand_mode, load_balance_config
+
+ARCHETYPES_PATH = "tools/player_archetypes.json"
+ARCHETYPE_FIELDS = (
+    "share", "reactionMedian", "reactionSpread", "scanPerTile",
+    "recallPerForbidden", "trialSigma", "errorBase", "errorPerForbidden",
+)
+# Part of the economy and tuner cache keys: bump when the model changes
+SURVIVAL_VERSION = 2
+DEFAULT_MAX_LEVEL = 300
+SHARD_RUNS = 250_000
+# Levels printed in the survival table
+CHECKPOINTS = (10, 20, 40, 60, 80, 100)
+
+# Causes of the attempt that ended a run
+TIMEOUT = "timeout"
+WRONG_TAP = "wrongTap"
+
+
+def load_archetypes(project_root="."):
+    """{name: params}; ValueError when a field is missing or shares do not sum to 1"""
+    with open(Path(project_root) / ARCHETYPES_PATH, 'r', encoding='utf-8') as f:
+        archetypes = json.load(f)["archetypes"]
+    for name, params in archetypes.items():
+        missing = [field for field in ARCHETYPE_FIELDS if field not in params]
+        if missing:
+            raise ValueError(f"Archetype {name!r} is missing {', '.join(missing)}")
+    total = sum(params["share"] for params in archetypes.values())
+    if abs(total - 1.0) > 1e-6:
+        raise ValueError(f"Archetype shares sum to {total:g}, expected 1")
+    return archetypes
+
+
+def mode_tables(balance_config, mode, max_level):
+    """Dense (gridSize, forbiddenCount, timeLimit, lives) for levels 1..max_level"""
+    config = balance_config["modes"][mode]
+    dense = expand_mode(config["levels"], max_level)
+    return (
+        np.array(dense["gridSize"], dtype=np.float64),
+        np.array(dense["forbiddenCount"], dtype=np.float64),
+        np.array(dense["timeLimit"], dtype=np.float64),
+        int(config.get("lives", 1)),
+    )
+
+
+def shard_rng(seed, mode, archetype_index, shard):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(MODES.index(mode), archetype_index, shard)))
+
+
+def simulate(tables, archetype, runs, rng):
+    """
+    Play runs of one archetype through one mode's tables
+    Returns (histogram of levels cleared, length max_level + 1, and
+    {TIMEOUT: counts, WRONG_TAP: counts} on the same axis: what ended the
+    runs that stopped at each level)
+    """
+    grid_size, forbidden, time_limit, lives = tables
+    max_level = len(grid_size)
+    # Per-run skill: the player's own median reaction time
+    base = archetype["reactionMedian"] * np.exp(archetype["reactionSpread"] * rng.standard_normal(runs))
+    lives_left = np.full(runs, lives, dtype=np.int8)
+    alive = np.arange(runs)
+    histogram = np.zeros(max_level + 1, dtype=np.int64)
+    causes = {TIMEOUT: np.zeros_like(histogram), WRONG_TAP: np.zeros_like(histogram)}
+
+    for level in range(max_level):
+        expected = archetype["scanPerTile"] * grid_size[level] + archetype["recallPerForbidden"] * forbidden[level]
+        p_error = min(archetype["errorBase"] + archetype["errorPerForbidden"] * forbidden[level], 1.0)
+        pending = alive
+        remaining = np.full(pending.size, time_limit[level])
+        cleared = []
+        while pending.size:
+            reaction = (base[pending] + expected) * np.exp(archetype["trialSigma"] * rng.standard_normal(pending.size))
+            timed_out = reaction > remaining
+            wrong_tap = ~timed_out & (rng.random(pending.size) < p_error)
+            failed = timed_out | wrong_tap
+
+            lives_left[pending[failed]] -= 1
+            out = lives_left[pending] <= 0
+            causes[TIMEOUT][level] += int((out & timed_out).sum())
+            causes[WRONG_TAP][level] += int((out & wrong_tap).sum())
+            histogram[level] += int(out.sum())
+            # A timeout with lives left still starts the next level
+            cleared.append(pending[~failed | (timed_out & ~out)])
+            # A wrong tap keeps the level and its running timer
+            retry = wrong_tap & ~out
+            remaining = (remaining - reaction)[retry]
+            pending = pending[retry]
+        alive = np.concatenate(cleared) if cleared else alive[:0]
+        if not alive.size:
+            break
+
+    # Runs that cleared every simulated level are censored at max_level
+    histogram[max_level] += alive.size
+    return histogram, causes
+
+
+def _shard(task):
+    """Worker: one (mode, archetype, shard) slice"""
+    tables, archetype, runs, seed, mode, archetype_index, shard = task
+    return simulate(tables, archetype, runs, shard_rng(seed, mode, archetype_index, shard))
+
+
+def survival_curve(histogram):
+    """survival[l] = share of runs that cleared at least l levels, l = 0..max_level"""
+    total = histogram.sum()
+    reached = total - np.concatenate([[0], np.cumsum(histogram)[:-1]])
+    return reached / total if total else reached.astype(np.float64)
+
+
+def median_run_length(histogram):
+    """Levels cleared by the median run"""
+    return int(np.searchsorted(np.cumsum(histogram), histogram.sum() / 2.0))
+
+
+def sweep(balance_config, archetypes, modes, runs, seed=0, jobs=None,
+          max_level=DEFAULT_MAX_LEVEL, shard_runs=SHARD_RUNS):
+    """
+    runs per mode, split across archetypes by share
+    Returns {mode: {archetype | "all": {"runs", "histogram", "causes"}}}
+    """
+    tasks = []
+    keys = []
+    for mode in modes:
+        tables = mode_tables(balance_config, mode, max_level)
+        for archetype_index, (name, archetype) in enumerate(archetypes.items()):
+            remaining = int(round(runs * archetype["share"]))
+            shard = 0
+            while remaining > 0:
+                size = min(shard_runs, remaining)
+                tasks.append((tables, archetype, size, seed, mode, archetype_index, shard))
+                keys.append((mode, name))
+                remaining -= size
+                shard += 1
+
+    results = {mode: {bucket: {"histogram": np.zeros(max_level + 1, dtype=np.int64),
+                               "causes": {TIMEOUT: 0, WRONG_TAP: 0}}
+                      for bucket in [*archetypes, "all"]}
+               for mode in modes}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for (mode, name), (histogram, causes) in zip(keys, pool.map(_shard, tasks)):
+            for bucket in (name, "all"):
+                entry = results[mode][bucket]
+                entry["histogram"] += histogram
+                for cause, count in causes.items():
+                    entry["causes"][cause] += int(count.sum())
+    for buckets in results.values():
+        for entry in buckets.values():
+            entry["runs"] = int(entry["histogram"].sum())
+    return results
+
+
+def summarize(results):
+    """JSON-ready report: median run length, checkpoint survival and the full curve"""
+    report = {}
+    for mode, buckets in results.items():
+        report[mode] = {}
+        for bucket, entry in buckets.items():
+            curve = survival_curve(entry["histogram"])
+            report[mode][bucket] = {
+                "runs": entry["runs"],
+                "medianLevelsCleared": median_run_length(entry["histogram"]),
+                "endedBy": entry["causes"],
+                "survival": [round(float(s), 5) for s in curve],
+            }
+    return report
+
+
+def print_report(report):
+    header = "".join(f"{f'≥{level}':>8}" for level in CHECKPOINTS)
+    for mode, buckets in report.items():
+        print(f"\n{mode:<12} {'runs':>10} {'median':>7}{header}")
+        for bucket, entry in buckets.items():
+            survival = entry["survival"]
+            cells = "".join(f"{survival[level] if level < len(survival) else 0.0:>8.1%}" for level in CHECKPOINTS)
+            print(f"  {bucket:<10} {entry['runs']:>10,} {entry['medianLevelsCleared']:>7}{cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Player Survival Simulator")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Mode to simulate (repeatable, default: all)")
+    parser.add_argument("--runs", type=int, default=1_000_000, help="Runs per mode, split by archetype share (default: 1000000)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed (default: 0)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-level", type=int, default=DEFAULT_MAX_LEVEL, help=f"Levels simulated per run (default: {DEFAULT_MAX_LEVEL})")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report (with full survival curves) as JSON")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    balance_config = load_balance_config(root)
+    archetypes = load_archetypes(root)
+    modes = args.mode or [mode for mode in MODES if mode in balance_config["modes"]]
+
+    started = time.perf_counter()
+    results = sweep(balance_config, archetypes, modes, args.runs, args.seed, args.jobs, args.max_level)
+    elapsed = time.perf_counter() - started
+    report = summarize(results)
+
+    total = sum(buckets["all"]["runs"] for buckets in report.values())
+    print(f"✓ {total:,} runs in {elapsed:.1f} s on {args.jobs or os.cpu_count()} processes (seed {args.seed})")
+    print("  median = levels cleared by the median run; ≥N = share of runs that cleared N levels")
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"seed": args.seed, "runsPerMode": args.runs, "maxLevel": args.max_level,
+                       "modes": report}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Asset budgets: bucket totals, wildcard budgets, snapshot diff and exit code"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from tools.asset_budget import (buckets_for, check_budgets, collect, density_bucket,
+                                diff_snapshot, main)
+from tools.assets import ASSETS_ROOT, RES_ROOT, SKINS_DIR
+
+SKINS = f"{ASSETS_ROOT}/{SKINS_DIR}"
+
+
+def _run(argv):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        rc = main(argv)
+    return rc, out.getvalue()
+
+
+class BucketTest(unittest.TestCase):
+
+    def test_skin_file_buckets(self):
+        self.assertEqual(buckets_for(f"{SKINS}/color/red/01.png"), [
+            "total", f"dir:{ASSETS_ROOT}", f"dir:{SKINS}", f"dir:{SKINS}/color",
+            f"dir:{SKINS}/color/red", "skin:color", "group:color/red",
+        ])
+
+    def test_res_density_buckets(self):
+        self.assertEqual(density_bucket(f"{RES_ROOT}/mipmap-xxhdpi/icon.png"), "xxhdpi")
+        self.assertEqual(density_bucket(f"{RES_ROOT}/drawable-night-hdpi/bg.png"), "hdpi")
+        self.assertEqual(density_bucket(f"{RES_ROOT}/values/strings.xml"), "default")
+        self.assertIn("density:xxhdpi", buckets_for(f"{RES_ROOT}/mipmap-xxhdpi/icon.png"))
+
+    def test_exact_budget_wins_over_pattern(self):
+        totals = {"skin:color": 900, "skin:pastel": 600, "total": 1500}
+        budgets = {"skin:*": 500, "skin:color": 1000}
+        self.assertEqual(check_budgets(totals, budgets), [("skin:pastel", 600, 500)])
+
+    def test_tightest_pattern_applies(self):
+        self.assertEqual(check_budgets({"group:color/red": 300}, {"group:*": 400, "group:color/*": 200}),
+                         [("group:color/red", 300, 200)])
+
+    def test_snapshot_diff(self):
+        old = {"a": [1, "x"], "b": [1, "y"], "c": [1, "z"]}
+        new = {"a": [1, "x"], "b": [2, "y2"], "d": [1, "w"]}
+        self.assertEqual(diff_snapshot(old, new), (["d"], ["b"], ["c"]))
+
+
+class AssetBudgetRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self._write(f"{SKINS}/color/red/01.png", 1000)
+        self._write(f"{SKINS}/color/blue/01.png", 3000)
+        self._write(f"{RES_ROOT}/mipmap-hdpi/icon.png", 500)
+        self.budgets = self.root / "budgets.json"
+        self.argv = ["--root", str(self.root), "--budgets", str(self.budgets)]
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, rel, size, fill=b"\0"):
+        path = self.root / rel
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_bytes(fill * size)
+
+    def _budgets(self, budgets):
+        self.budgets.write_text(json.dumps({"budgets": budgets}), encoding='utf-8')
+
+    def test_totals(self):
+        totals, files, _, misses = collect(self.root)
+        self.assertEqual(totals["total"], 4500)
+        self.assertEqual(totals["skin:color"], 4000)
+        self.assertEqual(totals["group:color/blue"], 3000)
+        self.assertEqual(totals["density:hdpi"], 500)
+        self.assertEqual((len(files), misses), (3, 3))
+        self.assertEqual(collect(self.root)[3], 0)
+
+    def test_over_budget_fails(self):
+        self._budgets({"group:color/*": 2000, "total": 10000})
+        rc, out = _run(self.argv)
+        self.assertEqual(rc, 1)
+        self.assertIn("✗ group:color/blue", out)
+        self.assertNotIn("group:color/red:", out)
+
+        self._budgets({"group:color/*": 4000})
+        self.assertEqual(_run(self.argv)[0], 0)
+
+    def test_second_run_lists_changes(self):
+        self._budgets({})
+        self.assertIn("first run", _run(self.argv)[1])
+        self._write(f"{SKINS}/color/red/01.png", 1000, fill=b"\1")
+        self._write(f"{SKINS}/color/red/02.png", 10)
+        os.remove(self.root / RES_ROOT / "mipmap-hdpi" / "icon.png")
+
+        report = self.root / "report.json"
+        rc, out = _run(self.argv + ["--json", str(report)])
+        self.assertEqual(rc, 0)
+        self.assertIn("1 added, 1 changed, 1 removed", out)
+        data = json.loads(report.read_text(encoding='utf-8'))
+        self.assertEqual(data["added"], [f"{SKINS}/color/red/02.png"])
+        self.assertEqual(data["changed"], [f"{SKINS}/color/red/01.png"])
+        self.assertEqual(data["removed"], [f"{RES_ROOT}/mipmap-hdpi/icon.png"])
+        self.assertEqual(data["totals"]["total"], 4010)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Asset bundles must round-trip byte for byte with aligned, sorted entries"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from tools.asset_bundle import (
+    ALIGN, ENTRY, HEADER, AssetBundle, BundleError, build_bundle, collect_trees, write_bundle,
+)
+
+FILES = {
+    "skins/color/blue/01.png": b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 3,
+    "config/game_config.json": b'{"version": "1.0"}',
+    "config/empty.json": b"",
+    "effects/a": b"x",
+    "effects/b": b"xyz",
+    "effects/c": b"12345",
+    "skins/màu/đỏ/01.png": b"unicode name",
+}
+
+
+class AssetBundleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "assets.ctb")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_round_trip(self):
+        write_bundle(self.path, FILES.items())
+        with AssetBundle(self.path) as bundle:
+            self.assertEqual(len(bundle), len(FILES))
+            for name, data in FILES.items():
+                self.assertIn(name, bundle)
+                self.assertEqual(bundle.read(name), data)
+            self.assertEqual(bundle.verify(), [])
+
+    def test_index_sorted_and_aligned(self):
+        write_bundle(self.path, FILES.items())
+        with AssetBundle(self.path) as bundle:
+            raw = [n.encode('utf-8') for n in bundle.names()]
+            self.assertEqual(raw, sorted(n.encode('utf-8') for n in FILES))
+            for name in FILES:
+                offset, _, _ = bundle.info(name)
+                self.assertEqual(offset % ALIGN, 0)
+        self.assertEqual(os.path.getsize(self.path) % ALIGN, 0)
+
+    def test_get_is_zero_copy(self):
+        write_bundle(self.path, FILES.items())
+        with AssetBundle(self.path) as bundle:
+            view = bundle.get("effects/b")
+            self.assertIsInstance(view, memoryview)
+            self.assertEqual(view.tobytes(), b"xyz")
+            view.release()
+
+    def test_missing_name(self):
+        write_bundle(self.path, FILES.items())
+        with AssetBundle(self.path) as bundle:
+            self.assertNotIn("effects/zzz", bundle)
+            self.assertNotIn("", bundle)
+            with self.assertRaises(KeyError):
+                bundle.read("config/missing.json")
+
+    def test_deterministic(self):
+        reversed_items = list(FILES.items())[::-1]
+        self.assertEqual(build_bundle(FILES.items()), build_bundle(reversed_items))
+
+    def test_empty_bundle(self):
+        write_bundle(self.path, [])
+        with AssetBundle(self.path) as bundle:
+            self.assertEqual(len(bundle), 0)
+            self.assertNotIn("x", bundle)
+
+    def test_detects_corruption(self):
+        write_bundle(self.path, FILES.items())
+        with AssetBundle(self.path) as bundle:
+            offset, _, _ = bundle.info("effects/c")
+        with open(self.path, 'r+b') as f:
+            f.seek(offset)
+            f.write(b"9")
+        with AssetBundle(self.path) as bundle:
+            self.assertEqual(bundle.verify(), ["effects/c"])
+
+    def test_rejects_index_entries_outside_the_file(self):
+        write_bundle(self.path, FILES.items())
+        with AssetBundle(self.path) as bundle:
+            index_offset = HEADER.size
+            i = bundle.find("effects/c")
+        with open(self.path, 'r+b') as f:
+            f.seek(index_offset + i * ENTRY.size + 12)
+            f.write(struct.pack("<I", 1 << 20))
+        with self.assertRaises(BundleError):
+            AssetBundle(self.path)
+
+    def test_rejects_bad_magic(self):
+        with open(self.path, 'wb') as f:
+            f.write(struct.pack("<4s", b"NOPE") + b"\0" * (HEADER.size - 4))
+        with self.assertRaises(BundleError):
+            AssetBundle(self.path)
+
+    def test_rejects_duplicates(self):
+        with self.assertRaises(ValueError):
+            build_bundle([("a", b"1"), ("a", b"2")])
+
+    def test_packs_asset_trees_from_disk(self):
+        assets = os.path.join(self.tmp, "app", "src", "main", "assets")
+        for name, data in FILES.items():
+            path = os.path.join(assets, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+        open(os.path.join(assets, "config", ".gitkeep"), 'wb').close()
+
+        files = collect_trees(self.tmp, ("config", "skins"))
+        self.assertEqual(sorted(n for n, _ in files),
+                         sorted(n for n in FILES if not n.startswith("effects/")))
+        write_bundle(self.path, files)
+        with AssetBundle(self.path) as bundle:
+            self.assertEqual(bundle.read("config/game_config.json"), FILES["config/game_config.json"])
+            self.assertEqual(ENTRY.size % ALIGN, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Atlas packing: non-overlapping rects, UVs that sample the source pixels, verify"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from PIL import Image
+
+from tools.atlas_packer import ATLAS_DIR, main, pack_shelves
+from tools.assets import ASSETS_ROOT, SKINS_DIR
+
+SKIN = f"{ASSETS_ROOT}/{SKINS_DIR}/color"
+
+
+def _run(argv):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        rc = main(argv)
+    return rc, out.getvalue()
+
+
+class PackShelvesTest(unittest.TestCase):
+
+    def test_rects_fit_and_do_not_overlap(self):
+        sizes = [(60, 40), (30, 70), (100, 20), (50, 50)] * 6
+        placements, sheets = pack_shelves(sizes, 256, padding=2)
+        boxes = {}
+        for (w, h), (sheet, x, y) in zip(sizes, placements):
+            sw, sh = sheets[sheet]
+            # The padded box stays inside its power-of-two sheet
+            self.assertTrue(x - 2 >= 0 and y - 2 >= 0 and x + w + 2 <= sw and y + h + 2 <= sh)
+            self.assertEqual(sw & (sw - 1), 0)
+            for bx, by, bw, bh in boxes.get(sheet, []):
+                self.assertTrue(x + w + 2 <= bx - 2 or bx + bw + 2 <= x - 2 or
+                                y + h + 2 <= by - 2 or by + bh + 2 <= y - 2)
+            boxes.setdefault(sheet, []).append((x, y, w, h))
+        self.assertGreater(len(sheets), 1)
+
+    def test_oversized_image_is_rejected(self):
+        with self.assertRaises(ValueError):
+            pack_shelves([(255, 10)], 256, padding=1)
+
+
+class AtlasTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        for g, group in enumerate(("blue", "red")):
+            os.makedirs(self.root / SKIN / group)
+            for n in range(3):
+                img = Image.new("RGBA", (40 + 8 * n, 32 + 4 * g))
+                # A gradient, so any off-by-one crop changes the pixels
+                img.putdata([(x * 5 % 256, y * 7 % 256, 40 * g + n, 255)
+                             for y in range(img.height) for x in range(img.width)])
+                img.save(self.root / SKIN / group / f"0{n + 1}.png")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_uvs_sample_the_source_pixels(self):
+        self.assertEqual(_run(["--root", str(self.root), "--max-size", "128"])[0], 0)
+        manifest = json.loads((self.root / ATLAS_DIR / "color.json").read_text(encoding='utf-8'))
+        sheets = [Image.open(self.root / ATLAS_DIR / s["file"]).convert("RGBA") for s in manifest["sheets"]]
+        for group, regions in manifest["regions"].items():
+            for region in regions:
+                sheet = sheets[region["sheet"]]
+                sw, sh = sheet.size
+                box = (round(region["u0"] * sw), round(region["v0"] * sh),
+                       round(region["u1"] * sw), round(region["v1"] * sh))
+                source = Image.open(self.root / SKIN / group / region["variant"]).convert("RGBA")
+                self.assertEqual(box[2] - box[0], source.width)
+                self.assertEqual(sheet.crop(box).tobytes(), source.tobytes())
+        self.assertEqual(_run(["--root", str(self.root), "--verify"])[0], 0)
+
+    def test_verify_reports_changed_sources(self):
+        _run(["--root", str(self.root)])
+        Image.new("RGBA", (40, 32), (0, 0, 0, 255)).save(self.root / SKIN / "blue" / "01.png")
+        rc, out = _run(["--root", str(self.root), "--verify"])
+        self.assertEqual(rc, 1)
+        self.assertIn("color/blue/01.png: pixels differ", out)
+
+    def test_verify_without_atlas(self):
+        rc, out = _run(["--root", str(self.root), "--verify"])
+        self.assertEqual(rc, 1)
+        self.assertIn("atlas not built", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
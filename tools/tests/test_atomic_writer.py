@@ -0,0 +1,208 @@
+"""Batch writer: publish, skip-if-exists, rollback, journal recovery and discard"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from tools import atomic_writer
+from tools.atomic_writer import JOURNAL_FILE, STAGING_PARENT, BatchWriter
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class BatchWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "config"))
+        with open(os.path.join(self.root, "config", "a.json"), 'wb') as f:
+            f.write(b"old a")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def test_commit_publishes_batch_and_cleans_staging(self):
+        with BatchWriter(self.root) as writer:
+            writer.write("config/a.json", b"new a")
+            writer.write("docs/b.md", "b")
+            writer.write("docs/b.md", "b2")
+            writer.write("config/keep.txt", b"x", overwrite=False)
+        self.assertEqual(_read(self.path("config/a.json")), b"new a")
+        self.assertEqual(_read(self.path("docs/b.md")), b"b2")
+        self.assertEqual(sorted(e.rel_path for e in writer.published),
+                         ["config/a.json", "config/keep.txt", "docs/b.md"])
+        self.assertFalse(os.path.exists(self.path(STAGING_PARENT)))
+
+    def test_streamed_file_and_unstage(self):
+        writer = BatchWriter(self.root)
+        sha256 = writer.write_stream("data/big.bin", lambda f: f.write(b"x" * 100_000))
+        writer.write_stream("data/skipped.bin", lambda f: f.write(b"y"))
+        writer.unstage("data/skipped.bin")
+        published = writer.commit()
+        self.assertEqual([(e.rel_path, e.data, e.sha256) for e in published], [("data/big.bin", None, sha256)])
+        self.assertEqual(_read(self.path("data/big.bin")), b"x" * 100_000)
+        self.assertFalse(os.path.exists(self.path("data/skipped.bin")))
+
+    def test_overwrite_false_keeps_existing_file(self):
+        writer = BatchWriter(self.root)
+        writer.write("config/a.json", b"new a", overwrite=False)
+        self.assertEqual(writer.commit(), [])
+        self.assertEqual(_read(self.path("config/a.json")), b"old a")
+
+    def test_fsyncs_staged_files_not_the_whole_system(self):
+        writer = BatchWriter(self.root)
+        writer.write("config/a.json", b"new a")
+        writer.write("docs/b.md", b"b")
+        with mock.patch.object(atomic_writer.os, "fsync", wraps=os.fsync) as fsync, \
+                mock.patch.object(atomic_writer.os, "sync", create=True) as sync:
+            writer.commit()
+        sync.assert_not_called()
+        # Two staged files, then their parent directories on POSIX
+        self.assertGreaterEqual(fsync.call_count, 2)
+
+    def test_failed_publish_rolls_back_to_previous_contents(self):
+        writer = BatchWriter(self.root)
+        writer.write("config/a.json", b"new a")
+        writer.write("config/b.json", b"new b")
+        writer.write("config/c.json", b"new c")
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if dst == self.path("config/c.json"):
+                raise OSError("disk full")
+            return real_replace(src, dst)
+
+        with mock.patch.object(atomic_writer.os, "replace", side_effect=replace):
+            with self.assertRaises(OSError):
+                writer.commit()
+        # a.json restored from its backup, b.json (new in this batch) removed
+        self.assertEqual(_read(self.path("config/a.json")), b"old a")
+        self.assertFalse(os.path.exists(self.path("config/b.json")))
+        self.assertFalse(os.path.exists(self.path("config/c.json")))
+        self.assertFalse(os.path.exists(self.path(STAGING_PARENT)))
+        self.assertEqual(writer.published, [])
+
+    def test_exception_in_block_discards_batch(self):
+        with self.assertRaises(RuntimeError):
+            with BatchWriter(self.root) as writer:
+                writer.write("config/a.json", b"new a")
+                raise RuntimeError("generation failed")
+        self.assertEqual(_read(self.path("config/a.json")), b"old a")
+        self.assertFalse(os.path.exists(self.path(STAGING_PARENT)))
+
+
+class KilledMidPublish(BaseException):
+    """Stands in for SIGKILL: nothing after it runs in the dying process"""
+
+
+class JournalRecoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "config"))
+        for name in ("a", "c"):
+            with open(os.path.join(self.root, "config", f"{name}.json"), 'wb') as f:
+                f.write(f"old {name}".encode())
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def _kill_after(self, swaps):
+        """
+        Publish a batch and die after the given number of os.replace calls,
+        or (swaps=None) after every swap but before the journal is dropped
+        """
+        writer = BatchWriter(self.root)
+        for name in ("a", "b", "c"):
+            writer.write(f"config/{name}.json", f"new {name}")
+        real_replace = os.replace
+        calls = []
+
+        def replace(src, dst):
+            if not dst.endswith(JOURNAL_FILE):
+                if len(calls) == swaps:
+                    raise KilledMidPublish()
+                calls.append(dst)
+            return real_replace(src, dst)
+
+        def remove(path):
+            if swaps is None and path.endswith(JOURNAL_FILE):
+                raise KilledMidPublish()
+            return real_remove(path)
+
+        real_remove = os.remove
+        with mock.patch.object(atomic_writer.os, "replace", side_effect=replace), \
+                mock.patch.object(atomic_writer.os, "remove", side_effect=remove), \
+                mock.patch.object(BatchWriter, "_abort"), self.assertRaises(KilledMidPublish):
+            writer.commit()
+        return writer.staging_dir
+
+    def _assert_old_tree(self):
+        self.assertEqual(_read(self.path("config/a.json")), b"old a")
+        self.assertEqual(_read(self.path("config/c.json")), b"old c")
+        self.assertFalse(os.path.exists(self.path("config/b.json")))
+
+    def test_next_writer_rolls_back_a_killed_publish(self):
+        # a backed up and replaced, b published, c moved to its backup
+        staging = self._kill_after(4)
+        self.assertTrue(os.path.exists(os.path.join(staging, JOURNAL_FILE)))
+        self.assertFalse(os.path.exists(self.path("config/c.json")))
+        with mock.patch.object(atomic_writer, "_pid_alive", return_value=False):
+            writer = BatchWriter(self.root)
+        self.assertEqual(writer.recovered, [(os.path.basename(staging), 3)])
+        self._assert_old_tree()
+        self.assertFalse(os.path.exists(staging))
+
+        # The recovered root publishes normally again
+        with writer:
+            writer.write("config/b.json", b"new b")
+        self.assertEqual(_read(self.path("config/b.json")), b"new b")
+
+    def test_every_kill_point_recovers_to_the_old_tree(self):
+        # a and c take two swaps each (backup, publish), b one
+        for swaps in [0, 1, 2, 3, 4, None]:
+            with self.subTest(swaps=swaps):
+                self._kill_after(swaps)
+                with mock.patch.object(atomic_writer, "_pid_alive", return_value=False):
+                    BatchWriter(self.root)
+                self._assert_old_tree()
+                self.assertEqual(os.listdir(self.path(STAGING_PARENT)), [])
+
+    def test_live_writers_and_unjournaled_batches(self):
+        staging = self._kill_after(2)
+        # Our own PID is alive, so its batch is not touched
+        self.assertEqual(BatchWriter(self.root).recovered, [])
+        self.assertTrue(os.path.exists(staging))
+
+        abandoned = BatchWriter(self.root)
+        abandoned.write("config/d.json", b"never committed")
+        with mock.patch.object(atomic_writer, "_pid_alive", return_value=False):
+            recovered = BatchWriter(self.root).recovered
+        self.assertEqual([name for name, _ in recovered], [os.path.basename(staging)])
+        self.assertFalse(os.path.exists(abandoned.staging_dir))
+        self._assert_old_tree()
+
+    def test_successful_commit_leaves_no_journal(self):
+        writer = BatchWriter(self.root)
+        writer.write("config/a.json", b"new a")
+        removed = []
+        real_remove = os.remove
+        with mock.patch.object(atomic_writer.os, "remove", side_effect=lambda p: (removed.append(p), real_remove(p))):
+            writer.commit()
+        self.assertEqual([os.path.basename(p) for p in removed], [JOURNAL_FILE])
+        self.assertFalse(os.path.exists(self.path(STAGING_PARENT)))
+
+
+if __name__ == "__main__":
+    unittest.main()
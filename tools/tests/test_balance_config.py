@@ -0,0 +1,130 @@
+"""Interval index lookups and balance_config.json validation"""
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from tools.balance_config import (
+    ERROR, WARNING, BalanceIndex, LevelIndex, expand_mode, load_balance_config, main, validate,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _level(range_text, grid, forbidden, time):
+    return {"range": range_text, "gridSize": grid, "forbiddenCount": forbidden, "timeLimit": time}
+
+
+GOOD = [_level("1-5", 4, 1, 5.0), _level("6-10", 4, 2, 4.0), _level("11+", 5, 2, 3.0)]
+
+
+def _config(levels, modes=("NORMAL", "HARD", "SUPER_HARD", "RELAX")):
+    return {"modes": {mode: {"levels": levels} for mode in modes}}
+
+
+class LevelIndexTest(unittest.TestCase):
+
+    def test_params_for_matches_dense_expansion(self):
+        index = LevelIndex(GOOD)
+        dense = expand_mode(GOOD, 40)
+        for level in range(1, 41):
+            params = index.params_for(level)
+            for field, column in dense.items():
+                self.assertEqual(params[field], column[level - 1])
+
+    def test_bounds(self):
+        index = LevelIndex(GOOD)
+        self.assertEqual(index.params_for(5)["timeLimit"], 5.0)
+        self.assertEqual(index.params_for(6)["timeLimit"], 4.0)
+        self.assertEqual(index.params_for(10_000)["gridSize"], 5)
+        self.assertEqual(index.params_for(0)["gridSize"], 4)
+
+    def test_gap_uses_previous_range(self):
+        index = LevelIndex([_level("1-5", 4, 1, 5.0), _level("8+", 6, 3, 2.0)])
+        self.assertFalse(index.covers(6))
+        self.assertEqual(index.params_for(7)["gridSize"], 4)
+        self.assertTrue(index.covers(8))
+
+    def test_project_config(self):
+        index = BalanceIndex(load_balance_config(PROJECT_ROOT))
+        self.assertEqual(index.params_for("NORMAL", 1)["gridSize"], 4)
+        self.assertEqual(index.params_for("NORMAL", 81)["timeLimit"], 2.0)
+        with self.assertRaises(KeyError):
+            index.params_for("ZEN", 1)
+
+
+class ValidateTest(unittest.TestCase):
+
+    def _messages(self, levels, severity=ERROR):
+        return [m for s, _, m in validate(_config(levels), modes=("NORMAL",)) if s == severity]
+
+    def test_project_config_has_no_errors(self):
+        errors = [i for i in validate(load_balance_config(PROJECT_ROOT)) if i[0] == ERROR]
+        self.assertEqual(errors, [])
+
+    def test_good_config(self):
+        self.assertEqual(validate(_config(GOOD)), [])
+
+    def test_missing_mode(self):
+        issues = validate(_config(GOOD, modes=("NORMAL",)))
+        self.assertIn((ERROR, "RELAX", "mode is missing"), issues)
+
+    def test_gap_and_overlap(self):
+        gap = self._messages([_level("1-5", 4, 1, 5.0), _level("8+", 4, 1, 5.0)])
+        self.assertTrue(any("gap: levels 6-7" in m for m in gap))
+        overlap = self._messages([_level("1-5", 4, 1, 5.0), _level("5+", 4, 1, 5.0)])
+        self.assertTrue(any("overlaps" in m for m in overlap))
+
+    def test_start_and_open_end(self):
+        messages = self._messages([_level("2-5", 4, 1, 5.0), _level("6-9", 4, 1, 5.0)])
+        self.assertTrue(any("does not start at level 1" in m for m in messages))
+        self.assertTrue(any("not open-ended" in m for m in messages))
+
+    def test_monotonic_fields(self):
+        messages = self._messages([_level("1-5", 5, 2, 4.0), _level("6+", 4, 1, 4.5)])
+        self.assertTrue(any("gridSize shrinks" in m for m in messages))
+        self.assertTrue(any("timeLimit grows" in m for m in messages))
+        warnings = self._messages([_level("1-5", 5, 2, 4.0), _level("6+", 5, 1, 4.0)], WARNING)
+        self.assertTrue(any("forbiddenCount drops" in m for m in warnings))
+
+    def test_bad_range_text(self):
+        messages = self._messages([_level("one-five", 4, 1, 5.0), _level("6+", 4, 1, 5.0)])
+        self.assertTrue(any("'one-five'" in m for m in messages))
+
+
+class CliTest(unittest.TestCase):
+
+    def _run(self, levels, *args):
+        with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+            json.dump(_config(levels), f)
+        out = io.StringIO()
+        try:
+            with redirect_stdout(out):
+                rc = main(["--config", f.name, *args])
+        finally:
+            Path(f.name).unlink()
+        return rc, out.getvalue()
+
+    def test_query(self):
+        rc, out = self._run(GOOD, "--query", "NORMAL", "7")
+        self.assertEqual((rc, json.loads(out)["gridSize"]), (0, 4))
+        for bad in (["FOO", "3"], ["NORMAL", "x"]):
+            with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as raised:
+                self._run(GOOD, "--query", *bad)
+            self.assertEqual(raised.exception.code, 2)
+
+    def test_strict_fails_on_warnings_without_calling_them_errors(self):
+        dropping = [_level("1-5", 5, 2, 4.0), _level("6+", 5, 1, 4.0)]
+        rc, out = self._run(dropping)
+        self.assertEqual(rc, 0)
+        self.assertIn("0 errors, 4 warnings", out)
+        rc, out = self._run(dropping, "--strict")
+        self.assertEqual(rc, 1)
+        self.assertIn("0 errors, 4 warnings (--strict: warnings fail)", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Balance tuner: projection, directed mutations, racing search and report"""
+
+import copy
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from tools import balance_tuner
+from tools.balance_config import ERROR, load_balance_config, validate
+from tools.balance_tuner import Memo, ModeTuner, diff_report, loss, tune_mode
+from tools.survival_sim import load_archetypes
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+BOUNDS = {"timeLimit": [1.5, 8.0], "forbiddenCount": [1, 9]}
+LEVELS = [
+    {"range": "1-10", "gridSize": 4, "forbiddenCount": 1, "timeLimit": 5.0},
+    {"range": "11-20", "gridSize": 5, "forbiddenCount": 3, "timeLimit": 3.0},
+    {"range": "21-30", "gridSize": 6, "forbiddenCount": 2, "timeLimit": 2.5},
+    {"range": "31+", "gridSize": 8, "forbiddenCount": 5, "timeLimit": 2.0},
+]
+TARGETS = [{"level": 10, "reach": 0.8}, {"level": 20, "reach": 0.4}]
+
+
+class _SerialPool:
+    map = staticmethod(map)
+
+
+def _tuner(seed=0):
+    return ModeTuner("NORMAL", LEVELS, TARGETS, BOUNDS, np.random.default_rng(seed))
+
+
+class BalanceTunerTest(unittest.TestCase):
+
+    def test_only_ranges_before_the_last_target_are_tunable(self):
+        self.assertEqual(_tuner().tunable, [0, 1])
+
+    def test_projection_keeps_config_valid(self):
+        tuner = _tuner()
+        params = tuner.project([(9.0, 0), (3.5, 4), (4.0, 1), (2.0, 5)])
+        self.assertEqual(params[0], (8.0, 1))
+        # timeLimit never grows with level
+        self.assertEqual([t for t, _ in params], [8.0, 3.5, 3.5, 2.0])
+        # 11-20 -> 21-30 drops in the original, so that drop is allowed
+        self.assertEqual([f for _, f in params], [1, 4, 1, 5])
+
+    def test_mutation_follows_the_worst_target(self):
+        tuner = _tuner()
+        params = tuner.project(tuner.original)
+        # Far too many players reach level 20: most moves must make it harder
+        harder = 0
+        for _ in range(200):
+            mutated = tuner.mutate(params, [0.8, 0.9])
+            changed = [(a, b) for a, b in zip(params, mutated) if a != b]
+            if changed and all(b[0] < a[0] or b[1] > a[1] for a, b in changed):
+                harder += 1
+        self.assertGreater(harder, 140)
+
+    def test_search_improves_and_memoizes(self):
+        archetypes = load_archetypes(PROJECT_ROOT)
+        with tempfile.TemporaryDirectory() as root:
+            memo = Memo(root, archetypes, 0)
+            tuner = _tuner()
+            best, reached, history = tune_mode(tuner, _SerialPool(), memo, archetypes, 4000, 0,
+                                               population=4, generations=4, patience=2, log=lambda *_: None)
+            self.assertLessEqual(history[-1]["loss"], history[0]["loss"])
+            self.assertAlmostEqual(loss(reached, tuner.targets), history[-1]["loss"])
+            config = {"modes": {"NORMAL": {"levels": tuner.to_levels(best)}}}
+            self.assertFalse([i for i in validate(config, modes=("NORMAL",)) if i[0] == ERROR])
+
+            memo.save()
+            again = Memo(root, archetypes, 0)
+            tune_mode(_tuner(), _SerialPool(), again, archetypes, 4000, 0,
+                      population=4, generations=4, patience=2, log=lambda *_: None)
+            self.assertEqual(again.misses, 0)
+
+            with mock.patch.object(balance_tuner, "SURVIVAL_VERSION", balance_tuner.SURVIVAL_VERSION + 1):
+                stale = Memo(root, archetypes, 0)
+            self.assertNotEqual(stale.key("NORMAL", [], 1, [], 4000), again.key("NORMAL", [], 1, [], 4000))
+
+    def test_diff_report(self):
+        before = load_balance_config(PROJECT_ROOT)
+        after = copy.deepcopy(before)
+        after["modes"]["HARD"]["levels"][1]["timeLimit"] = 3.3
+        result = {"targets": [{"level": 20, "reach": 0.5}], "reach_before": [0.6], "reach_after": [0.5],
+                  "loss_before": 0.1, "loss_after": 0.0}
+        report = diff_report(before, after, {"HARD": result})
+        self.assertIn("| 11-20 | 3.5 → 3.3 | 3 → 3 |", report)
+        self.assertIn('-          "timeLimit": 3.5', report)
+        self.assertIn('+          "timeLimit": 3.3', report)
+
+
+if __name__ == "__main__":
+    unittest.main()
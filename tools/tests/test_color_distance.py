@@ -0,0 +1,46 @@
+"""ΔE00 must match the Sharma, Wu & Dalal (2005) reference data"""
+
+import unittest
+
+import numpy as np
+
+from tools.color_distance import delta_e_2000, distance_matrix, srgb_to_lab
+
+# (Lab 1, Lab 2, ΔE00) from the CIEDE2000 test data set
+SHARMA_PAIRS = [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, -1.3802, -84.2814), (50.0, 0.0, -82.7485), 1.0),
+    ((50.0, 0.0, 0.0), (50.0, -1.0, 2.0), 2.3669),
+    ((50.0, 2.49, -0.001), (50.0, -2.49, 0.0011), 7.2195),
+    ((50.0, 2.5, 0.0), (56.0, -27.0, -3.0), 31.9030),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((22.7233, 20.0904, -46.6940), (23.0331, 14.9730, -42.5619), 2.0373),
+    ((90.8027, -2.0831, 1.4410), (91.1528, -1.6435, 0.0447), 1.4441),
+    ((2.0776, 0.0795, -1.1350), (0.9033, -0.0636, -0.5514), 0.9082),
+]
+
+
+class ColorDistanceTest(unittest.TestCase):
+
+    def test_reference_pairs(self):
+        lab1 = np.array([p[0] for p in SHARMA_PAIRS])
+        lab2 = np.array([p[1] for p in SHARMA_PAIRS])
+        expected = np.array([p[2] for p in SHARMA_PAIRS])
+        np.testing.assert_allclose(delta_e_2000(lab1, lab2), expected, atol=1e-4)
+        np.testing.assert_allclose(delta_e_2000(lab2, lab1), expected, atol=1e-4)
+
+    def test_blocked_matrix_matches_direct(self):
+        labs = np.random.default_rng(7).uniform([0, -100, -100], [100, 100, 100], size=(37, 3))
+        direct = delta_e_2000(labs[:, None, :], labs[None, :, :])
+        blocked = distance_matrix(labs, block_rows=8)
+        np.testing.assert_allclose(blocked, direct, atol=1e-3)
+        self.assertTrue(np.array_equal(blocked, blocked.T))
+        self.assertTrue(np.all(np.diag(blocked) == 0))
+
+    def test_srgb_white_and_black(self):
+        np.testing.assert_allclose(srgb_to_lab([255, 255, 255]), [100, 0, 0], atol=1e-2)
+        np.testing.assert_allclose(srgb_to_lab([0, 0, 0]), [0, 0, 0], atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
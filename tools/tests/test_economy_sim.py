@@ -0,0 +1,76 @@
+"""Economy simulator: ending draws, coin faucet, purchases and the scenario cache"""
+
+import copy
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from tools import economy_sim
+from tools.balance_config import load_balance_config
+from tools.economy_sim import Economy, cached_scenario, load_economy_config, scenario_key
+from tools.survival_sim import load_archetypes
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+BALANCE = load_balance_config(PROJECT_ROOT)
+ARCHETYPES = load_archetypes(PROJECT_ROOT)
+ECONOMY = load_economy_config(PROJECT_ROOT)
+HAZARD_RUNS = 2000
+
+
+def _economy(players=500, **population):
+    economy = copy.deepcopy(ECONOMY)
+    economy["population"].update(population)
+    return Economy(BALANCE, ARCHETYPES, economy, players, seed=1, hazard_runs=HAZARD_RUNS), economy
+
+
+class EconomySimTest(unittest.TestCase):
+
+    def test_ending_respects_levels_already_cleared(self):
+        sim, _ = _economy()
+        rng = np.random.default_rng(0)
+        table = np.repeat(np.arange(len(sim.cdf)), 200)
+        for start in (0, 5, 40):
+            ending = sim._ending(rng, table, np.full(table.size, start))
+            self.assertTrue((ending >= start).all())
+            self.assertTrue((ending < sim.cdf.shape[1]).all())
+
+    def test_hoarders_earn_the_level_faucet(self):
+        sim, economy = _economy(policies={"hoarder": 1.0})
+        sim.ad_rate[:] = 0.0
+        players = np.arange(sim.players)
+        sim.play_run(np.random.default_rng(2), players)
+        coins = economy["coins"]
+        self.assertEqual(sim.spent.sum(), 0)
+        self.assertTrue((sim.earned >= coins["minimum"]).all())
+        self.assertTrue((sim.earned % coins["perLevel"] == 0).all())
+        self.assertTrue((sim.inventory == 0).all())
+
+    def test_spenders_buy_within_max_per_run(self):
+        sim, _ = _economy(policies={"spender": 1.0})
+        sim.balance[:] = 10_000
+        sim._buy(np.arange(sim.players))
+        self.assertTrue((sim.inventory == sim.max_per_run).all())
+        self.assertTrue((sim.balance == 10_000 - (sim.costs * sim.max_per_run).sum()).all())
+
+    def test_scenario_cache(self):
+        key = scenario_key(BALANCE, ARCHETYPES, ECONOMY, 300, 1, 0, HAZARD_RUNS)
+        cheaper = copy.deepcopy(BALANCE)
+        cheaper["items"]["costs"]["SHIELD"] -= 1
+        self.assertNotEqual(key, scenario_key(cheaper, ARCHETYPES, ECONOMY, 300, 1, 0, HAZARD_RUNS))
+        with mock.patch.object(economy_sim, "SURVIVAL_VERSION", economy_sim.SURVIVAL_VERSION + 1):
+            self.assertNotEqual(key, scenario_key(BALANCE, ARCHETYPES, ECONOMY, 300, 1, 0, HAZARD_RUNS))
+        with tempfile.TemporaryDirectory() as root:
+            first, hit = cached_scenario(root, BALANCE, ARCHETYPES, ECONOMY, 300, 1, 0, hazard_runs=HAZARD_RUNS)
+            self.assertFalse(hit)
+            again, hit = cached_scenario(root, BALANCE, ARCHETYPES, ECONOMY, 300, 1, 0, hazard_runs=HAZARD_RUNS)
+            self.assertTrue(hit)
+            self.assertEqual(first, again)
+            self.assertEqual(first["scenario"], key)
+            self.assertEqual(len(first["weekly"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
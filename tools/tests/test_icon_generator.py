@@ -0,0 +1,100 @@
+"""Launcher icons: every density and product at the right size, --check, stale siblings"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from tools import icon_generator
+from tools.assets import RES_ROOT
+from tools.icon_generator import DENSITIES, PLAY_STORE_PATH, PLAY_STORE_SIZE, PRODUCTS, main, render
+
+NAME = "test_icon"
+
+
+def _run(argv):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        rc = main(argv)
+    return rc, out.getvalue()
+
+
+class RenderTest(unittest.TestCase):
+
+    def setUp(self):
+        master = Image.new("RGBA", (200, 100), (200, 30, 30, 255))
+        patcher = mock.patch.object(icon_generator, "_master", master)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_artwork_is_fitted_and_centered(self):
+        icon = render(108, 72, circle=False)
+        self.assertEqual(icon.size, (108, 108))
+        # 200x100 fits into 72x36, centered: rows 36..71 are opaque
+        self.assertEqual(icon.getbbox(), (18, 36, 90, 72))
+
+    def test_circle_mask_clears_the_corners(self):
+        square = Image.new("RGBA", (96, 96), (200, 30, 30, 255))
+        with mock.patch.object(icon_generator, "_master", square):
+            icon = render(48, 48, circle=True)
+            self.assertEqual(render(48, 48, circle=False).getpixel((0, 0))[3], 255)
+        self.assertEqual(icon.getpixel((0, 0))[3], 0)
+        self.assertEqual(icon.getpixel((47, 47))[3], 0)
+        self.assertEqual(icon.getpixel((24, 24))[3], 255)
+
+
+class GenerateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.master = self.root / "master.png"
+        Image.new("RGBA", (256, 256), (30, 30, 200, 255)).save(self.master)
+        self.argv = ["--root", str(self.root), "--master", str(self.master), "--name", NAME, "--jobs", "2"]
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_outputs_and_rerun(self):
+        rc, out = _run(self.argv)
+        self.assertEqual(rc, 0)
+        self.assertIn(f"→ {len(PRODUCTS) * len(DENSITIES) + 1} written, 0 unchanged", out)
+        for suffix, canvas_dp, _, _ in PRODUCTS.values():
+            for density, scale in DENSITIES.items():
+                with Image.open(self.root / RES_ROOT / f"mipmap-{density}" / f"{NAME}{suffix}.webp") as img:
+                    self.assertEqual(img.size, (round(canvas_dp * scale),) * 2)
+        with Image.open(self.root / PLAY_STORE_PATH) as img:
+            self.assertEqual(img.size, (PLAY_STORE_SIZE, PLAY_STORE_SIZE))
+
+        self.assertEqual(_run(self.argv + ["--check"])[0], 0)
+        self.assertIn("0 written", _run(self.argv)[1])
+
+    def test_check_reports_stale_and_clashing_outputs(self):
+        _run(self.argv)
+        clash = self.root / RES_ROOT / "mipmap-hdpi" / f"{NAME}.png"
+        clash.write_bytes(b"old")
+        Image.new("RGBA", (256, 256), (30, 200, 30, 255)).save(self.master)
+
+        rc, out = _run(self.argv + ["--check"])
+        self.assertEqual(rc, 1)
+        self.assertIn(f"Would remove: {RES_ROOT}/mipmap-hdpi/{NAME}.png", out)
+        self.assertTrue(clash.exists())
+
+        self.assertEqual(_run(self.argv)[0], 0)
+        self.assertFalse(clash.exists())
+        self.assertEqual(_run(self.argv + ["--check"])[0], 0)
+
+    def test_missing_master(self):
+        os.remove(self.master)
+        rc, out = _run(self.argv)
+        self.assertEqual(rc, 1)
+        self.assertIn("Master icon not found", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Golden level corpus: round trip, random access and streaming"""
+
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from tools.level_corpus import (
+    SEED_BLOCK, CorpusError, CorpusWriter, LevelCorpus, build_corpus, level_blocks, main, regenerate,
+)
+from tools.level_engine import LevelEngine
+
+GROUPS = [f"g{i}" for i in range(8)]
+LEVELS = [
+    {"range": "1-3", "gridSize": 4, "forbiddenCount": 3, "timeLimit": 5.0},
+    {"range": "4+", "gridSize": 9, "forbiddenCount": 5, "timeLimit": 2.5},
+]
+CONFIG = {"modes": {mode: {"levels": LEVELS} for mode in ("NORMAL", "RELAX")}}
+
+
+def _engine():
+    return LevelEngine(CONFIG, GROUPS, {g: 3 for g in GROUPS})
+
+
+class LevelCorpusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "golden.ctl"
+        self.engine = _engine()
+        self.count = build_corpus(self.path, self.engine, ["NORMAL", "RELAX"], 1, 5, 300, base_seed=9)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_header_and_size(self):
+        with LevelCorpus(self.path) as corpus:
+            self.assertEqual(self.count, 2 * 5 * 300)
+            self.assertEqual(len(corpus), self.count)
+            self.assertEqual(corpus.modes, ["NORMAL", "RELAX"])
+            self.assertEqual(corpus.groups, GROUPS)
+            self.assertEqual((corpus.first_level, corpus.last_level, corpus.base_seed), (1, 5, 9))
+
+    def test_random_access_matches_regeneration(self):
+        with LevelCorpus(self.path) as corpus:
+            for mode, level, seed in [("NORMAL", 1, 0), ("RELAX", 5, 299), ("NORMAL", 4, SEED_BLOCK)]:
+                record, (tiles, forbidden, _, _) = regenerate(self.engine, mode, level, seed, base_seed=9)
+                self.assertEqual(corpus.record(mode, level, seed), record)
+                level_dict = corpus.get(mode, level, seed)
+                self.assertEqual(len(level_dict["tiles"]), tiles)
+                # Forbidden slots hold the band maximum; unused ones are padding
+                self.assertLessEqual(len(level_dict["forbiddenColors"]), forbidden)
+                self.assertGreaterEqual(len(level_dict["forbiddenColors"]), 3)
+                self.assertEqual(level_dict["gridSize"], tiles)
+            self.assertEqual(corpus.get("RELAX", 5, 3)["timeLimit"], 2.5)
+            for bad in [("HARD", 1, 0), ("NORMAL", 6, 0), ("NORMAL", 1, 300)]:
+                with self.assertRaises(CorpusError):
+                    corpus.get(*bad)
+
+    def test_levels_do_not_depend_on_corpus_size(self):
+        small = Path(self.tmp.name) / "small.ctl"
+        build_corpus(small, self.engine, ["RELAX"], 4, 5, 10, base_seed=9)
+        with LevelCorpus(self.path) as big, LevelCorpus(small) as corpus:
+            for seed in range(10):
+                self.assertEqual(corpus.record("RELAX", 5, seed), big.record("RELAX", 5, seed))
+
+    def test_streaming_and_verify(self):
+        with LevelCorpus(self.path) as corpus:
+            seen = [(level["mode"], level["levelNumber"], level["seed"]) for level in corpus.levels()]
+            self.assertEqual(len(seen), self.count)
+            self.assertEqual(seen[0], ("NORMAL", 1, 0))
+            self.assertEqual(seen[-1], ("RELAX", 5, 299))
+            self.assertEqual(corpus.verify(self.engine), [])
+
+        # Flip one tile byte of RELAX level 2 seed 7
+        with LevelCorpus(self.path) as corpus:
+            offset = corpus._entry("RELAX", 2)[0] + 7 * (1 + 4 + 3) + 1
+        data = bytearray(self.path.read_bytes())
+        data[offset] ^= 0x01
+        self.path.write_bytes(bytes(data))
+        with LevelCorpus(self.path) as corpus:
+            self.assertEqual(corpus.verify(self.engine), [("RELAX", 2, 7)])
+
+    def test_writer_rejects_out_of_order_and_missing_levels(self):
+        records, meta = next(level_blocks(self.engine, "NORMAL", 1, 4, 0))
+        writer = CorpusWriter(io.BytesIO(), ["NORMAL"], 1, 2, 4, GROUPS)
+        with self.assertRaises(CorpusError):
+            writer.write("NORMAL", 2, records, meta)
+        writer = CorpusWriter(io.BytesIO(), ["NORMAL"], 1, 2, 4, GROUPS)
+        writer.write("NORMAL", 1, records, meta)
+        with self.assertRaises(CorpusError):
+            writer.close()
+
+    def test_group_changes(self):
+        with LevelCorpus(self.path) as corpus:
+            self.assertIsNone(corpus.group_changes(GROUPS))
+            self.assertEqual(corpus.group_changes(GROUPS[1:] + ["teal"]), "added teal; removed g0")
+            self.assertEqual(corpus.group_changes(GROUPS[::-1]), "reordered")
+
+    def test_failed_build_leaves_no_temp_file(self):
+        out = Path(self.tmp.name) / "broken.ctl"
+        with self.assertRaises(KeyError):
+            # The header is written before the engine fails on a mode it has no tables for
+            build_corpus(out, self.engine, ["HARD"], 1, 2, 10)
+        self.assertEqual(sorted(p.name for p in out.parent.iterdir()), ["golden.ctl"])
+
+    def test_cli_reports_lookup_errors(self):
+        self.assertEqual(main(["--get", str(self.path), "HARD", "1", "0"]), 1)
+
+    def test_truncated_file(self):
+        self.path.write_bytes(self.path.read_bytes()[:-4])
+        with self.assertRaises(CorpusError):
+            LevelCorpus(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Vectorized DynamicLevelGenerator port: structure and batch invariants"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+
+from tools.level_engine import (
+    DIFFICULTIES, DISTINCT_GRID_GROUPS, GRID_FORBIDDEN, LevelEngine, chunk_rng, generate_levels, main,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+GROUPS = [f"g{i}" for i in range(8)]
+LEVELS = [
+    {"range": "1-20", "gridSize": 4, "forbiddenCount": 3, "timeLimit": 5.0},
+    {"range": "21-40", "gridSize": 6, "forbiddenCount": 5, "timeLimit": 4.0},
+    {"range": "41+", "gridSize": 9, "forbiddenCount": 9, "timeLimit": 3.0},
+]
+CONFIG = {"modes": {mode: {"levels": LEVELS} for mode in ("NORMAL", "HARD", "SUPER_HARD", "RELAX")}}
+
+
+def _engine():
+    return LevelEngine(CONFIG, GROUPS, {g: 5 for g in GROUPS})
+
+
+class LevelEngineTest(unittest.TestCase):
+
+    def test_seeded_batches_are_reproducible(self):
+        engine = _engine()
+        a = next(generate_levels(engine, "NORMAL", np.arange(1, 81), 500, seed=7))
+        b = next(generate_levels(engine, "NORMAL", np.arange(1, 81), 500, seed=7))
+        c = next(generate_levels(engine, "NORMAL", np.arange(1, 81), 500, seed=8))
+        np.testing.assert_array_equal(a.tile_group, b.tile_group)
+        np.testing.assert_array_equal(a.forbidden_group, b.forbidden_group)
+        self.assertFalse(np.array_equal(a.tile_group, c.tile_group))
+
+    def test_grid_follows_difficulty_pattern(self):
+        engine = _engine()
+        batch = engine.generate("NORMAL", np.arange(1, 81).repeat(20), chunk_rng(0, "NORMAL", 0))
+        distinct = [len(set(row)) for row in batch.grid_colors.tolist()]
+        expected = {"EASY": 4, "MEDIUM": 3, "HARD": 2, "SUPER_HARD": 1}
+        for d, k in zip(batch.difficulty, distinct):
+            self.assertEqual(k, expected[DIFFICULTIES[d]])
+        # Tiles cycle through the 4 grid slots before the shuffle
+        for row, size, grid in zip(batch.tile_group, batch.grid_size, batch.grid_colors):
+            self.assertEqual(sorted(row[:size]), sorted(grid[np.arange(size) % 4]))
+            self.assertTrue((row[size:] == -1).all())
+
+    def test_forbidden_sets(self):
+        engine = _engine()
+        batch = engine.generate("RELAX", np.arange(1, 61).repeat(50), chunk_rng(1, "RELAX", 0))
+        for i in range(len(batch)):
+            forbidden = [g for g in batch.forbidden_group[i] if g >= 0]
+            grid = set(batch.grid_colors[i])
+            self.assertEqual(len(forbidden), batch.forbidden_count[i])
+            self.assertEqual(len(set(forbidden)), len(forbidden))
+            self.assertTrue(set(forbidden[:GRID_FORBIDDEN]) <= grid)
+            self.assertFalse(set(forbidden[GRID_FORBIDDEN:]) & grid)
+            self.assertEqual(grid - set(forbidden), {batch.safe_group[i]})
+        # RELAX never adds extras, whatever balance_config asks for
+        self.assertTrue((batch.forbidden_count == GRID_FORBIDDEN).all())
+
+    def test_extra_forbidden_follows_kotlin_bands(self):
+        engine = _engine()
+        batch = engine.generate("HARD", np.arange(1, 61).repeat(50), chunk_rng(4, "HARD", 0))
+        grid_forbidden = np.minimum(DISTINCT_GRID_GROUPS[batch.difficulty], GRID_FORBIDDEN)
+        extra = batch.forbidden_count - grid_forbidden
+        for levels, band in (((1, 10), {0, 1}), ((11, 30), {1, 2}), ((31, 60), {2, 3})):
+            rows = (batch.level >= levels[0]) & (batch.level <= levels[1])
+            self.assertEqual(set(extra[rows].tolist()), band, levels)
+            self.assertTrue((batch.forbidden_slots[rows] == GRID_FORBIDDEN + max(band)).all())
+
+    def test_invariants_hold_for_easy_levels(self):
+        engine = _engine()
+        batch = engine.generate("RELAX", np.arange(1, 41).repeat(100), chunk_rng(2, "RELAX", 0))
+        for name, failed in engine.check(batch).items():
+            self.assertFalse(failed.any(), name)
+
+    def test_config_forbidden_count_is_a_warning(self):
+        engine = _engine()
+        warnings = engine.config_warnings()
+        # NORMAL 1-20 always gives 3; 21-40 gives 3-4, 41+ gives 4-5
+        self.assertIn(("NORMAL", "range '21-40': forbiddenCount 5 outside the 3-4 the generator produces"), warnings)
+        self.assertIn(("RELAX", "range '41+': forbiddenCount 9 outside the 3-3 the generator produces"), warnings)
+        self.assertNotIn("NORMAL", [mode for mode, message in warnings if "'1-20'" in message])
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(main(["--root", str(PROJECT_ROOT), "--mode", "RELAX", "--levels", "1-40",
+                                   "--count", "2000"]), 0)
+
+    def test_invariants_flag_grids_without_a_safe_color(self):
+        # MEDIUM and up have at most 3 distinct grid groups, all forbidden
+        engine = _engine()
+        batch = engine.generate("SUPER_HARD", np.arange(1, 41), chunk_rng(3, "SUPER_HARD", 0))
+        self.assertTrue(engine.check(batch)["exactly one safe color"].all())
+        self.assertTrue((batch.safe_group == -1).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
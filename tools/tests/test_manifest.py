@@ -0,0 +1,80 @@
+"""Manifest classification: NEW, CHANGED, UNCHANGED and DRIFT, and the saved record"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tools.manifest import CHANGED, DRIFT, NEW, UNCHANGED, Manifest
+
+REL = "app/src/Generated.kt"
+
+
+class ManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "app", "src"))
+        self.path = os.path.join(self.root, REL)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, manifest, data):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+        if manifest is not None:
+            manifest.record(REL, data)
+
+    def test_missing_file_is_new(self):
+        self.assertEqual(Manifest(self.root).check(REL, b"v1"), NEW)
+
+    def test_recorded_output_is_unchanged(self):
+        manifest = Manifest(self.root)
+        self._write(manifest, b"v1")
+        self.assertEqual(manifest.check(REL, b"v1"), UNCHANGED)
+
+    def test_new_output_over_recorded_file_is_changed(self):
+        manifest = Manifest(self.root)
+        self._write(manifest, b"v1")
+        self.assertEqual(manifest.check(REL, b"v2"), CHANGED)
+
+    def test_hand_edit_is_drift(self):
+        manifest = Manifest(self.root)
+        self._write(manifest, b"v1")
+        self._write(None, b"edited by hand")
+        self.assertEqual(manifest.check(REL, b"v2"), DRIFT)
+        # Regenerating exactly what the user typed is not a conflict
+        self.assertEqual(manifest.check(REL, b"edited by hand"), UNCHANGED)
+
+    def test_unrecorded_file_is_changed_not_drift(self):
+        self._write(None, b"pre-existing")
+        self.assertEqual(Manifest(self.root).check(REL, b"v1"), CHANGED)
+
+    def test_identical_unrecorded_file_is_adopted(self):
+        self._write(None, b"v1")
+        manifest = Manifest(self.root)
+        self.assertEqual(manifest.check(REL, b"v1"), UNCHANGED)
+        self.assertTrue(manifest.dirty)
+        self.assertIn(REL, manifest.artifacts)
+
+    def test_save_round_trip(self):
+        manifest = Manifest(self.root)
+        self._write(manifest, b"v1")
+        manifest.save()
+        self.assertFalse(manifest.dirty)
+
+        reloaded = Manifest(self.root)
+        self.assertEqual(reloaded.artifacts, manifest.artifacts)
+        self._write(None, b"edited by hand")
+        self.assertEqual(reloaded.check(REL, b"v1"), DRIFT)
+
+    def test_unknown_version_is_ignored(self):
+        os.makedirs(os.path.dirname(Manifest(self.root).path))
+        with open(Manifest(self.root).path, 'w', encoding='utf-8') as f:
+            f.write('{"version": 999, "artifacts": {"x": {}}}')
+        self.assertEqual(Manifest(self.root).artifacts, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Generated compact models must match tools/model_schema.py"""
+
+import re
+import unittest
+from pathlib import Path
+
+from tools import model_schema
+from tools.model_codegen import render_all, packed_layout, upper_snake
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _source(name):
+    return render_all()[f"{model_schema.OUTPUT_DIR}/{name}.kt"]
+
+
+class ModelCodegenTest(unittest.TestCase):
+
+    def test_every_model_has_a_file(self):
+        names = [m["name"] for group in (model_schema.VALUE_CLASSES, model_schema.PACKED,
+                                         model_schema.BITSETS, model_schema.GRIDS,
+                                         model_schema.STRUCTS) for m in group]
+        files = render_all()
+        self.assertEqual(len(files), len(names))
+        for name in names:
+            source = files[f"{model_schema.OUTPUT_DIR}/{name}.kt"]
+            self.assertIn(f"package {model_schema.PACKAGE}\n", source)
+            self.assertRegex(source, rf"\b(value )?class {name}\(")
+
+    def test_packed_fields_match_layout(self):
+        for model in model_schema.PACKED:
+            source = _source(model["name"])
+            self.assertLessEqual(sum(w for _, w, _ in model["fields"]), 32)
+            for field, shift, width, type_name in packed_layout(model):
+                mask = (1 << width) - 1
+                self.assertIn(f"val {field}: {type_name} get() = ", source)
+                if field in model.get("signed", ()):
+                    self.assertRegex(source, rf"val {field}: {type_name} get\(\) = .*shr {32 - width}\n")
+                else:
+                    self.assertIn(f"(bits ushr {shift}) and 0x{mask:X}", source)
+                self.assertIn(f"const val {upper_snake(field)}_SHIFT = {shift}\n", source)
+                in_place = re.search(rf"const val {upper_snake(field)}_MASK = (-?\d+)\n", source)
+                self.assertIsNotNone(in_place)
+                self.assertEqual(int(in_place.group(1)) & 0xFFFFFFFF, mask << shift)
+
+    def test_packed_masks_do_not_overlap(self):
+        for model in model_schema.PACKED:
+            seen = 0
+            for _, shift, width, _ in packed_layout(model):
+                mask = ((1 << width) - 1) << shift
+                self.assertEqual(seen & mask, 0)
+                seen |= mask
+
+    def test_packed_signed_field_sign_extends(self):
+        # CompactTile.id is the top byte: forbidden tiles use -1, -2, ...
+        self.assertIn("val id: Int get() = bits shr 24\n", _source("CompactTile"))
+
+    def test_bitset_capacity(self):
+        for model in model_schema.BITSETS:
+            source = _source(model["name"])
+            self.assertIn(f"value class {model['name']}(val bits: Long)", source)
+            self.assertIn(f"const val CAPACITY = {model['capacity']}\n", source)
+            self.assertIn("require(id.raw in 0 until CAPACITY)", source)
+            self.assertNotIn("shl id.raw))", source)
+
+    def test_struct_fields_in_schema_order(self):
+        for model in model_schema.STRUCTS:
+            source = _source(model["name"])
+            keyword = "var" if model["mutable"] else "val"
+            start = source.index(f"class {model['name']}(")
+            ctor = source[start:source.index("\n)", start)]
+            params = re.findall(rf"^    {keyword} (\w+): ([\w?]+)", ctor, re.MULTILINE)
+            self.assertEqual(params, [(f, t) for f, t, _ in model["fields"]])
+
+    def test_struct_without_members_has_no_body(self):
+        self.assertTrue(_source("CompactLevel").endswith("    val difficulty: DifficultyLevel\n)\n"))
+
+    def test_flags_are_distinct_bits(self):
+        for model in model_schema.STRUCTS:
+            flags = model.get("flags")
+            if not flags:
+                continue
+            source = _source(model["name"])
+            for i, flag in enumerate(flags["names"]):
+                self.assertIn(f"const val FLAG_{upper_snake(flag)} = 1 shl {i}\n", source)
+                self.assertIn(f"var {flag}: Boolean", source)
+
+    def test_checked_in_sources_are_current(self):
+        for rel_path, content in render_all().items():
+            path = PROJECT_ROOT / rel_path
+            self.assertTrue(path.exists(), f"{rel_path} missing; run python -m tools.model_codegen")
+            self.assertEqual(path.read_text(encoding='utf-8'), content,
+                             f"{rel_path} is stale; run python -m tools.model_codegen")
+
+
+if __name__ == "__main__":
+    unittest.main()
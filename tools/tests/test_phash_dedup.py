@@ -0,0 +1,107 @@
+"""Near-duplicate scan: BK-tree radius queries match brute force, clustering rules"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from tools.assets import ASSETS_ROOT, RES_ROOT
+from tools.phash_dedup import BKTree, distance, scan
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class BKTreeTest(unittest.TestCase):
+
+    def test_radius_queries_match_brute_force(self):
+        rng = random.Random(7)
+        keys = [rng.getrandbits(16) for _ in range(400)]
+        tree = BKTree(hamming)
+        for n, key in enumerate(keys):
+            tree.add(key, n)
+        self.assertEqual(tree.size, len(keys))
+
+        for _ in range(50):
+            probe = rng.getrandbits(16)
+            for radius in (0, 1, 3, 6):
+                expected = sorted((hamming(probe, k), n) for n, k in enumerate(keys) if hamming(probe, k) <= radius)
+                self.assertEqual(sorted(tree.query(probe, radius)), expected)
+
+    def test_identical_keys_share_a_node(self):
+        tree = BKTree(hamming)
+        for value in ("a", "b", "c"):
+            tree.add(0b1010, value)
+        tree.add(0b1011, "d")
+        self.assertEqual(sorted(tree.query(0b1010, 0)), [(0, "a"), (0, "b"), (0, "c")])
+        self.assertEqual(len(tree.root[2]), 1)
+        self.assertIn((1, "d"), tree.query(0b1010, 1))
+
+    def test_empty_tree(self):
+        self.assertEqual(BKTree(hamming).query(0, 64), [])
+
+    def test_signature_metric_is_a_sum_of_both_parts(self):
+        a = (0b1111, 0b0000, (10, 20, 30))
+        b = (0b0111, 0b0011, (12, 20, 29))
+        self.assertEqual(distance(a, b), 3 + 2)
+        self.assertEqual(distance(a, a), 0)
+
+
+class ScanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.tiles = self.root / ASSETS_ROOT / "skins" / "color"
+        os.makedirs(self.tiles)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _tile(self, name, rgb, size=32, compress_level=6):
+        img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        # A filled square leaves a recognisable shape for the hashes
+        img.paste(rgb + (255,), (4, 4, size - 4, size - 4))
+        img.save(self.tiles / name, compress_level=compress_level)
+
+    def test_near_duplicates_cluster_and_distinct_colors_do_not(self):
+        self._tile("red.png", (200, 30, 30), compress_level=9)
+        self._tile("red_copy.png", (200, 30, 30), compress_level=0)
+        self._tile("red_shade.png", (201, 31, 30))
+        self._tile("blue.png", (30, 30, 200))
+        clusters, scanned, decoded = scan(self.root, [ASSETS_ROOT])
+        self.assertEqual((scanned, decoded), (4, 4))
+        self.assertEqual(len(clusters), 1)
+        paths = [m["path"].rsplit("/", 1)[1] for m in clusters[0]]
+        self.assertEqual(sorted(paths), ["red.png", "red_copy.png", "red_shade.png"])
+        keeper = clusters[0][0]
+        # The smallest file is kept
+        self.assertEqual(keeper["bytes"], min(m["bytes"] for m in clusters[0]))
+        self.assertEqual(keeper["bits"], 0)
+
+    def test_color_tolerance(self):
+        self._tile("red.png", (200, 30, 30))
+        self._tile("red_shade.png", (208, 30, 30))
+        self.assertEqual(scan(self.root, [ASSETS_ROOT], color_tol=2)[0], [])
+        self.assertEqual(len(scan(self.root, [ASSETS_ROOT], color_tol=16)[0]), 1)
+
+    def test_signatures_are_cached(self):
+        self._tile("red.png", (200, 30, 30))
+        self._tile("blue.png", (30, 30, 200))
+        scan(self.root, [ASSETS_ROOT])
+        self.assertEqual(scan(self.root, [ASSETS_ROOT])[2], 0)
+
+    def test_density_variants_are_not_duplicates(self):
+        res = self.root / RES_ROOT
+        for density in ("mipmap-hdpi", "mipmap-xhdpi"):
+            os.makedirs(res / density)
+            Image.new("RGBA", (48, 48), (200, 30, 30, 255)).save(res / density / "ic_launcher.png")
+        self.assertEqual(scan(self.root, [RES_ROOT])[0], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Preload list: prioritised, bounded by the bitmap cache budget"""
+
+import json
+import unittest
+from pathlib import Path
+
+from tools.preload_plan import OUTPUT_PATH, build_manifest, preload_list
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SKIN_TILES = [(g, [f"skins/color/{g}/0{i}.png" for i in (1, 2, 3)]) for g in ("blue", "red", "teal")]
+
+
+def _screen(name, assets):
+    return {"screen": name, "assets": assets}
+
+
+class PreloadPlanTest(unittest.TestCase):
+
+    def test_screen_images_first_then_tiles_variant_major(self):
+        tiles = [p for _, variants in SKIN_TILES for p in variants]
+        screens = [_screen("Splash", ["img/logo.png", "config/a.json"]), _screen("Game", tiles),
+                   _screen("Shop", ["img/shop.png"])]
+        paths, on_demand = preload_list(screens, "Game", SKIN_TILES, budget=5)
+        self.assertEqual(paths, ["img/logo.png", "skins/color/blue/01.png", "skins/color/red/01.png",
+                                 "skins/color/teal/01.png", "skins/color/blue/02.png"])
+        # 9 tiles + 1 logo, Shop is past the first level screen
+        self.assertEqual(on_demand, 5)
+
+    def test_within_budget_keeps_everything(self):
+        paths, on_demand = preload_list([_screen("Game", ["skins/color/red/02.png"])], "Game", SKIN_TILES, 10)
+        self.assertEqual((paths, on_demand), (["skins/color/red/02.png"], 0))
+
+    def test_project_manifest_fits_the_cache(self):
+        manifest = build_manifest(PROJECT_ROOT)
+        preload = manifest["preload"]
+        self.assertLessEqual(len(preload["assets"]), preload["budget"])
+        self.assertLessEqual(preload["budget"], preload["cacheSize"])
+        with open(PROJECT_ROOT / OUTPUT_PATH, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), manifest)
+
+
+if __name__ == "__main__":
+    unittest.main()
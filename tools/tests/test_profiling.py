@@ -0,0 +1,86 @@
+"""Phase profiler: per-phase counter deltas, totals, failures and cProfile dumps"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from tools.profiling import (BYTES_WRITTEN, COUNTER_KEYS, FILES_WRITTEN, STAT,
+                             PhaseProfiler, count, counters)
+
+
+class PhaseProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_phases_record_only_their_own_counts(self):
+        profiler = PhaseProfiler()
+        count(STAT, 100)  # outside any phase
+        with profiler.phase("scan"):
+            count(STAT, 3)
+        with profiler.phase("write"):
+            count(FILES_WRITTEN, 2)
+            count(BYTES_WRITTEN, 512)
+
+        self.assertEqual(profiler.phases["scan"][STAT], 3)
+        self.assertEqual(profiler.phases["scan"][FILES_WRITTEN], 0)
+        self.assertEqual(profiler.phases["write"][BYTES_WRITTEN], 512)
+        totals = profiler.totals()
+        self.assertEqual((totals[STAT], totals[FILES_WRITTEN], totals[BYTES_WRITTEN]), (3, 2, 512))
+        self.assertEqual(set(totals), {"wall_ms", *COUNTER_KEYS})
+
+    def test_count_is_thread_safe(self):
+        before = counters()[STAT]
+
+        def work():
+            for _ in range(2000):
+                count(STAT)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(counters()[STAT] - before, 16000)
+
+    def test_failed_phase_is_recorded_and_reraised(self):
+        profiler = PhaseProfiler()
+        with self.assertRaises(RuntimeError):
+            with profiler.phase("broken"):
+                raise RuntimeError("boom")
+        self.assertTrue(profiler.phases["broken"]["failed"])
+
+    def test_dump_to_file_and_stdout(self):
+        profiler = PhaseProfiler()
+        with profiler.phase("scan"):
+            count(STAT)
+        path = os.path.join(self.tmp, "profile.json")
+        profiler.dump(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(list(data["phases"]), ["scan"])
+        self.assertEqual(data["totals"][STAT], 1)
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            profiler.dump("-")
+        self.assertEqual(json.loads(out.getvalue())["phases"], data["phases"])
+
+    def test_cprofile_dump_per_phase(self):
+        cprofile_dir = os.path.join(self.tmp, "prof")
+        profiler = PhaseProfiler(cprofile_dir=cprofile_dir)
+        with profiler.phase("scan"):
+            sum(range(1000))
+        self.assertEqual(os.listdir(cprofile_dir), ["scan.prof"])
+
+
+if __name__ == "__main__":
+    unittest.main()
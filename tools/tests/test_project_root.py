@@ -0,0 +1,93 @@
+"""Project root resolution: --root, env, cache, marker search, never prompting headless"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.project_root import ENV_VAR, ProjectRootError, cache_path, resolve_project_root
+
+
+class ResolveProjectRootTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp()).resolve()
+        self.project = self.tmp / "checkout" / "ColorTrap"
+        (self.project / "app" / "src" / "main").mkdir(parents=True)
+        (self.project / "settings.gradle.kts").write_text("", encoding='utf-8')
+        self.elsewhere = self.tmp / "elsewhere"
+        self.elsewhere.mkdir()
+        # Isolate the cache and the environment from the developer's machine
+        env = {k: v for k, v in os.environ.items() if k not in (ENV_VAR, "CI")}
+        env.update(XDG_CACHE_HOME=str(self.tmp / "cache"), LOCALAPPDATA=str(self.tmp / "cache"))
+        patcher = mock.patch.dict(os.environ, env, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _fail_prompt(self, _message):
+        self.fail("prompted for input")
+
+    def test_cli_root_wins_over_env(self):
+        os.environ[ENV_VAR] = str(self.elsewhere)
+        self.assertEqual(resolve_project_root(cli_root=str(self.project), cwd=self.elsewhere), self.project)
+
+    def test_env_wins_over_marker_search(self):
+        os.environ[ENV_VAR] = str(self.elsewhere)
+        self.assertEqual(resolve_project_root(cwd=self.project / "app"), self.elsewhere)
+
+    def test_marker_search_walks_up(self):
+        root = resolve_project_root(cwd=self.project / "app" / "src" / "main", use_cache=False)
+        self.assertEqual(root, self.project)
+
+    def test_marker_search_finds_checkout_child(self):
+        root = resolve_project_root(cwd=self.tmp / "checkout", use_cache=False)
+        self.assertEqual(root, self.project)
+
+    def test_max_depth_limits_search(self):
+        with self.assertRaises(ProjectRootError):
+            resolve_project_root(cwd=self.project / "app" / "src" / "main", max_depth=1,
+                                 use_cache=False, interactive=False, prompt=self._fail_prompt)
+
+    def test_search_result_is_cached_per_cwd(self):
+        cwd = self.project / "app"
+        self.assertEqual(resolve_project_root(cwd=cwd), self.project)
+        self.assertTrue(cache_path().is_file())
+        with mock.patch("tools.project_root.find_upward") as find_upward:
+            self.assertEqual(resolve_project_root(cwd=cwd), self.project)
+        find_upward.assert_not_called()
+
+    def test_stale_cache_entry_is_ignored(self):
+        cwd = self.project / "app"
+        resolve_project_root(cwd=cwd)
+        (self.project / "settings.gradle.kts").unlink()
+        with self.assertRaises(ProjectRootError):
+            resolve_project_root(cwd=cwd, interactive=False, prompt=self._fail_prompt)
+
+    def test_non_interactive_raises_instead_of_prompting(self):
+        with self.assertRaises(ProjectRootError) as ctx:
+            resolve_project_root(cwd=self.elsewhere, use_cache=False, interactive=False,
+                                 prompt=self._fail_prompt)
+        self.assertIn("--root", str(ctx.exception))
+        self.assertIn(ENV_VAR, str(ctx.exception))
+
+    def test_ci_is_never_interactive(self):
+        os.environ["CI"] = "true"
+        with self.assertRaises(ProjectRootError):
+            resolve_project_root(cwd=self.elsewhere, use_cache=False, prompt=self._fail_prompt)
+
+    def test_interactive_prompt(self):
+        root = resolve_project_root(cwd=self.elsewhere, use_cache=False, interactive=True,
+                                    prompt=lambda _message: f"  {self.project}  ")
+        self.assertEqual(root, self.project)
+        with self.assertRaises(ProjectRootError):
+            resolve_project_root(cwd=self.elsewhere, use_cache=False, interactive=True,
+                                 prompt=lambda _message: "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Reporter sinks: batched flushing, item coalescing, quiet filtering, JSON lines"""
+
+import io
+import json
+import unittest
+
+from tools.reporter import (FLUSH_EVERY, HumanReporter, JsonLinesReporter, QuietReporter)
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write() calls and is never a terminal"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+    def isatty(self):
+        return False
+
+
+class HumanReporterTest(unittest.TestCase):
+
+    def test_output_is_buffered_until_flush(self):
+        stream = CountingStream()
+        reporter = HumanReporter(stream=stream, color=False)
+        for n in range(FLUSH_EVERY - 1):
+            reporter.success(f"file {n}")
+        self.assertEqual(stream.getvalue(), "")
+        reporter.success("one more")
+        self.assertEqual(stream.writes, 1)
+        self.assertEqual(stream.getvalue().count("✓ "), FLUSH_EVERY)
+
+    def test_error_flushes_immediately(self):
+        stream = CountingStream()
+        reporter = HumanReporter(stream=stream, color=False)
+        reporter.info("before")
+        reporter.error("broken")
+        self.assertEqual(stream.getvalue(), "→ before\n✗ broken\n")
+
+    def test_items_coalesce_into_one_line(self):
+        stream = CountingStream()
+        reporter = HumanReporter(stream=stream, color=False)
+        for n in range(5):
+            reporter.item("created", f"a/{n}.kt")
+        reporter.item("skipped", "a/x.kt")
+        reporter.success("done")
+        reporter.close()
+        self.assertEqual(stream.getvalue(), "→ 5 created, 1 skipped\n✓ done\n")
+
+    def test_verbose_lists_every_item(self):
+        stream = CountingStream()
+        reporter = HumanReporter(stream=stream, color=False, verbose=True)
+        reporter.item("created", "a/1.kt")
+        reporter.item("created", "a/2.kt")
+        reporter.close()
+        self.assertEqual(stream.getvalue(), "→   ✓ a/1.kt\n→   ✓ a/2.kt\n→ 2 created\n")
+
+    def test_color_is_stripped_when_disabled(self):
+        output = {}
+        for color in (False, True):
+            stream = CountingStream()
+            reporter = HumanReporter(stream=stream, color=color)
+            reporter.header("Title")
+            reporter.flush()
+            output[color] = stream.getvalue()
+        self.assertIn("\033[", output[True])
+        self.assertNotIn("\033[", output[False])
+        self.assertIn("Title", output[False])
+
+
+class QuietReporterTest(unittest.TestCase):
+
+    def test_only_warnings_and_errors(self):
+        stream = io.StringIO()
+        reporter = QuietReporter(stream=stream)
+        reporter.header("Title")
+        reporter.success("ok")
+        reporter.info("note")
+        reporter.item("created", "a.kt")
+        reporter.text("summary")
+        reporter.warning("careful")
+        reporter.error("broken")
+        reporter.close()
+        self.assertEqual(stream.getvalue(), "⚠ careful\n✗ broken\n")
+
+    def test_silent_with_stream_false(self):
+        reporter = QuietReporter(stream=False)
+        reporter.warning("careful")
+        reporter.error("broken")
+
+
+class JsonLinesReporterTest(unittest.TestCase):
+
+    def _events(self, stream):
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_one_object_per_event(self):
+        stream = io.StringIO()
+        reporter = JsonLinesReporter(stream=stream)
+        reporter.header("Phase 2")
+        reporter.item("created", "a/b.kt")
+        reporter.text("human only")
+        reporter.warning("\033[93mcareful\033[0m ")
+        reporter.summary({"created": 1})
+        self.assertEqual(stream.getvalue(), "")
+        reporter.close()
+
+        events = self._events(stream)
+        self.assertEqual([e["event"] for e in events], ["section", "item", "warning", "summary"])
+        self.assertEqual(events[0]["name"], "Phase 2")
+        self.assertEqual((events[1]["action"], events[1]["path"]), ("created", "a/b.kt"))
+        self.assertEqual(events[2]["message"], "careful")
+        self.assertEqual(events[3]["stats"], {"created": 1})
+
+    def test_batches_and_error_flush(self):
+        stream = CountingStream()
+        reporter = JsonLinesReporter(stream=stream)
+        for n in range(FLUSH_EVERY):
+            reporter.item("created", f"{n}.kt")
+        self.assertEqual(stream.writes, 1)
+        reporter.error("broken")
+        self.assertEqual(stream.writes, 2)
+        self.assertEqual(self._events(stream)[-1]["event"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Scaffold plan/apply: the thread pool writes the same tree as the sequential path"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tools.atomic_writer import BatchWriter
+from tools.scaffold_engine import CONFLICT, CREATE, SKIP, apply_plan, build_plan
+
+STRUCTURE = {
+    "ui/screens": [(f"Screen{i}.kt", f"package ui.screens\n\nclass Screen{i}\n") for i in range(12)],
+    "domain": [("Engine.kt", "package domain\n"), ("Rules.kt", "package domain\n// rules\n")],
+    "data/config": [("Tables.kt", "package data.config\n")],
+    "util": [("Ext.kt", "package util\n")],
+}
+
+
+def _tree(base):
+    """{relative posix path: bytes, or None for a directory}"""
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(base):
+        rel_dir = os.path.relpath(dirpath, base).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else f"{rel_dir}/"
+        for name in dirnames:
+            tree[prefix + name] = None
+        for name in filenames:
+            with open(os.path.join(dirpath, name), 'rb') as f:
+                tree[prefix + name] = f.read()
+    return tree
+
+
+class ScaffoldEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _prepopulated(self, name):
+        base = os.path.join(self.tmp, name)
+        os.makedirs(os.path.join(base, "domain"))
+        with open(os.path.join(base, "domain", "Engine.kt"), 'wb') as f:
+            f.write(b"// hand-written\n")
+        # A directory where a file goes, and a file where a folder goes
+        os.makedirs(os.path.join(base, "domain", "Rules.kt"))
+        with open(os.path.join(base, "util"), 'wb') as f:
+            f.write(b"not a folder")
+        return base
+
+    def _apply(self, name, max_workers):
+        base = self._prepopulated(name)
+        plan = build_plan(base, STRUCTURE)
+        created = apply_plan(plan, max_workers=max_workers)
+        results = sorted((e.action, e.rel_path, e.reason) for e in plan.entries)
+        return _tree(base), sorted(e.rel_path for e in created), results
+
+    def test_pool_matches_sequential_on_partial_tree(self):
+        sequential = self._apply("sequential", max_workers=1)
+        pooled = self._apply("pooled", max_workers=8)
+        self.assertEqual(pooled, sequential)
+
+        tree, created, results = pooled
+        self.assertEqual(len(created), 13)
+        self.assertEqual(tree["domain/Engine.kt"], b"// hand-written\n")
+        self.assertEqual(tree["ui/screens/Screen3.kt"], b"package ui.screens\n\nclass Screen3\n")
+        self.assertIn((SKIP, "domain/Engine.kt", "exists"), results)
+        self.assertIn((CONFLICT, "domain/Rules.kt", "path is a directory"), results)
+        self.assertIn((CONFLICT, "util/Ext.kt", "util is a file"), results)
+        self.assertEqual(sum(1 for action, _, _ in results if action == CREATE), 13)
+
+    def test_rerun_skips_everything(self):
+        base = os.path.join(self.tmp, "rerun")
+        apply_plan(build_plan(base, STRUCTURE), max_workers=8)
+        before = _tree(base)
+        plan = build_plan(base, STRUCTURE)
+        self.assertEqual(apply_plan(plan, max_workers=8), [])
+        self.assertEqual(len(plan.skips), len(plan.entries))
+        self.assertEqual(plan.folders, [])
+        self.assertEqual(_tree(base), before)
+
+    def test_batch_writer_matches_direct_writes(self):
+        direct = self._apply("direct", max_workers=8)[0]
+        base = self._prepopulated("staged")
+        with BatchWriter(self.tmp) as writer:
+            apply_plan(build_plan(base, STRUCTURE), max_workers=8, writer=writer)
+        self.assertEqual(_tree(base), direct)
+
+
+if __name__ == "__main__":
+    unittest.main()
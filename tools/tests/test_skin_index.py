@@ -0,0 +1,101 @@
+"""Skin index round-trip: every variant with its real dimensions, cached headers, --check"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from PIL import Image
+
+from tools.assets import ASSETS_ROOT, SKINS_DIR
+from tools.skin_index import INDEX_PATH, build_index, main
+
+SKINS = f"{ASSETS_ROOT}/{SKINS_DIR}"
+
+# skin -> group -> {file: (width, height)}
+LAYOUT = {
+    "color": {
+        "blue": {"01.png": (40, 30), "02.webp": (44, 30), "03.jpg": (48, 32)},
+        "red": {"01.png": (20, 64)},
+    },
+    "pastel": {
+        "green": {"01.webp": (33, 17), "02.png": (17, 33)},
+    },
+}
+
+
+def _run(argv):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        rc = main(argv)
+    return rc, out.getvalue()
+
+
+class SkinIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        for skin, groups in LAYOUT.items():
+            for group, files in groups.items():
+                folder = self.root / SKINS / skin / group
+                os.makedirs(folder)
+                for name, size in files.items():
+                    Image.new("RGB", size, (200, 40, 40)).save(folder / name)
+                # Non-images are not variants
+                (folder / "notes.txt").write_text("x", encoding='utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _index(self):
+        return json.loads((self.root / INDEX_PATH).read_text(encoding='utf-8'))
+
+    def test_index_round_trips_the_tree(self):
+        self.assertEqual(_run(["--root", str(self.root)])[0], 0)
+        index = self._index()
+        self.assertEqual(index["basePath"], SKINS_DIR)
+        expected = {
+            skin: {group: [[name, w, h] for name, (w, h) in sorted(files.items())]
+                   for group, files in groups.items()}
+            for skin, groups in LAYOUT.items()
+        }
+        self.assertEqual(index["skins"], expected)
+        # Every entry resolves back to a real file relative to the assets root
+        for skin, groups in index["skins"].items():
+            for group, variants in groups.items():
+                for name, _, _ in variants:
+                    path = self.root / ASSETS_ROOT / index["basePath"] / skin / group / name
+                    self.assertTrue(path.is_file(), path)
+
+    def test_rebuild_reuses_cached_headers(self):
+        _run(["--root", str(self.root)])
+        rc, out = _run(["--root", str(self.root)])
+        self.assertEqual(rc, 0)
+        self.assertIn("Unchanged", out)
+        self.assertIn("0 headers read", out)
+
+        # Only the edited file has its header read again
+        Image.new("RGB", (10, 12)).save(self.root / SKINS / "color" / "red" / "01.png")
+        rc, out = _run(["--root", str(self.root)])
+        self.assertIn("1 headers read", out)
+        self.assertEqual(build_index(self.root)[2], 6)
+
+    def test_check_detects_stale_index(self):
+        self.assertEqual(_run(["--root", str(self.root), "--check"])[0], 1)
+        _run(["--root", str(self.root)])
+        self.assertEqual(_run(["--root", str(self.root), "--check"])[0], 0)
+
+        Image.new("RGB", (10, 12)).save(self.root / SKINS / "color" / "red" / "01.png")
+        rc, out = _run(["--root", str(self.root), "--check"])
+        self.assertEqual(rc, 1)
+        self.assertIn("out of date", out)
+        self.assertEqual(_run(["--root", str(self.root)])[0], 0)
+        self.assertEqual(self._index()["skins"]["color"]["red"], [["01.png", 10, 12]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Spec cache: hits skip the import, a spec edit compiles afresh and drops the old entry"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from tools import spec_compiler
+
+MODULE = "colortrap_test_spec"
+
+SPEC = '''
+BASE_PACKAGE = "com.example.game"
+KOTLIN_ROOT = "app/src/main/java"
+ASSETS_ROOT = "app/src/main/assets"
+STUB_BODY = "// stub\\n"
+LAYOUT = {{"domain": ["Engine.kt", "Rules.kt"]}}
+TEMPLATES = {{"domain/Engine.kt": "class Engine{suffix}\\n"}}
+ASSET_FOLDERS = ["skins"]
+'''
+
+
+class SpecCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp, f"{MODULE}.py")
+        self._write_spec("")
+        sys.path.insert(0, self.tmp)
+        for patcher in (mock.patch.object(spec_compiler, "SPEC_MODULE", MODULE),
+                        mock.patch.object(spec_compiler, "_memo", {}),
+                        mock.patch.object(sys, "dont_write_bytecode", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp)
+        sys.modules.pop(MODULE, None)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write_spec(self, suffix):
+        with open(self.source, 'w', encoding='utf-8') as f:
+            f.write(SPEC.format(suffix=suffix))
+
+    def _new_process(self):
+        """Forget everything a previous run kept in memory"""
+        spec_compiler._memo.clear()
+        sys.modules.pop(MODULE, None)
+
+    def _cache_entries(self):
+        return sorted(os.listdir(os.path.join(self.tmp, spec_compiler.CACHE_DIR)))
+
+    def test_compiled_plan(self):
+        compiled = spec_compiler.load_compiled()
+        self.assertEqual(compiled["kotlin_base"], "app/src/main/java/com/example/game")
+        structure = spec_compiler.kotlin_structure(compiled)
+        self.assertEqual(structure["domain"], [
+            ("Engine.kt", "package com.example.game.domain\n\nclass Engine\n"),
+            ("Rules.kt", "package com.example.game.domain\n\n// stub\n"),
+        ])
+        self.assertEqual([e["complete"] for e in compiled["folders"]["domain"]], [True, False])
+
+    def test_cache_hit_does_not_import_the_spec(self):
+        first = spec_compiler.load_compiled(self.tmp)
+        self.assertEqual(self._cache_entries(), [f"{first['spec_hash']}.json"])
+
+        self._new_process()
+        with mock.patch.object(spec_compiler.importlib, "import_module") as import_module:
+            self.assertEqual(spec_compiler.load_compiled(self.tmp), first)
+        import_module.assert_not_called()
+
+    def test_spec_edit_invalidates_the_cache(self):
+        first = spec_compiler.load_compiled(self.tmp)
+
+        self._write_spec("Edited")
+        self._new_process()
+        second = spec_compiler.load_compiled(self.tmp)
+
+        self.assertNotEqual(second["spec_hash"], first["spec_hash"])
+        self.assertIn("class EngineEdited", second["folders"]["domain"][0]["content"])
+        self.assertEqual(self._cache_entries(), [f"{second['spec_hash']}.json"])
+
+    def test_compiler_version_is_part_of_the_key(self):
+        before = spec_compiler.spec_hash()
+        with mock.patch.object(spec_compiler, "COMPILER_VERSION", spec_compiler.COMPILER_VERSION + 1):
+            self.assertNotEqual(spec_compiler.spec_hash(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Survival simulator: seeded shards, lives and curve helpers"""
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from tools.balance_config import load_balance_config
+from tools.survival_sim import (
+    TIMEOUT, WRONG_TAP, load_archetypes, median_run_length, mode_tables, shard_rng,
+    simulate, survival_curve, sweep,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+PLAYER = {
+    "share": 1.0, "reactionMedian": 0.6, "reactionSpread": 0.2, "scanPerTile": 0.08,
+    "recallPerForbidden": 0.1, "trialSigma": 0.25, "errorBase": 0.005, "errorPerForbidden": 0.003,
+}
+
+
+def _config(lives=None):
+    levels = [{"range": "1-10", "gridSize": 4, "forbiddenCount": 1, "timeLimit": 5.0},
+              {"range": "11+", "gridSize": 10, "forbiddenCount": 9, "timeLimit": 2.0}]
+    mode = {"levels": levels}
+    if lives:
+        mode["lives"] = lives
+    return {"modes": {"NORMAL": {"levels": levels}, "RELAX": mode}}
+
+
+class SurvivalSimTest(unittest.TestCase):
+
+    def test_seeded_shards_are_reproducible(self):
+        tables = mode_tables(_config(), "NORMAL", 50)
+        a, _ = simulate(tables, PLAYER, 5000, shard_rng(3, "NORMAL", 0, 0))
+        b, _ = simulate(tables, PLAYER, 5000, shard_rng(3, "NORMAL", 0, 0))
+        c, _ = simulate(tables, PLAYER, 5000, shard_rng(3, "NORMAL", 0, 1))
+        np.testing.assert_array_equal(a, b)
+        self.assertFalse(np.array_equal(a, c))
+
+    def test_every_run_ends_once(self):
+        tables = mode_tables(_config(), "NORMAL", 50)
+        histogram, causes = simulate(tables, PLAYER, 20_000, shard_rng(0, "NORMAL", 0, 0))
+        self.assertEqual(histogram.sum(), 20_000)
+        np.testing.assert_array_equal((causes[TIMEOUT] + causes[WRONG_TAP])[:-1], histogram[:-1])
+        self.assertEqual(causes[TIMEOUT][-1] + causes[WRONG_TAP][-1], 0)
+
+    def test_extra_lives_extend_runs(self):
+        config = _config(lives=3)
+        one, _ = simulate(mode_tables(config, "NORMAL", 60), PLAYER, 20_000, shard_rng(1, "NORMAL", 0, 0))
+        three, _ = simulate(mode_tables(config, "RELAX", 60), PLAYER, 20_000, shard_rng(1, "RELAX", 0, 0))
+        self.assertGreater(median_run_length(three), median_run_length(one))
+
+    def test_lives_follow_the_view_model(self):
+        # Every attempt takes exactly 1 s
+        steady = dict(PLAYER, reactionMedian=1.0, reactionSpread=0.0, scanPerTile=0.0,
+                      recallPerForbidden=0.0, trialSigma=0.0, errorBase=0.0, errorPerForbidden=0.0)
+        levels = [{"range": "1+", "gridSize": 4, "forbiddenCount": 1, "timeLimit": 0.5}]
+        config = {"modes": {"RELAX": {"levels": levels, "lives": 3}}}
+        # Timeouts start the next level: the third one ends the run after 2 levels
+        histogram, causes = simulate(mode_tables(config, "RELAX", 10), steady, 100, shard_rng(0, "RELAX", 0, 0))
+        self.assertEqual(histogram[2], 100)
+        self.assertEqual(causes[TIMEOUT][2], 100)
+
+        # Wrong taps keep the clock running: 2.5 s fits two 1 s taps, then time runs out
+        levels[0]["timeLimit"] = 2.5
+        always_wrong = dict(steady, errorBase=1.0)
+        histogram, causes = simulate(mode_tables(config, "RELAX", 10), always_wrong, 100,
+                                     shard_rng(0, "RELAX", 0, 0))
+        self.assertEqual(histogram[0], 100)
+        self.assertEqual(causes[TIMEOUT][0], 100)
+
+    def test_curve_helpers(self):
+        histogram = np.array([2, 0, 3, 5])   # 2 cleared 0, 3 cleared 2, 5 cleared all 3
+        np.testing.assert_allclose(survival_curve(histogram), [1.0, 0.8, 0.8, 0.5])
+        self.assertEqual(median_run_length(histogram), 2)
+
+    def test_sweep_splits_runs_by_share(self):
+        archetypes = {"a": dict(PLAYER, share=0.25), "b": dict(PLAYER, share=0.75)}
+        results = sweep(_config(), archetypes, ["NORMAL"], 4000, jobs=1, max_level=30, shard_runs=1000)
+        self.assertEqual(results["NORMAL"]["a"]["runs"], 1000)
+        self.assertEqual(results["NORMAL"]["b"]["runs"], 3000)
+        self.assertEqual(results["NORMAL"]["all"]["runs"], 4000)
+
+    def test_project_archetypes_load(self):
+        archetypes = load_archetypes(PROJECT_ROOT)
+        self.assertAlmostEqual(sum(a["share"] for a in archetypes.values()), 1.0)
+        mode_tables(load_balance_config(PROJECT_ROOT), "RELAX", 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""WebP --apply: refuses on stale path consumers, regenerates them after the swap"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from tools import atlas_packer, skin_index, webp_optimizer
+from tools.assets import ASSETS_ROOT, SKINS_DIR
+
+SKIN = f"{ASSETS_ROOT}/{SKINS_DIR}/color"
+
+
+def _quiet(func, argv):
+    with redirect_stdout(io.StringIO()):
+        return func(argv)
+
+
+class WebpApplyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        for group, rgb in (("red", (220, 30, 30)), ("blue", (30, 30, 220))):
+            os.makedirs(self.root / SKIN / group)
+            for n in (1, 2):
+                # Flat tiles: lossless WebP is always smaller than the PNG
+                Image.new("RGBA", (48, 48), rgb + (255,)).save(self.root / SKIN / group / f"0{n}.png")
+        self.argv = ["--root", str(self.root), "--jobs", "1", "--apply"]
+        # color_distance and preload_plan need a full project; the index is enough here
+        patcher = mock.patch.object(webp_optimizer, "PATH_CONSUMERS", ("skin_index",))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _files(self):
+        return sorted(p.relative_to(self.root / SKIN).as_posix() for p in (self.root / SKIN).rglob("*.*"))
+
+    def test_refuses_when_consumers_are_stale(self):
+        _quiet(skin_index.main, ["--root", str(self.root)])
+        Image.new("RGBA", (48, 48), (0, 0, 0, 255)).save(self.root / SKIN / "red" / "03.png")
+        before = self._files()
+        self.assertEqual(_quiet(webp_optimizer.main, self.argv), 1)
+        self.assertEqual(self._files(), before)
+
+    def test_apply_regenerates_index_and_atlas(self):
+        _quiet(skin_index.main, ["--root", str(self.root)])
+        _quiet(atlas_packer.main, ["--root", str(self.root)])
+        self.assertEqual(_quiet(webp_optimizer.main, self.argv), 0)
+        self.assertEqual(self._files(), ["blue/01.webp", "blue/02.webp", "red/01.webp", "red/02.webp"])
+
+        index = json.loads((self.root / skin_index.INDEX_PATH).read_text(encoding='utf-8'))
+        self.assertNotIn(".png", json.dumps(index))
+        self.assertEqual(_quiet(skin_index.main, ["--root", str(self.root), "--check"]), 0)
+        manifest = json.loads((self.root / atlas_packer.ATLAS_DIR / "color.json").read_text(encoding='utf-8'))
+        self.assertEqual(sorted(r["variant"] for r in manifest["regions"]["red"]), ["01.webp", "02.webp"])
+        self.assertEqual(_quiet(atlas_packer.main, ["--root", str(self.root), "--verify"]), 0)
+
+    def test_reports_consumers_that_fail_to_regenerate(self):
+        _quiet(skin_index.main, ["--root", str(self.root)])
+        real = webp_optimizer._run_tool
+
+        def run_tool(name, argv):
+            return 1 if "--check" not in argv else real(name, argv)
+
+        with mock.patch.object(webp_optimizer, "_run_tool", side_effect=run_tool):
+            self.assertEqual(_quiet(webp_optimizer.main, self.argv), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+ColorTrap - Skin WebP Recompression
+Re-encodes PNG skin variants to WebP on a process pool and reports the
+before/after size per skin and color group. Encoded outputs live in a
+content-addressed cache (.colortrap/blobs/webp/), keyed by the source
+sha256 and the encoder settings, so unchanged inputs are never re-encoded.
+
+Usage:
+    python -m tools.webp_optimizer [--root PATH] [--mode lossless|lossy] [--quality 90] [--jobs N]
+    python -m tools.webp_optimizer --apply    # replace PNGs that got smaller, regenerate asset-path consumers
+
+--apply renames skin files, so it refuses to run while any generated file
+that lists skin paths (skin_index, color_distance, preload_manifest) is
+out of date, and regenerates them, plus any built atlas or asset bundle,
+afterwards.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import importlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.assets import ASSETS_ROOT, SKINS_DIR, iter_skin_variants
+from tools.asset_cache import HashCache, blob_path, publish_blob
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed by the asset tooling
+    Image = None
+
+LOSSLESS = "lossless"
+LOSSY = "lossy"
+DEFAULT_QUALITY = 90
+# Generated files that list skin variant paths; each module has main(--root, --check)
+PATH_CONSUMERS = ("skin_index", "color_distance", "preload_plan")
+
+
+def encoder_tag(mode, quality):
+    """Part of the cache key: a settings change must not reuse old outputs"""
+    return "ll-m6" if mode == LOSSLESS else f"q{quality}-m6"
+
+
+def _encode(src_path, dst_path, mode, quality):
+    """Worker: PNG -> WebP at dst_path; returns the encoded size"""
+    tmp_path = f"{dst_path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    with Image.open(src_path) as img:
+        img.load()
+        if mode == LOSSLESS:
+            # exact keeps RGB under fully transparent pixels (no halo when filtered)
+            img.save(tmp_path, "WEBP", lossless=True, quality=100, method=6, exact=True)
+        else:
+            # Plain lossy VP8, not near-lossless (Pillow has no near_lossless option)
+            img.save(tmp_path, "WEBP", quality=quality, alpha_quality=100, method=6)
+    publish_blob(tmp_path, dst_path)
+    return os.path.getsize(dst_path)
+
+
+def optimize(root, mode=LOSSLESS, quality=DEFAULT_QUALITY, jobs=None, skins=None):
+    """
+    Encode every PNG variant that is not already in the cache
+    Returns (rows, encoded, cached); one row per variant:
+    {skin, group, name, rel, blob, png_bytes, webp_bytes}
+    """
+    hashes = HashCache(root)
+    tag = encoder_tag(mode, quality)
+    rows = []
+    pending = []
+
+    for skin, group, entry in iter_skin_variants(root, skins):
+        if not entry.name.lower().endswith(".png"):
+            continue
+        rel = f"{ASSETS_ROOT}/{SKINS_DIR}/{skin}/{group}/{entry.name}"
+        st = entry.stat()
+        sha256 = hashes.digest(rel, st)
+        blob = blob_path(root, "webp", f"{sha256}-{tag}", ".webp")
+        row = {"skin": skin, "group": group, "name": entry.name, "rel": rel,
+               "blob": blob, "png_bytes": st.st_size, "webp_bytes": None}
+        if os.path.exists(blob):
+            row["webp_bytes"] = os.path.getsize(blob)
+        else:
+            pending.append(row)
+        rows.append(row)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_encode, os.path.join(os.fspath(root), row["rel"]), row["blob"], mode, quality)
+                       for row in pending]
+            for row, future in zip(pending, futures):
+                row["webp_bytes"] = future.result()
+
+    hashes.save()
+    return rows, len(pending), len(rows) - len(pending)
+
+
+def size_report(rows):
+    """Totals per skin and per skin/group: {key: {files, png_bytes, webp_bytes}}"""
+    report = {"skins": {}, "groups": {}}
+    for row in rows:
+        for bucket, key in (("skins", row["skin"]), ("groups", f"{row['skin']}/{row['group']}")):
+            totals = report[bucket].setdefault(key, {"files": 0, "png_bytes": 0, "webp_bytes": 0})
+            totals["files"] += 1
+            totals["png_bytes"] += row["png_bytes"]
+            totals["webp_bytes"] += row["webp_bytes"]
+    return report
+
+
+def _saving(totals):
+    before, after = totals["png_bytes"], totals["webp_bytes"]
+    return 100.0 * (before - after) / before if before else 0.0
+
+
+def print_report(report):
+    for bucket, title in (("skins", "Skin"), ("groups", "Skin/group")):
+        print(f"\n{title:<24} {'files':>5} {'png':>10} {'webp':>10} {'saved':>7}")
+        for key, totals in sorted(report[bucket].items()):
+            print(f"{key:<24} {totals['files']:>5} {totals['png_bytes']:>10,} "
+                  f"{totals['webp_bytes']:>10,} {_saving(totals):>6.1f}%")
+
+
+def apply_rows(root, rows):
+    """Swap each PNG for its WebP when the WebP is smaller; returns the number replaced"""
+    replaced = 0
+    for row in rows:
+        if row["webp_bytes"] >= row["png_bytes"]:
+            continue
+        src = os.path.join(os.fspath(root), row["rel"])
+        dst = os.path.splitext(src)[0] + ".webp"
+        tmp_path = dst + ".tmp"
+        shutil.copyfile(row["blob"], tmp_path)
+        os.replace(tmp_path, dst)
+        os.remove(src)
+        replaced += 1
+    return replaced
+
+
+def _run_tool(name, argv):
+    return importlib.import_module(f"tools.{name}").main(argv)
+
+
+def stale_consumers(root):
+    """PATH_CONSUMERS whose output is out of date before anything is renamed"""
+    return [name for name in PATH_CONSUMERS if _run_tool(name, ["--root", str(root), "--check"]) != 0]
+
+
+def regenerate_consumers(root, skins):
+    """
+    Rewrite every file that names skin variants after apply_rows
+    Atlases are repacked only for skins that already have one, and the
+    asset bundle only when it has been built; returns the failed tools
+    """
+    from tools.asset_bundle import BUNDLE_PATH
+    from tools.atlas_packer import ATLAS_DIR
+
+    failed = [name for name in PATH_CONSUMERS if _run_tool(name, ["--root", str(root)]) != 0]
+    atlas_skins = [skin for skin in sorted(skins) if (root / ATLAS_DIR / f"{skin}.json").exists()]
+    if atlas_skins:
+        argv = ["--root", str(root)] + [arg for skin in atlas_skins for arg in ("--skin", skin)]
+        if _run_tool("atlas_packer", argv) != 0:
+            failed.append("atlas_packer")
+    if (root / BUNDLE_PATH).exists() and _run_tool("asset_bundle", ["--root", str(root)]) != 0:
+        failed.append("asset_bundle")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColorTrap - Skin WebP Recompression")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    parser.add_argument("--skin", action="append", help="Only this skin (repeatable; default: all)")
+    parser.add_argument("--mode", choices=(LOSSLESS, LOSSY), default=LOSSLESS, help="Encoder mode: exact lossless, or plain lossy at --quality (default: lossless)")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help="Lossy quality 0-100 (default: 90)")
+    parser.add_argument("--jobs", type=int, default=None, help="Encoder processes (default: CPU count)")
+    parser.add_argument("--report", metavar="PATH", help="Also write the size report as JSON")
+    parser.add_argument("--apply", action="store_true",
+                        help="Replace PNGs whose WebP is smaller and regenerate every file that lists skin paths")
+    args = parser.parse_args(argv)
+    if Image is None:
+        raise SystemExit("✗ Pillow is required: pip install -r tools/requirements.txt")
+
+    root = Path(args.root)
+    if args.apply:
+        stale = stale_consumers(root)
+        if stale:
+            print(f"✗ Refusing --apply: {', '.join(stale)} already out of date; regenerate them first")
+            return 1
+
+    rows, encoded, cached = optimize(root, args.mode, args.quality, args.jobs, args.skin)
+    report = size_report(rows)
+    print(f"✓ {len(rows)} PNG variants: {encoded} encoded, {cached} from cache ({encoder_tag(args.mode, args.quality)})")
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.apply:
+        replaced = apply_rows(root, rows)
+        print(f"\n✓ Replaced {replaced} PNGs with WebP")
+        if replaced:
+            failed = regenerate_consumers(root, {row["skin"] for row in rows})
+            if failed:
+                print(f"✗ Could not regenerate {', '.join(failed)}; they still list the old .png paths")
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())